@@ -43,9 +43,17 @@ async def lifespan(app: FastAPI):
     )
     app.container = container  # type: ignore
 
+    # Connect the workflow engine before the first request needs it.
+    workflow_engine_service = container.workflow_engine_service()
+    await workflow_engine_service.warm_up()
+
     logger.info(f"API started in {(time.time() - start_time):.2f} seconds")
     yield
 
+    # Delivers the callbacks still queued by the ingestion callback route.
+    await container.shutdown_resources()
+    await workflow_engine_service.close()
+
 
 class ErrorResponse(BaseModel):
     message: str
@@ -1,9 +1,37 @@
 from dependency_injector import providers
 from internal_db_repositories.containers import RepositoriesContainer
 from internal_services.containers import ServicesContainer
+from internal_services.workflow.dispatcher import CallbackDispatcherResource
+from internal_services.workflow.outbox import WorkflowOutboxDispatcherResource
 
 from api.settings import Settings
 
 
 class Container(RepositoriesContainer, ServicesContainer):
     settings = providers.Singleton(Settings)
+
+    callback_dispatcher = providers.Resource(
+        CallbackDispatcherResource,
+        workflow_engine_service=ServicesContainer.workflow_engine_service,
+        queue_size=settings.provided.callback_dispatcher.queue_size,
+        enqueue_timeout=settings.provided.callback_dispatcher.enqueue_timeout,
+        batch_size=settings.provided.callback_dispatcher.batch_size,
+        flush_interval=settings.provided.callback_dispatcher.flush_interval,
+        group_size=settings.provided.callback_dispatcher.group_size,
+        max_group_bytes=settings.provided.callback_dispatcher.max_group_bytes,
+        max_concurrency=settings.provided.callback_dispatcher.max_concurrency,
+        retry_backoff=settings.provided.callback_dispatcher.retry_backoff,
+        max_retry_backoff=settings.provided.callback_dispatcher.max_retry_backoff,
+        shutdown_timeout=settings.provided.callback_dispatcher.shutdown_timeout,
+    )
+
+    workflow_outbox_dispatcher = providers.Resource(
+        WorkflowOutboxDispatcherResource,
+        workflow_outbox_repository=RepositoriesContainer.workflow_outbox_repository,
+        workflow_engine_service=ServicesContainer.workflow_engine_service,
+        batch_size=settings.provided.workflow_outbox.batch_size,
+        poll_interval=settings.provided.workflow_outbox.poll_interval,
+        lease=settings.provided.workflow_outbox.lease,
+        retry_backoff=settings.provided.workflow_outbox.retry_backoff,
+        max_retry_backoff=settings.provided.workflow_outbox.max_retry_backoff,
+    )
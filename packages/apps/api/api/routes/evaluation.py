@@ -16,7 +16,7 @@ from internal_schemas.evaluation import (
     HttpEvaluationCreate,
     HttpEvaluationUpdate,
 )
-from internal_services.workflow.engine import WorkflowEngineService
+from internal_services.workflow.outbox import WorkflowOutboxDispatcher
 
 from api.containers import Container
 
@@ -131,8 +131,8 @@ async def create_evaluation(
     evaluation_category_repository: EvaluationCategoryRepository = Depends(
         Provide[Container.evaluation_category_repository]
     ),
-    workflow_engine_service: WorkflowEngineService = Depends(
-        Provide[Container.workflow_engine_service]
+    workflow_outbox_dispatcher: WorkflowOutboxDispatcher = Depends(
+        Provide[Container.workflow_outbox_dispatcher]
     ),
 ) -> internal_db_models.EvaluationRead:
     # Handle category creation/assignment
@@ -154,6 +154,8 @@ async def create_evaluation(
         )
         category_id = default_category.id
 
+    # The workflow start is recorded with the evaluation and started by the
+    # outbox dispatcher.
     evaluation = await evaluation_repository.add(
         internal_db_models.EvaluationCreate.model_validate(
             {
@@ -164,17 +166,20 @@ async def create_evaluation(
                 "category_id": category_id,
                 "id": uuid.uuid4(),
             }
-        )
-    )
-
-    await workflow_engine_service.start_workflow(
-        workflow_name="UpdateEvaluationWorkflow",
-        id=f"new-evaluation-workflow-{evaluation.id}",
-        payload={
-            "evaluation": evaluation.model_dump(mode="json"),
-            "old_evaluation": None,
-        },
+        ),
+        extra_rows=lambda evaluation: [
+            internal_db_models.WorkflowOutbox(
+                id=uuid.uuid4(),
+                workflow_name="UpdateEvaluationWorkflow",
+                workflow_id=f"new-evaluation-workflow-{evaluation.id}",
+                payload={
+                    "evaluation": evaluation.model_dump(mode="json"),
+                    "old_evaluation": None,
+                },
+            )
+        ],
     )
+    workflow_outbox_dispatcher.notify()
 
     return evaluation
 
@@ -194,31 +199,35 @@ async def update_evaluation(
     evaluation_repository: EvaluationRepository = Depends(
         Provide[Container.evaluation_repository]
     ),
-    workflow_engine_service: WorkflowEngineService = Depends(
-        Provide[Container.workflow_engine_service]
+    workflow_outbox_dispatcher: WorkflowOutboxDispatcher = Depends(
+        Provide[Container.workflow_outbox_dispatcher]
     ),
 ) -> internal_db_models.EvaluationRead:
     old_evaluation = await evaluation_repository.get(evaluation_id)
-    await evaluation_repository.update(
+    # Every update starts its own workflow, identified by the new updated_at.
+    updated_evaluation = await evaluation_repository.update(
         evaluation_id,
         {
             **payload.model_dump(exclude={"project_id"}),
         },
+        extra_rows=lambda evaluation: [
+            internal_db_models.WorkflowOutbox(
+                id=uuid.uuid4(),
+                workflow_name="UpdateEvaluationWorkflow",
+                workflow_id=(
+                    f"updated-evaluation-workflow-{evaluation.id}-"
+                    f"{evaluation.updated_at.timestamp():.6f}"
+                ),
+                payload={
+                    "evaluation": evaluation.model_dump(mode="json"),
+                    "old_evaluation": old_evaluation.model_dump(mode="json")
+                    if old_evaluation
+                    else None,
+                },
+            )
+        ],
     )
-    updated_evaluation = await evaluation_repository.get(evaluation_id)
-
-    await workflow_engine_service.start_workflow(
-        workflow_name="UpdateEvaluationWorkflow",
-        id=f"updated-evaluation-workflow-{updated_evaluation.id}",
-        payload={
-            "evaluation": updated_evaluation.model_dump(mode="json")
-            if updated_evaluation
-            else None,
-            "old_evaluation": old_evaluation.model_dump(mode="json")
-            if old_evaluation
-            else None,
-        },
-    )
+    workflow_outbox_dispatcher.notify()
 
     return updated_evaluation
 
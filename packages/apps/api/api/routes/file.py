@@ -9,6 +9,7 @@ from internal_aws_shared.s3 import generate_download_url
 from internal_db_repositories.file import FileRepository, FileSearchRequest
 from internal_db_repositories.file_content import FileContentRepository
 from internal_db_repositories.file_evaluation import FileEvaluationRepository
+from internal_services.llm_payload import FileEvaluationLlmPayloads, LlmPayloadService
 
 from api.containers import Container
 
@@ -138,6 +139,30 @@ async def get_file_evaluations(
     return file_evaluations
 
 
+@router.get(
+    "/projects/{project_id}/file-evaluations/{file_evaluation_id}/llm-payloads",
+    operation_id="getFileEvaluationLlmPayloads",
+    description="Get the full LLM request and response of a file evaluation",
+    response_model=FileEvaluationLlmPayloads,
+    tags=["files"],
+)
+@inject
+async def get_file_evaluation_llm_payloads(
+    project_id: UUID,
+    file_evaluation_id: UUID,
+    llm_payload_service: LlmPayloadService = Depends(
+        Provide[Container.llm_payload_service]
+    ),
+) -> FileEvaluationLlmPayloads:
+    payloads = await llm_payload_service.get_file_evaluation_payloads(
+        project_id, file_evaluation_id
+    )
+    if not payloads:
+        raise HTTPException(status_code=404, detail="File evaluation not found")
+
+    return payloads
+
+
 @router.delete(
     "/projects/{project_id}/file/{file_id}",
     operation_id="deleteFile",
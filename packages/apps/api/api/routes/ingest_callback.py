@@ -1,8 +1,12 @@
 import logging
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Request
-from internal_services import WorkflowEngineService
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from internal_services.workflow.dispatcher import (
+    CallbackDeliveryError,
+    CallbackDispatcher,
+    CallbackQueueFullError,
+)
 from vmxai.types import CompletionBatchItemUpdateCallbackPayload
 
 from api.containers import Container
@@ -16,19 +20,27 @@ logger = logging.getLogger(__name__)
     operation_id="ingestionCallback",
     description=(
         "Receives the callback from VM-X when a task is completed "
-        "and updates the workflow"
+        "and queues the workflow update"
     ),
     include_in_schema=False,
+    status_code=status.HTTP_202_ACCEPTED,
     tags=["ingest"],
 )
 @inject
 async def ingestion_callback(
     request: Request,
     payload: CompletionBatchItemUpdateCallbackPayload,
-    workflow_engine_service: WorkflowEngineService = Depends(
-        Provide[Container.workflow_engine_service]
+    callback_dispatcher: CallbackDispatcher = Depends(
+        Provide[Container.callback_dispatcher]
     ),
 ) -> None:
-    await workflow_engine_service.receive_batch_item_update_callback(
-        request.query_params, payload
-    )
+    try:
+        await callback_dispatcher.submit(dict(request.query_params), payload)
+    except (CallbackQueueFullError, CallbackDeliveryError) as e:
+        logger.warning(f"Rejecting ingestion callback: {e}")
+        # VM-X delivers rejected callbacks again.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        ) from e
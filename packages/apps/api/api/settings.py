@@ -22,6 +22,52 @@ class Landing(BaseSettings):
     def resolve_jinja_templates(cls, value): ...
 
 
+class CallbackDispatcher(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="CALLBACK_DISPATCHER_",
+    )
+
+    # Callbacks waiting to be delivered, the route answers 503 once the queue
+    # stays full for enqueue_timeout seconds.
+    queue_size: int = 10_000
+    enqueue_timeout: float = 1.0
+    # Queued callbacks are drained up to batch_size at a time, waiting at most
+    # flush_interval seconds for a burst. Callbacks of a workflow are sent in
+    # groups of up to group_size callbacks and max_group_bytes, below
+    # Temporal's 2MB payload limit.
+    batch_size: int = 500
+    flush_interval: float = 0.05
+    group_size: int = 50
+    max_group_bytes: int = 1_000_000
+    max_concurrency: int = 20
+    # Failed deliveries are retried until they succeed. Meanwhile new
+    # callbacks are delivered synchronously by the route.
+    retry_backoff: float = 0.5
+    max_retry_backoff: float = 30.0
+    # Time given to queued callbacks on shutdown.
+    shutdown_timeout: float = 30.0
+
+
+class WorkflowOutbox(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="WORKFLOW_OUTBOX_",
+    )
+
+    # Workflow starts claimed per batch. Claimed rows are retried by any API
+    # instance once lease seconds have passed without being started.
+    batch_size: int = 50
+    poll_interval: float = 1.0
+    lease: float = 60.0
+    retry_backoff: float = 1.0
+    max_retry_backoff: float = 300.0
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=env_file, env_file_encoding="utf-8", extra="ignore"
@@ -33,3 +79,5 @@ class Settings(BaseSettings):
     )
     temporal_host: str | None = None
     landing: Landing = Landing()
+    callback_dispatcher: CallbackDispatcher = CallbackDispatcher()
+    workflow_outbox: WorkflowOutbox = WorkflowOutbox()
@@ -0,0 +1,55 @@
+"""add file evaluation unique key
+
+Revision ID: 4c2d8e1f7a3b
+Revises: be745c6f8966
+Create Date: 2026-10-19 09:30:12.418276
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c2d8e1f7a3b"
+down_revision: Union[str, None] = "be745c6f8966"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Redelivered callbacks may have stored the same evaluation twice for a
+    # page, keep the most recent row only.
+    op.execute(
+        """
+        DELETE FROM file_evaluations
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    row_number() OVER (
+                        PARTITION BY evaluation_id, content_id
+                        ORDER BY updated_at DESC, id
+                    ) AS row_number
+                FROM file_evaluations
+            ) AS ranked
+            WHERE ranked.row_number > 1
+        )
+        """
+    )
+    op.create_unique_constraint(
+        "uq_file_evaluations_evaluation_id_content_id",
+        "file_evaluations",
+        ["evaluation_id", "content_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "uq_file_evaluations_evaluation_id_content_id",
+        "file_evaluations",
+        type_="unique",
+    )
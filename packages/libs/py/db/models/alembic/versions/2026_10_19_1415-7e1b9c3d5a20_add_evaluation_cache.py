@@ -0,0 +1,57 @@
+"""add evaluation cache
+
+Revision ID: 7e1b9c3d5a20
+Revises: 4c2d8e1f7a3b
+Create Date: 2026-10-19 14:15:37.902114
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e1b9c3d5a20"
+down_revision: Union[str, None] = "4c2d8e1f7a3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "evaluation_cache",
+        sa.Column("request_hash", sa.Text(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column(
+            "llm_response", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+        sa.Column("total_tokens", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("request_hash"),
+    )
+    op.add_column(
+        "evaluations",
+        sa.Column("cache_enabled", sa.Boolean(), server_default="true", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("evaluations", "cache_enabled")
+    op.drop_table("evaluation_cache")
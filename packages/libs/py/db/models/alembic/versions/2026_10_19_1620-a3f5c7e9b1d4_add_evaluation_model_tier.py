@@ -0,0 +1,30 @@
+"""add evaluation model tier
+
+Revision ID: a3f5c7e9b1d4
+Revises: 7e1b9c3d5a20
+Create Date: 2026-10-19 16:20:11.482310
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f5c7e9b1d4"
+down_revision: Union[str, None] = "7e1b9c3d5a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("evaluations", sa.Column("model_tier", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("evaluations", "model_tier")
@@ -0,0 +1,276 @@
+"""add llm payloads
+
+Revision ID: c8d2e4f6a0b3
+Revises: a3f5c7e9b1d4
+Create Date: 2026-10-19 17:50:42.915537
+
+"""
+
+import hashlib
+import json
+import zlib
+from collections.abc import Sequence
+from typing import Any, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d2e4f6a0b3"
+down_revision: Union[str, None] = "a3f5c7e9b1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+file_evaluations = sa.table(
+    "file_evaluations",
+    sa.column("id", sa.Uuid()),
+    sa.column("content_id", sa.Uuid()),
+    sa.column("llm_request", postgresql.JSONB()),
+    sa.column("llm_response", postgresql.JSONB()),
+    sa.column("llm_request_hash", sa.Text()),
+    sa.column("llm_response_hash", sa.Text()),
+)
+llm_payloads = sa.table(
+    "llm_payloads",
+    sa.column("hash", sa.Text()),
+    sa.column("payload", sa.LargeBinary()),
+    sa.column("size", sa.Integer()),
+)
+file_contents = sa.table(
+    "file_contents",
+    sa.column("id", sa.Uuid()),
+    sa.column("content", sa.Text()),
+    sa.column("content_metadata", postgresql.JSONB()),
+)
+
+update_file_evaluation = (
+    sa.update(file_evaluations)
+    .where(file_evaluations.c.id == sa.bindparam("_id"))
+    .values(
+        llm_request=sa.bindparam("llm_request"),
+        llm_response=sa.bindparam("llm_response"),
+        llm_request_hash=sa.bindparam("llm_request_hash"),
+        llm_response_hash=sa.bindparam("llm_response_hash"),
+    )
+)
+
+
+# Copy of the internal_db_models.llm_payload logic at this revision, so the
+# migration keeps producing the same rows when the application code changes.
+PAGE_PLACEHOLDER = "<file_content/>"
+PAGE_MESSAGE_PREFIX = "Document Page: "
+INLINE_RESPONSE_MAX_BYTES = 2048
+
+
+def _page_message_content(file_content: dict[str, Any]) -> str:
+    content = f"{PAGE_MESSAGE_PREFIX}{file_content['content']}"
+    if file_content["content_metadata"]:
+        content += f"\n\nMetadata: {file_content['content_metadata']}"
+
+    return content
+
+
+def _encode_payload(data: dict[str, Any]) -> dict[str, Any]:
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return {
+        "hash": hashlib.sha256(raw).hexdigest(),
+        "payload": zlib.compress(raw),
+        "size": len(raw),
+    }
+
+
+def _decode_payload(payload: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(payload))
+
+
+def _compact_request(
+    llm_request: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    metadata = dict(llm_request.get("metadata") or {})
+    body = {key: value for key, value in llm_request.items() if key != "metadata"}
+    if not metadata.get("page_trimmed"):
+        body["messages"] = [
+            {**message, "content": PAGE_PLACEHOLDER}
+            if str(message.get("content") or "").startswith(PAGE_MESSAGE_PREFIX)
+            else message
+            for message in body.get("messages") or []
+        ]
+        metadata.pop("page_metadata", None)
+
+    return {"metadata": metadata}, _encode_payload(body)
+
+
+def _rehydrate_request(
+    reference: dict[str, Any] | None,
+    body: dict[str, Any],
+    file_content: dict[str, Any] | None,
+) -> dict[str, Any]:
+    metadata = dict((reference or {}).get("metadata") or {})
+    messages = body.get("messages") or []
+    if file_content:
+        metadata.setdefault("page_metadata", file_content["content_metadata"])
+        messages = [
+            {**message, "content": _page_message_content(file_content)}
+            if message.get("content") == PAGE_PLACEHOLDER
+            else message
+            for message in messages
+        ]
+
+    return {**body, "messages": messages, "metadata": metadata}
+
+
+def _compact_response(
+    llm_response: dict[str, Any] | None,
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    if not llm_response:
+        return llm_response, None
+
+    payload = _encode_payload(llm_response)
+    if payload["size"] <= INLINE_RESPONSE_MAX_BYTES:
+        return llm_response, None
+
+    return None, payload
+
+
+def _batches(connection: sa.Connection, *where):
+    """Rows of file_evaluations matching ``where``, BATCH_SIZE at a time."""
+    last_id = None
+    while True:
+        query = (
+            sa.select(file_evaluations)
+            .where(*where)
+            .order_by(file_evaluations.c.id)
+            .limit(BATCH_SIZE)
+        )
+        if last_id:
+            query = query.where(file_evaluations.c.id > last_id)
+
+        rows = connection.execute(query).mappings().all()
+        if not rows:
+            return
+
+        yield rows
+        last_id = rows[-1]["id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "llm_payloads",
+        sa.Column("hash", sa.Text(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    op.add_column(
+        "file_evaluations", sa.Column("llm_request_hash", sa.Text(), nullable=True)
+    )
+    op.add_column(
+        "file_evaluations", sa.Column("llm_response_hash", sa.Text(), nullable=True)
+    )
+
+    # Backfill: move the request bodies and large responses already stored.
+    connection = op.get_bind()
+    for rows in _batches(connection, file_evaluations.c.llm_request_hash.is_(None)):
+        payloads = {}
+        updates = []
+        for row in rows:
+            llm_request, llm_response = row["llm_request"], row["llm_response"]
+            llm_request_hash = llm_response_hash = None
+            if llm_request:
+                llm_request, payload = _compact_request(llm_request)
+                llm_request_hash = payload["hash"]
+                payloads[payload["hash"]] = payload
+
+            inline_response, payload = _compact_response(llm_response)
+            if payload:
+                llm_response, llm_response_hash = inline_response, payload["hash"]
+                payloads[payload["hash"]] = payload
+
+            if llm_request_hash or llm_response_hash:
+                updates.append(
+                    {
+                        "_id": row["id"],
+                        "llm_request": llm_request,
+                        "llm_response": llm_response,
+                        "llm_request_hash": llm_request_hash,
+                        "llm_response_hash": llm_response_hash,
+                    }
+                )
+
+        if payloads:
+            connection.execute(
+                postgresql.insert(llm_payloads)
+                .values(list(payloads.values()))
+                .on_conflict_do_nothing()
+            )
+        if updates:
+            connection.execute(update_file_evaluation, updates)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    for rows in _batches(
+        connection,
+        sa.or_(
+            file_evaluations.c.llm_request_hash.is_not(None),
+            file_evaluations.c.llm_response_hash.is_not(None),
+        ),
+    ):
+        hashes = {
+            payload_hash
+            for row in rows
+            for payload_hash in (row["llm_request_hash"], row["llm_response_hash"])
+            if payload_hash
+        }
+        payloads = {
+            payload["hash"]: _decode_payload(payload["payload"])
+            for payload in connection.execute(
+                sa.select(llm_payloads).where(llm_payloads.c.hash.in_(hashes))
+            ).mappings()
+        }
+        contents = {
+            content["id"]: content
+            for content in connection.execute(
+                sa.select(file_contents).where(
+                    file_contents.c.id.in_({row["content_id"] for row in rows})
+                )
+            ).mappings()
+        }
+
+        connection.execute(
+            update_file_evaluation,
+            [
+                {
+                    "_id": row["id"],
+                    "llm_request": _rehydrate_request(
+                        row["llm_request"],
+                        payloads[row["llm_request_hash"]],
+                        contents.get(row["content_id"]),
+                    )
+                    if row["llm_request_hash"]
+                    else row["llm_request"],
+                    "llm_response": payloads[row["llm_response_hash"]]
+                    if row["llm_response_hash"]
+                    else row["llm_response"],
+                    "llm_request_hash": None,
+                    "llm_response_hash": None,
+                }
+                for row in rows
+            ],
+        )
+
+    op.drop_column("file_evaluations", "llm_response_hash")
+    op.drop_column("file_evaluations", "llm_request_hash")
+    op.drop_table("llm_payloads")
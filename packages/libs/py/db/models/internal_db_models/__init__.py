@@ -6,6 +6,11 @@ from .evaluation import (
     EvaluationTree,
     EvaluationType,
 )
+from .evaluation_cache import (
+    EvaluationCache,
+    EvaluationCacheCreate,
+    EvaluationCacheRead,
+)
 from .evaluation_category import (
     EvaluationCategory,
     EvaluationCategoryBase,
@@ -43,6 +48,11 @@ from .file_embedding import (
     FileEmbeddingRead,
     FileEmbeddingStatus,
 )
+from .llm_payload import (
+    LlmPayload,
+    LlmPayloadCreate,
+    LlmPayloadRead,
+)
 from .project import (
     Project,
     ProjectCreate,
@@ -52,6 +62,11 @@ from .project import (
     ProjectRead,
     ProjectReadWithStats,
 )
+from .workflow_outbox import (
+    WorkflowOutbox,
+    WorkflowOutboxCreate,
+    WorkflowOutboxRead,
+)
 
 __all__ = [
     "File",
@@ -86,6 +101,9 @@ __all__ = [
     "EvaluationType",
     "EvaluationTree",
     "EvaluationReadWithTemplate",
+    "EvaluationCache",
+    "EvaluationCacheCreate",
+    "EvaluationCacheRead",
     "EvaluationCategory",
     "EvaluationCategoryBase",
     "EvaluationCategoryCreate",
@@ -94,4 +112,10 @@ __all__ = [
     "EvaluationTemplate",
     "EvaluationTemplateCreate",
     "EvaluationTemplateRead",
+    "LlmPayload",
+    "LlmPayloadCreate",
+    "LlmPayloadRead",
+    "WorkflowOutbox",
+    "WorkflowOutboxCreate",
+    "WorkflowOutboxRead",
 ]
@@ -38,6 +38,11 @@ class EvaluationBase(SQLModel):
     template_id: UUID | None = Field(
         foreign_key="evaluation_templates.id", nullable=True
     )
+    cache_enabled: bool = Field(
+        default=True, nullable=False, sa_column_kwargs={"server_default": "true"}
+    )
+    # Named VM-X resource tier, defaults by evaluation type when not set.
+    model_tier: str | None = Field(default=None, sa_type=Text, nullable=True)
 
 
 class Evaluation(EvaluationBase, table=True):
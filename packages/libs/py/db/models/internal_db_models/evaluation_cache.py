@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Text, func
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Field, SQLModel
+
+
+class EvaluationCacheBase(SQLModel):
+    # SHA-256 of the normalized LLM request (messages, tools and resource).
+    request_hash: str = Field(sa_type=Text, primary_key=True)
+    response: str | None = Field(sa_type=Text, nullable=True)
+    llm_response: dict | None = Field(default=None, sa_type=postgresql.JSONB)
+    total_tokens: int = Field(default=0, nullable=False)
+
+
+class EvaluationCache(EvaluationCacheBase, table=True):
+    __tablename__ = "evaluation_cache"
+
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+
+    updated_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+            onupdate=func.now(),
+        ),
+    )
+
+
+class EvaluationCacheCreate(EvaluationCacheBase): ...
+
+
+class EvaluationCacheRead(EvaluationCacheBase):
+    created_at: datetime
+    updated_at: datetime
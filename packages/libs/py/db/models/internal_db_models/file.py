@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from uuid import UUID
 
-from sqlalchemy import Column, Text, func
+from sqlalchemy import Column, Text, UniqueConstraint, func
 from sqlalchemy.dialects import postgresql
 from sqlmodel import Field, Relationship, SQLModel
 
@@ -90,10 +90,21 @@ class FileEvaluationBase(SQLModel):
     error: str | None = Field(default=None, sa_type=Text)
     llm_request: dict | None = Field(default=None, sa_type=postgresql.JSONB)
     llm_response: dict | None = Field(default=None, sa_type=postgresql.JSONB)
+    # Set when the request body or response is stored in llm_payloads, the
+    # JSONB columns then only keep the request metadata (see llm_payload.py).
+    llm_request_hash: str | None = Field(default=None, sa_type=Text, nullable=True)
+    llm_response_hash: str | None = Field(default=None, sa_type=Text, nullable=True)
 
 
 class FileEvaluation(FileEvaluationBase, table=True):
     __tablename__ = "file_evaluations"
+    __table_args__ = (
+        UniqueConstraint(
+            "evaluation_id",
+            "content_id",
+            name="uq_file_evaluations_evaluation_id_content_id",
+        ),
+    )
 
     id: UUID | None = Field(primary_key=True)
 
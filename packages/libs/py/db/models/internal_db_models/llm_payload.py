@@ -0,0 +1,147 @@
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Column, LargeBinary, Text, func
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Field, SQLModel
+
+from .file import FileEvaluationCreate
+from .file_content import FileContentRead
+
+# Stands for the page message of a stored LLM request, rebuilt from
+# file_contents when the request is rehydrated.
+PAGE_PLACEHOLDER = "<file_content/>"
+PAGE_MESSAGE_PREFIX = "Document Page: "
+# Responses up to this size stay inline in file_evaluations.llm_response.
+INLINE_RESPONSE_MAX_BYTES = 2048
+
+
+class LlmPayloadBase(SQLModel):
+    # SHA-256 of the canonical JSON, identical payloads are stored once.
+    hash: str = Field(sa_type=Text, primary_key=True)
+    # zlib compressed JSON.
+    payload: bytes = Field(sa_type=LargeBinary, nullable=False)
+    size: int = Field(nullable=False)
+
+
+class LlmPayload(LlmPayloadBase, table=True):
+    __tablename__ = "llm_payloads"
+
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+
+
+class LlmPayloadCreate(LlmPayloadBase): ...
+
+
+class LlmPayloadRead(LlmPayloadBase):
+    created_at: datetime
+
+
+def page_message_content(file_content: FileContentRead) -> str:
+    content = f"{PAGE_MESSAGE_PREFIX}{file_content.content}"
+    if file_content.content_metadata:
+        content += f"\n\nMetadata: {file_content.content_metadata}"
+
+    return content
+
+
+def encode_llm_payload(data: dict[str, Any]) -> LlmPayloadCreate:
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return LlmPayloadCreate(
+        hash=hashlib.sha256(raw).hexdigest(),
+        payload=zlib.compress(raw),
+        size=len(raw),
+    )
+
+
+def decode_llm_payload(payload: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(payload))
+
+
+def compact_llm_request(
+    llm_request: dict[str, Any],
+) -> tuple[dict[str, Any], LlmPayloadCreate]:
+    """Split a request into its per-row metadata and a shared body.
+
+    The page message is replaced by ``PAGE_PLACEHOLDER`` and the page metadata
+    dropped, both are in file_contents. What is left (prompts, tools and
+    resource) is the same for every page of an evaluation version, so the body
+    is stored once per version. Pages sent in windows or without their
+    metadata (tagged ``page_windows``) can't be rebuilt and stay inline.
+    """
+    metadata = dict(llm_request.get("metadata") or {})
+    body = {key: value for key, value in llm_request.items() if key != "metadata"}
+    if not metadata.get("page_windows"):
+        body["messages"] = [
+            {**message, "content": PAGE_PLACEHOLDER}
+            if str(message.get("content") or "").startswith(PAGE_MESSAGE_PREFIX)
+            else message
+            for message in body.get("messages") or []
+        ]
+        metadata.pop("page_metadata", None)
+
+    return {"metadata": metadata}, encode_llm_payload(body)
+
+
+def rehydrate_llm_request(
+    reference: dict[str, Any] | None,
+    body: dict[str, Any],
+    file_content: FileContentRead | None,
+) -> dict[str, Any]:
+    metadata = dict((reference or {}).get("metadata") or {})
+    messages = body.get("messages") or []
+    if file_content:
+        metadata.setdefault("page_metadata", file_content.content_metadata)
+        messages = [
+            {**message, "content": page_message_content(file_content)}
+            if message.get("content") == PAGE_PLACEHOLDER
+            else message
+            for message in messages
+        ]
+
+    return {**body, "messages": messages, "metadata": metadata}
+
+
+def compact_llm_response(
+    llm_response: dict[str, Any] | None,
+    inline_max_bytes: int = INLINE_RESPONSE_MAX_BYTES,
+) -> tuple[dict[str, Any] | None, LlmPayloadCreate | None]:
+    """Move responses larger than ``inline_max_bytes`` to a payload."""
+    if not llm_response:
+        return llm_response, None
+
+    payload = encode_llm_payload(llm_response)
+    if payload.size <= inline_max_bytes:
+        return llm_response, None
+
+    return None, payload
+
+
+def compact_file_evaluation(
+    file_evaluation: FileEvaluationCreate,
+) -> tuple[FileEvaluationCreate, list[LlmPayloadCreate]]:
+    """Move the request body and a large response of a row to payloads."""
+    updates: dict[str, Any] = {}
+    payloads: list[LlmPayloadCreate] = []
+    if file_evaluation.llm_request and not file_evaluation.llm_request_hash:
+        reference, payload = compact_llm_request(file_evaluation.llm_request)
+        updates.update(llm_request=reference, llm_request_hash=payload.hash)
+        payloads.append(payload)
+
+    if file_evaluation.llm_response and not file_evaluation.llm_response_hash:
+        _, payload = compact_llm_response(file_evaluation.llm_response)
+        if payload:
+            updates.update(llm_response=None, llm_response_hash=payload.hash)
+            payloads.append(payload)
+
+    return file_evaluation.model_copy(update=updates), payloads
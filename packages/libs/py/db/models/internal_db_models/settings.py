@@ -1,4 +1,5 @@
 from os import environ
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,6 +43,14 @@ class DatabaseSettings(BaseSettings):
             f"database-secret-{environ.get('ENV', 'local')}"
         )
     )
+    # Engine profile of the process, see RUNTIME_PROFILES in
+    # internal_db_services.database. pool_size and max_overflow override it.
+    runtime: Literal["api", "worker", "lambda", "consumer"] = "api"
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    # Set when connecting through pgbouncer or RDS Proxy in transaction mode:
+    # the pooler owns the connections and prepared statements are disabled.
+    transaction_pooler: bool = False
 
 
 class Settings(BaseSettings):
@@ -0,0 +1,53 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Column, Index, Text, func
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Field, SQLModel
+
+
+class WorkflowOutboxBase(SQLModel):
+    workflow_name: str = Field(sa_type=Text, nullable=False)
+    # Starting a workflow ID that already exists is a no-op, so a row can be
+    # dispatched again safely.
+    workflow_id: str = Field(sa_type=Text, nullable=False)
+    payload: dict = Field(sa_type=postgresql.JSONB, nullable=False)
+
+
+class WorkflowOutbox(WorkflowOutboxBase, table=True):
+    __tablename__ = "workflow_outbox"
+    __table_args__ = (Index("ix_workflow_outbox_available_at", "available_at"),)
+
+    id: UUID | None = Field(primary_key=True)
+    attempts: int = Field(default=0, nullable=False)
+    last_error: str | None = Field(default=None, sa_type=Text, nullable=True)
+    # Rows are dispatched once available_at has passed, claiming a row pushes
+    # it forward so that a crashed dispatcher's rows are picked up again.
+    available_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=func.now(),
+        ),
+    )
+
+
+class WorkflowOutboxCreate(WorkflowOutboxBase):
+    id: UUID
+
+
+class WorkflowOutboxRead(WorkflowOutboxBase):
+    id: UUID
+    attempts: int
+    last_error: str | None
+    available_at: datetime
+    created_at: datetime
@@ -0,0 +1,87 @@
+import uuid
+
+from internal_db_models import FileContentRead, FileEvaluationCreate
+from internal_db_models.llm_payload import (
+    PAGE_PLACEHOLDER,
+    compact_file_evaluation,
+    compact_llm_request,
+    decode_llm_payload,
+    page_message_content,
+    rehydrate_llm_request,
+)
+
+
+def _page(content: str) -> FileContentRead:
+    return FileContentRead(
+        id=uuid.uuid4(),
+        file_id=uuid.uuid4(),
+        content_number=1,
+        content_metadata={"lines": 2},
+        content=content,
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+
+def _llm_request(page: FileContentRead) -> dict:
+    return {
+        "resource": "resource",
+        "messages": [
+            {"role": "system", "content": "You review contracts."},
+            {"role": "user", "content": page_message_content(page)},
+            {"role": "user", "content": "Is the contract signed?"},
+        ],
+        "metadata": {"evaluation_id": "1", "page_metadata": page.content_metadata},
+    }
+
+
+def test_requests_of_different_pages_share_their_body():
+    first, second = _page("First page"), _page("Second page")
+    first_reference, first_payload = compact_llm_request(_llm_request(first))
+    _, second_payload = compact_llm_request(_llm_request(second))
+
+    assert first_payload.hash == second_payload.hash
+    assert first_reference == {"metadata": {"evaluation_id": "1"}}
+
+    body = decode_llm_payload(first_payload.payload)
+    assert body["messages"][1]["content"] == PAGE_PLACEHOLDER
+    assert rehydrate_llm_request(first_reference, body, first) == _llm_request(first)
+
+
+def test_large_responses_move_to_payloads():
+    page = _page("Page")
+    file_evaluation = FileEvaluationCreate(
+        id=uuid.uuid4(),
+        file_id=page.file_id,
+        evaluation_id=uuid.uuid4(),
+        content_id=page.id,
+        response="true",
+        llm_request=_llm_request(page),
+        llm_response={"choices": [{"content": "x" * 4096}]},
+    )
+
+    compacted, payloads = compact_file_evaluation(file_evaluation)
+
+    assert compacted.llm_response is None
+    assert [compacted.llm_request_hash, compacted.llm_response_hash] == [
+        payload.hash for payload in payloads
+    ]
+    assert decode_llm_payload(payloads[1].payload) == file_evaluation.llm_response
+
+    small = file_evaluation.model_copy(update={"llm_response": {"choices": []}})
+    compacted, payloads = compact_file_evaluation(small)
+    assert compacted.llm_response == {"choices": []}
+    assert compacted.llm_response_hash is None
+    assert len(payloads) == 1
+
+
+def test_windowed_pages_stay_inline():
+    request = _llm_request(_page("Part of a page"))
+    request["metadata"]["page_windows"] = 2
+
+    reference, payload = compact_llm_request(request)
+
+    assert (
+        rehydrate_llm_request(reference, decode_llm_payload(payload.payload), None)
+        == request
+    )
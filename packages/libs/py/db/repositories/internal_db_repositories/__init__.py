@@ -1,21 +1,30 @@
 from .base import BaseRepository
+from .cache import CacheStats, RepositoryCache
 from .evaluation import EvaluationRepository
+from .evaluation_cache import EvaluationCacheRepository
 from .evaluation_category import EvaluationCategoryRepository
 from .evaluation_template import EvaluationTemplateRepository
 from .file import FileRepository
 from .file_content import FileContentRepository
 from .file_embedding import FileEmbeddingRepository
 from .file_evaluation import FileEvaluationRepository
+from .llm_payload import LlmPayloadRepository
 from .project import ProjectRepository
+from .workflow_outbox import WorkflowOutboxRepository
 
 __all__ = [
     "BaseRepository",
+    "CacheStats",
+    "RepositoryCache",
     "FileRepository",
     "FileContentRepository",
     "FileEmbeddingRepository",
     "FileEvaluationRepository",
     "ProjectRepository",
     "EvaluationRepository",
+    "EvaluationCacheRepository",
     "EvaluationCategoryRepository",
     "EvaluationTemplateRepository",
+    "LlmPayloadRepository",
+    "WorkflowOutboxRepository",
 ]
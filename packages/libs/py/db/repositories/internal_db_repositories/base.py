@@ -1,12 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
 from typing import Any, Generic, Literal, TypeVar, overload
 
 from internal_db_services.database import Database
 from internal_utils.chunk import chunk
-from sqlalchemy import Column, insert, tuple_
+from sqlalchemy import Column, func, insert, tuple_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import ColumnExpressionArgument
 from sqlmodel import SQLModel, delete, select, update
 
+from .cache import CacheStats, RepositoryCache
+
 TModel = TypeVar("TModel", bound=SQLModel)
 TReadModel = TypeVar("TReadModel", bound=SQLModel)
 TCreateModel = TypeVar("TCreateModel", bound=SQLModel)
@@ -14,6 +18,9 @@ TID = TypeVar("TID", bound=Any | tuple[Any, ...])
 
 MAX_PG_PARAM_SIZE = 65535
 
+# Builds rows to write in the same transaction as a record, from the record.
+ExtraRowsFactory = Callable[[TReadModel], Sequence[SQLModel]]
+
 
 class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
     """Base repository class providing common database operations.
@@ -29,6 +36,8 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         model: The SQLModel class representing the database model
         read_model: The SQLModel class used for reading/returning data
         create_model: The SQLModel class used for creating new records
+        cache: Optional read-through cache used by ``get``/``get_many``,
+            invalidated on writes made through this repository
 
     Attributes:
         _session_factory: Factory for creating read database sessions
@@ -44,12 +53,39 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         model: type[TModel],
         read_model: type[TReadModel],
         create_model: type[TCreateModel],
+        cache: RepositoryCache | None = None,
     ):
         self._session_factory = db.session
         self._write_session_factory = db.writer_session
         self._model = model
         self._read_model = read_model
         self._create_model = create_model
+        self._cache = cache
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Hit/miss counters of the cache, None when caching is disabled."""
+        return self._cache.stats if self._cache else None
+
+    def _cached(self, id: TID) -> TReadModel | None:
+        if not self._cache:
+            return None
+
+        cached = self._cache.get(id)
+        # Callers may mutate the returned model, never hand out the cached one.
+        return cached.model_copy() if cached is not None else None
+
+    def _invalidate(self, ids: list[TID]) -> None:
+        if self._cache:
+            for id in ids:
+                self._cache.invalidate(id)
+
+    def _cache_id(self, row: TReadModel | dict[str, Any]) -> TID:
+        values = [
+            row[field.name] if isinstance(row, dict) else getattr(row, field.name)
+            for field in self._id_fields
+        ]
+        return values[0] if len(values) == 1 else tuple(values)
 
     @property
     @abstractmethod
@@ -98,12 +134,18 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         Returns:
             The found record converted to read model, or None if not found
         """
+        if cached := self._cached(id):
+            return cached
+
         async with self._session_factory() as session:
             db_model = await session.get(self._model, id)
             if not db_model:
                 return None
 
-            return self._read_model.model_validate(db_model)
+            read_model = self._read_model.model_validate(db_model)
+            if self._cache:
+                self._cache.set(id, read_model.model_copy())
+            return read_model
 
     async def get_many(self, ids: list[TID]) -> list[TReadModel]:
         """Retrieves multiple records by ID.
@@ -117,6 +159,19 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         if not ids:
             return []
 
+        read_models: list[TReadModel] = []
+        if self._cache:
+            missing_ids = []
+            for id in ids:
+                if cached := self._cached(id):
+                    read_models.append(cached)
+                else:
+                    missing_ids.append(id)
+
+            if not missing_ids:
+                return read_models
+            ids = missing_ids
+
         async with self._session_factory() as session:
             query = select(self._model)
             if len(self._id_fields) > 1:
@@ -125,13 +180,25 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
                 query = query.where(self._id_fields[0].in_(ids))
 
             result = await session.scalars(query)
-            return [self._read_model.model_validate(row) for row in result]
+            for row in result:
+                read_model = self._read_model.model_validate(row)
+                if self._cache:
+                    self._cache.set(self._cache_id(read_model), read_model.model_copy())
+                read_models.append(read_model)
+
+            return read_models
 
-    async def add(self, model: TCreateModel) -> TReadModel:
+    async def add(
+        self,
+        model: TCreateModel,
+        extra_rows: ExtraRowsFactory[TReadModel] | None = None,
+    ) -> TReadModel:
         """Adds a new record to the database.
 
         Args:
             model: The model instance to add
+            extra_rows: Optional factory of table models, written in the same
+                transaction as the record
 
         Returns:
             The newly created record converted to read model
@@ -142,6 +209,10 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         async with self._write_session_factory() as session:
             db_model = self._model.model_validate(model)
             session.add(db_model)
+            if extra_rows:
+                await session.flush()
+                await session.refresh(db_model)
+                session.add_all(extra_rows(self._read_model.model_validate(db_model)))
             await session.commit()
             await session.refresh(db_model)
             return self._read_model.model_validate(db_model)
@@ -151,6 +222,7 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         self,
         models: list[TCreateModel],
         return_models: Literal[True],
+        ignore_conflicts: bool = False,
     ) -> list[TReadModel]: ...
 
     @overload
@@ -158,23 +230,31 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
         self,
         models: list[TCreateModel],
         return_models: Literal[False],
+        ignore_conflicts: bool = False,
     ) -> None: ...
 
     @overload
     async def add_all(
         self,
         models: list[TCreateModel],
+        *,
+        ignore_conflicts: bool = False,
     ) -> None: ...
 
     async def add_all(
         self,
         models: list[TCreateModel],
         return_models: bool = False,
+        ignore_conflicts: bool = False,
     ) -> list[TReadModel] | None:
         """Adds multiple records to the database.
 
         Args:
             models: List of model instances to add
+            return_models: Whether to return the inserted records
+            ignore_conflicts: Skip records that violate a unique constraint
+                (``ON CONFLICT DO NOTHING``), making retried inserts idempotent.
+                Skipped records are not returned.
 
         Raises:
             SQLAlchemyError: If there is a database error
@@ -186,7 +266,15 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
             for items in chunk(
                 db_models, int(MAX_PG_PARAM_SIZE / len(self._model.model_fields.keys()))
             ):
-                query = insert(self._model).values(items)
+                if ignore_conflicts:
+                    query = (
+                        postgresql.insert(self._model)
+                        .values(items)
+                        .on_conflict_do_nothing()
+                    )
+                else:
+                    query = insert(self._model).values(items)
+
                 if return_models:
                     query = query.returning(self._model)
 
@@ -202,22 +290,132 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
             await session.commit()
             return inserted_models if return_models else None
 
-    async def update(self, id: TID, values: dict[str, Any]) -> TReadModel:
+    @overload
+    async def upsert_many(
+        self,
+        models: list[TCreateModel],
+        conflict_fields: list[str],
+        update_fields: list[str] | None = None,
+        *,
+        return_models: Literal[True],
+    ) -> list[TReadModel]: ...
+
+    @overload
+    async def upsert_many(
+        self,
+        models: list[TCreateModel],
+        conflict_fields: list[str],
+        update_fields: list[str] | None = None,
+        *,
+        return_models: Literal[False] = False,
+    ) -> None: ...
+
+    async def upsert_many(
+        self,
+        models: list[TCreateModel],
+        conflict_fields: list[str],
+        update_fields: list[str] | None = None,
+        *,
+        return_models: bool = False,
+    ) -> list[TReadModel] | None:
+        """Inserts records, updating the ones that already exist.
+
+        Uses a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` per
+        chunk, so concurrent or redelivered writes cannot create duplicates.
+
+        Args:
+            models: List of model instances to insert or update
+            conflict_fields: Columns of the unique constraint identifying a record
+            update_fields: Columns to overwrite on conflict, defaults to every
+                column except the conflict and ID fields
+            return_models: Whether to return the inserted or updated records
+
+        Raises:
+            SQLAlchemyError: If there is a database error
+        """
+        if not models:
+            return [] if return_models else None
+
+        db_models = [model.model_dump() for model in models]
+        if update_fields is None:
+            excluded_fields = {*conflict_fields, *(f.name for f in self._id_fields)}
+            update_fields = [
+                field for field in db_models[0] if field not in excluded_fields
+            ]
+
+        async with self._write_session_factory() as session:
+            upserted_models = []
+
+            for items in chunk(
+                db_models, int(MAX_PG_PARAM_SIZE / len(self._model.model_fields.keys()))
+            ):
+                query = postgresql.insert(self._model).values(items)
+                values = {field: query.excluded[field] for field in update_fields}
+                if "updated_at" in self._model.model_fields:
+                    values["updated_at"] = func.now()
+
+                query = query.on_conflict_do_update(
+                    index_elements=conflict_fields, set_=values
+                )
+                if return_models:
+                    query = query.returning(self._model)
+
+                result = await session.execute(query)
+                if return_models:
+                    upserted_models.extend(
+                        [
+                            self._read_model.model_validate(row)
+                            for row in result.scalars().all()
+                        ]
+                    )
+
+            await session.commit()
+            if {field.name for field in self._id_fields}.issubset(db_models[0]):
+                self._invalidate([self._cache_id(item) for item in db_models])
+            elif self._cache:
+                # Rows are matched on other columns, their IDs are unknown here.
+                self._cache.clear()
+
+            return upserted_models if return_models else None
+
+    async def update(
+        self,
+        id: TID,
+        values: dict[str, Any],
+        extra_rows: ExtraRowsFactory[TReadModel] | None = None,
+    ) -> TReadModel | None:
         """Updates an existing record with new values.
 
         Args:
             id: The ID of the record to update
             values: Dictionary of field names and values to update
+            extra_rows: Optional factory of table models, written in the same
+                transaction as the update
+
+        Returns:
+            The updated record converted to read model, or None if not found
 
         Raises:
             SQLAlchemyError: If there is a database error
         """
         async with self._write_session_factory() as session:
-            query = update(self._model).where(self._id_predicate(id)).values(**values)
-            await session.execute(query)
+            query = (
+                update(self._model)
+                .where(self._id_predicate(id))
+                .values(**values)
+                .returning(self._model)
+            )
+            result = await session.execute(query)
+            db_model = result.scalars().first()
+            updated_model = (
+                self._read_model.model_validate(db_model) if db_model else None
+            )
+            if extra_rows and updated_model:
+                session.add_all(extra_rows(updated_model))
             await session.commit()
+            self._invalidate([id])
 
-            return await self.get(id)
+            return updated_model
 
     async def delete(self, id: TID) -> None:
         """Deletes a record from the database.
@@ -232,3 +430,4 @@ class BaseRepository(ABC, Generic[TID, TModel, TReadModel, TCreateModel]):
             query = delete(self._model).where(self._id_predicate(id))
             await session.execute(query)
             await session.commit()
+            self._invalidate([id])
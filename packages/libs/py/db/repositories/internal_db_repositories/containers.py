@@ -2,12 +2,22 @@ from dependency_injector import providers
 from internal_db_services.containers import DatabaseContainer
 
 import internal_db_repositories
+from internal_db_repositories.cache import create_repository_cache
+from internal_db_repositories.settings import RepositoryCacheSettings
 
 
 class RepositoriesContainer(DatabaseContainer):
+    repository_cache_settings = providers.Singleton(RepositoryCacheSettings)
+
     file_repository = providers.Singleton(
         internal_db_repositories.FileRepository,
         db=DatabaseContainer.db,
+        cache=providers.Factory(
+            create_repository_cache,
+            enabled=repository_cache_settings.provided.enabled,
+            ttl=repository_cache_settings.provided.file_ttl,
+            max_size=repository_cache_settings.provided.max_size,
+        ),
     )
 
     file_embedding_repository = providers.Singleton(
@@ -20,14 +30,26 @@ class RepositoriesContainer(DatabaseContainer):
         db=DatabaseContainer.db,
     )
 
+    llm_payload_repository = providers.Singleton(
+        internal_db_repositories.LlmPayloadRepository,
+        db=DatabaseContainer.db,
+    )
+
     file_evaluation_repository = providers.Singleton(
         internal_db_repositories.FileEvaluationRepository,
         db=DatabaseContainer.db,
+        llm_payload_repository=llm_payload_repository,
     )
 
     project_repository = providers.Singleton(
         internal_db_repositories.ProjectRepository,
         db=DatabaseContainer.db,
+        cache=providers.Factory(
+            create_repository_cache,
+            enabled=repository_cache_settings.provided.enabled,
+            ttl=repository_cache_settings.provided.project_ttl,
+            max_size=repository_cache_settings.provided.max_size,
+        ),
     )
 
     evaluation_repository = providers.Singleton(
@@ -43,4 +65,20 @@ class RepositoriesContainer(DatabaseContainer):
     evaluation_template_repository = providers.Singleton(
         internal_db_repositories.EvaluationTemplateRepository,
         db=DatabaseContainer.db,
+        cache=providers.Factory(
+            create_repository_cache,
+            enabled=repository_cache_settings.provided.enabled,
+            ttl=repository_cache_settings.provided.evaluation_template_ttl,
+            max_size=repository_cache_settings.provided.max_size,
+        ),
+    )
+
+    evaluation_cache_repository = providers.Singleton(
+        internal_db_repositories.EvaluationCacheRepository,
+        db=DatabaseContainer.db,
+    )
+
+    workflow_outbox_repository = providers.Singleton(
+        internal_db_repositories.WorkflowOutboxRepository,
+        db=DatabaseContainer.db,
     )
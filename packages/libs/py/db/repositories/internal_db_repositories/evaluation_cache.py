@@ -0,0 +1,52 @@
+from typing import cast
+
+import internal_db_models
+from internal_db_services.database import Database
+from sqlalchemy import Column, ColumnExpressionArgument
+from sqlmodel import col
+
+from .base import BaseRepository
+
+
+class EvaluationCacheRepository(
+    BaseRepository[
+        str,
+        internal_db_models.EvaluationCache,
+        internal_db_models.EvaluationCacheRead,
+        internal_db_models.EvaluationCacheCreate,
+    ]
+):
+    def __init__(
+        self,
+        db: Database,
+    ):
+        super().__init__(
+            db,
+            internal_db_models.EvaluationCache,
+            internal_db_models.EvaluationCacheRead,
+            internal_db_models.EvaluationCacheCreate,
+        )
+
+    @property
+    def _id_fields(self) -> tuple[Column[str]]:
+        return (cast(Column[str], internal_db_models.EvaluationCache.request_hash),)
+
+    def _id_predicate(self, id: str) -> ColumnExpressionArgument[bool]:
+        return col(internal_db_models.EvaluationCache.request_hash) == id
+
+    async def get_by_request_hashes(
+        self, request_hashes: list[str]
+    ) -> dict[str, internal_db_models.EvaluationCacheRead]:
+        return {
+            entry.request_hash: entry
+            for entry in await self.get_many(list(set(request_hashes)))
+        }
+
+    async def upsert_many_by_request_hash(
+        self, entries: list[internal_db_models.EvaluationCacheCreate]
+    ) -> None:
+        # The latest answer wins when the same request is stored twice.
+        await self.upsert_many(
+            list({entry.request_hash: entry for entry in entries}.values()),
+            ["request_hash"],
+        )
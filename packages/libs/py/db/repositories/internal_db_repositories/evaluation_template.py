@@ -7,6 +7,7 @@ from sqlalchemy import Column, ColumnExpressionArgument, select
 from sqlmodel import col
 
 from .base import BaseRepository
+from .cache import RepositoryCache
 
 
 class EvaluationTemplateRepository(
@@ -20,12 +21,14 @@ class EvaluationTemplateRepository(
     def __init__(
         self,
         db: Database,
+        cache: RepositoryCache | None = None,
     ):
         super().__init__(
             db,
             internal_db_models.EvaluationTemplate,
             internal_db_models.EvaluationTemplateRead,
             internal_db_models.EvaluationTemplateCreate,
+            cache=cache,
         )
 
     @property
@@ -12,11 +12,13 @@ from sqlalchemy import (
     literal,
     or_,
     select,
+    union,
 )
 from sqlalchemy.engine.result import TupleResult
 from sqlmodel import col
 
 from .base import BaseRepository
+from .cache import RepositoryCache
 
 
 class FileSearchEvaluation(BaseModel):
@@ -50,12 +52,14 @@ class FileRepository(
     def __init__(
         self,
         db: Database,
+        cache: RepositoryCache | None = None,
     ):
         super().__init__(
             db,
             internal_db_models.File,
             internal_db_models.FileRead,
             internal_db_models.FileCreate,
+            cache=cache,
         )
 
     @property
@@ -81,6 +85,54 @@ class FileRepository(
                 for file in result.all()
             ]
 
+    async def get_ids_to_evaluate(
+        self,
+        project_id: UUID,
+        evaluation_responses: list[tuple[UUID, str | None]],
+        status: internal_db_models.FileStatus | None = None,
+        after: UUID | None = None,
+        limit: int = 1000,
+    ) -> list[UUID]:
+        """Page through the distinct ids of files to evaluate, ordered by id.
+
+        A file is selected when it has a file evaluation matching one of the
+        (evaluation_id, response) pairs, a ``None`` response matching any
+        answer, or when it is in ``status``. Pass the last id of a page as
+        ``after`` to get the next one.
+        """
+        file_evaluation = internal_db_models.FileEvaluation
+        file = internal_db_models.File
+
+        queries = []
+        for evaluation_id, response in evaluation_responses:
+            query = select(col(file_evaluation.file_id).label("file_id")).where(
+                file_evaluation.evaluation_id == evaluation_id
+            )
+            if response:
+                query = query.where(col(file_evaluation.response) == response)
+            if after:
+                query = query.where(col(file_evaluation.file_id) > after)
+            queries.append(query)
+
+        if status:
+            query = select(col(file.id).label("file_id")).where(
+                file.project_id == project_id, file.status == status
+            )
+            if after:
+                query = query.where(col(file.id) > after)
+            queries.append(query)
+
+        if not queries:
+            return []
+
+        # UNION removes duplicates across and within the sources.
+        file_ids = union(*queries).subquery()
+        async with self._session_factory() as session:
+            result = await session.scalars(
+                select(file_ids.c.file_id).order_by(file_ids.c.file_id).limit(limit)
+            )
+            return list(result.all())
+
     async def search_files(
         self,
         project_id: UUID,
@@ -3,7 +3,7 @@ from uuid import UUID
 
 import internal_db_models
 from internal_db_services.database import Database
-from sqlalchemy import Column, ColumnExpressionArgument, select
+from sqlalchemy import Column, ColumnExpressionArgument, func, select
 from sqlmodel import col
 
 from .base import BaseRepository
@@ -50,6 +50,16 @@ class FileContentRepository(
                 for content in result.all()
             ]
 
+    async def count_by_file_id(self, file_id: UUID) -> int:
+        async with self._session_factory() as session:
+            result = await session.scalar(
+                select(func.count())
+                .select_from(internal_db_models.FileContent)
+                .where(internal_db_models.FileContent.file_id == file_id)
+            )
+
+            return result or 0
+
     async def get_by_file_id_and_page(
         self, file_id: UUID, from_page: int, to_page: int | None
     ) -> list[internal_db_models.FileContentRead]:
@@ -72,3 +82,23 @@ class FileContentRepository(
                 internal_db_models.FileContentRead.model_validate(content)
                 for content in result.all()
             ]
+
+    async def get_ids_by_file_id_and_page(
+        self, file_id: UUID, from_page: int, to_page: int | None
+    ) -> list[UUID]:
+        async with self._session_factory() as session:
+            query = (
+                select(internal_db_models.FileContent.id)
+                .where(internal_db_models.FileContent.file_id == file_id)
+                .where(internal_db_models.FileContent.content_number >= from_page)
+                .order_by(internal_db_models.FileContent.content_number)
+            )
+
+            if to_page:
+                query = query.where(
+                    internal_db_models.FileContent.content_number <= to_page
+                )
+
+            result = await session.scalars(query)
+
+            return list(result.all())
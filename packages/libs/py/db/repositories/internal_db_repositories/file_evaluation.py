@@ -2,12 +2,14 @@ from typing import cast
 from uuid import UUID
 
 import internal_db_models
+from internal_db_models.llm_payload import compact_file_evaluation
 from internal_db_services.database import Database
 from sqlalchemy import Column, ColumnExpressionArgument, select
 from sqlalchemy.orm import selectinload
 from sqlmodel import col
 
 from .base import BaseRepository
+from .llm_payload import LlmPayloadRepository
 
 
 class FileEvaluationRepository(
@@ -21,6 +23,7 @@ class FileEvaluationRepository(
     def __init__(
         self,
         db: Database,
+        llm_payload_repository: LlmPayloadRepository | None = None,
     ):
         super().__init__(
             db,
@@ -28,6 +31,7 @@ class FileEvaluationRepository(
             internal_db_models.FileEvaluationRead,
             internal_db_models.FileEvaluationCreate,
         )
+        self._llm_payload_repository = llm_payload_repository
 
     @property
     def _id_fields(self) -> tuple[Column[UUID]]:
@@ -121,3 +125,57 @@ class FileEvaluationRepository(
                 return None
 
             return internal_db_models.FileEvaluationRead.model_validate(result)
+
+    async def upsert_many_by_evaluation_id_and_content_id(
+        self,
+        file_evaluations: list[internal_db_models.FileEvaluationCreate],
+    ) -> list[internal_db_models.FileEvaluationRead]:
+        if self._llm_payload_repository:
+            # Payloads are written first so that no row references a missing one.
+            payloads: list[internal_db_models.LlmPayloadCreate] = []
+            compacted: list[internal_db_models.FileEvaluationCreate] = []
+            for file_evaluation in file_evaluations:
+                file_evaluation, file_evaluation_payloads = compact_file_evaluation(
+                    file_evaluation
+                )
+                compacted.append(file_evaluation)
+                payloads.extend(file_evaluation_payloads)
+
+            await self._llm_payload_repository.add_many_by_hash(payloads)
+            file_evaluations = compacted
+
+        return await self.upsert_many(
+            file_evaluations,
+            conflict_fields=["evaluation_id", "content_id"],
+            update_fields=[
+                "response",
+                "status",
+                "error",
+                "llm_request",
+                "llm_response",
+                "llm_request_hash",
+                "llm_response_hash",
+            ],
+            return_models=True,
+        )
+
+    async def get_by_project_id_and_id(
+        self,
+        project_id: UUID,
+        id: UUID,
+    ) -> internal_db_models.FileEvaluationRead | None:
+        async with self._session_factory() as session:
+            query = (
+                select(internal_db_models.FileEvaluation)
+                .join(internal_db_models.File)
+                .where(
+                    internal_db_models.FileEvaluation.id == id,
+                    internal_db_models.File.project_id == project_id,
+                )
+            )
+
+            result = await session.scalar(query)
+            if not result:
+                return None
+
+            return internal_db_models.FileEvaluationRead.model_validate(result)
@@ -0,0 +1,55 @@
+from typing import cast
+
+import internal_db_models
+from internal_db_services.database import Database
+from sqlalchemy import Column, ColumnExpressionArgument
+from sqlmodel import col
+
+from .base import BaseRepository
+
+
+class LlmPayloadRepository(
+    BaseRepository[
+        str,
+        internal_db_models.LlmPayload,
+        internal_db_models.LlmPayloadRead,
+        internal_db_models.LlmPayloadCreate,
+    ]
+):
+    def __init__(
+        self,
+        db: Database,
+    ):
+        super().__init__(
+            db,
+            internal_db_models.LlmPayload,
+            internal_db_models.LlmPayloadRead,
+            internal_db_models.LlmPayloadCreate,
+        )
+
+    @property
+    def _id_fields(self) -> tuple[Column[str]]:
+        return (cast(Column[str], internal_db_models.LlmPayload.hash),)
+
+    def _id_predicate(self, id: str) -> ColumnExpressionArgument[bool]:
+        return col(internal_db_models.LlmPayload.hash) == id
+
+    async def get_by_hashes(
+        self, hashes: list[str]
+    ) -> dict[str, internal_db_models.LlmPayloadRead]:
+        return {
+            payload.hash: payload for payload in await self.get_many(list(set(hashes)))
+        }
+
+    async def add_many_by_hash(
+        self, payloads: list[internal_db_models.LlmPayloadCreate]
+    ) -> None:
+        # Payloads are content addressed, an existing hash already holds the
+        # same payload.
+        if not payloads:
+            return
+
+        await self.add_all(
+            list({payload.hash: payload for payload in payloads}.values()),
+            ignore_conflicts=True,
+        )
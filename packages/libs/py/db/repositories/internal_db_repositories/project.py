@@ -8,6 +8,7 @@ from sqlalchemy.engine.result import TupleResult
 from sqlmodel import col
 
 from .base import BaseRepository
+from .cache import RepositoryCache
 
 
 class ProjectRepository(
@@ -21,12 +22,14 @@ class ProjectRepository(
     def __init__(
         self,
         db: Database,
+        cache: RepositoryCache | None = None,
     ):
         super().__init__(
             db,
             internal_db_models.Project,
             internal_db_models.ProjectRead,
             internal_db_models.ProjectCreate,
+            cache=cache,
         )
 
     @property
@@ -0,0 +1,22 @@
+from os import environ
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+env_file = f".env.{environ.get('ENV', 'local')}"
+
+
+class RepositoryCacheSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="REPOSITORY_CACHE_",
+    )
+
+    enabled: bool = False
+    max_size: int = 1024
+    # Per model TTL in seconds, 0 disables the cache of that repository.
+    evaluation_template_ttl: float = 300
+    project_ttl: float = 300
+    # Files change status while they are processed, keep them short lived.
+    file_ttl: float = 5
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from typing import cast
+from uuid import UUID
+
+import internal_db_models
+from internal_db_services.database import Database
+from sqlalchemy import Column, ColumnExpressionArgument, func, select, update
+from sqlmodel import col, delete
+
+from .base import BaseRepository
+
+
+class WorkflowOutboxRepository(
+    BaseRepository[
+        UUID,
+        internal_db_models.WorkflowOutbox,
+        internal_db_models.WorkflowOutboxRead,
+        internal_db_models.WorkflowOutboxCreate,
+    ]
+):
+    def __init__(
+        self,
+        db: Database,
+    ):
+        super().__init__(
+            db,
+            internal_db_models.WorkflowOutbox,
+            internal_db_models.WorkflowOutboxRead,
+            internal_db_models.WorkflowOutboxCreate,
+        )
+
+    @property
+    def _id_fields(self) -> tuple[Column[UUID]]:
+        return (cast(Column[UUID], internal_db_models.WorkflowOutbox.id),)
+
+    def _id_predicate(self, id: UUID) -> ColumnExpressionArgument[bool]:
+        return col(internal_db_models.WorkflowOutbox.id) == id
+
+    async def claim_due(
+        self, limit: int, lease: timedelta
+    ) -> list[internal_db_models.WorkflowOutboxRead]:
+        """Claim up to ``limit`` due rows for ``lease``.
+
+        Claimed rows are hidden from other dispatchers until the lease expires,
+        rows of a dispatcher that stopped mid-batch are then claimed again.
+        """
+        async with self._write_session_factory() as session:
+            due = (
+                select(internal_db_models.WorkflowOutbox.id)
+                .where(
+                    col(internal_db_models.WorkflowOutbox.available_at) <= func.now()
+                )
+                .order_by(col(internal_db_models.WorkflowOutbox.available_at))
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            query = (
+                update(internal_db_models.WorkflowOutbox)
+                .where(
+                    col(internal_db_models.WorkflowOutbox.id).in_(due.scalar_subquery())
+                )
+                .values(
+                    available_at=func.now() + lease,
+                    attempts=internal_db_models.WorkflowOutbox.attempts + 1,
+                )
+                .returning(internal_db_models.WorkflowOutbox)
+            )
+            result = await session.execute(query)
+            claimed = [
+                internal_db_models.WorkflowOutboxRead.model_validate(row)
+                for row in result.scalars().all()
+            ]
+            await session.commit()
+
+            return claimed
+
+    async def delete_many(self, ids: list[UUID]) -> None:
+        if not ids:
+            return
+
+        async with self._write_session_factory() as session:
+            await session.execute(
+                delete(internal_db_models.WorkflowOutbox).where(
+                    col(internal_db_models.WorkflowOutbox.id).in_(ids)
+                )
+            )
+            await session.commit()
+
+    async def retry_later(self, id: UUID, error: str, delay: timedelta) -> None:
+        async with self._write_session_factory() as session:
+            await session.execute(
+                update(internal_db_models.WorkflowOutbox)
+                .where(self._id_predicate(id))
+                .values(available_at=func.now() + delay, last_error=error)
+            )
+            await session.commit()
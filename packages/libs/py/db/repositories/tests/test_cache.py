@@ -0,0 +1,90 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import internal_db_models
+
+from internal_db_repositories import ProjectRepository, RepositoryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSession:
+    def __init__(self, rows: dict):
+        self.rows = rows
+        self.gets = 0
+
+    async def get(self, model, id):
+        self.gets += 1
+        return self.rows.get(id)
+
+    async def execute(self, query):
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: None))
+
+    async def commit(self):
+        pass
+
+
+def _repository(cache: RepositoryCache):
+    project = internal_db_models.Project(
+        id=uuid.uuid4(),
+        name="Project",
+        description="Project",
+        created_at=datetime.now(UTC),
+        updated_at=datetime.now(UTC),
+    )
+    session = FakeSession({project.id: project})
+
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    db = SimpleNamespace(session=session_factory, writer_session=session_factory)
+    return ProjectRepository(db, cache=cache), session, project.id
+
+
+def test_cache_expires_and_evicts_entries():
+    clock = FakeClock()
+    cache = RepositoryCache(ttl=10, max_size=2, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    # "b" was the least recently used entry.
+    assert cache.get("b") is None
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats.model_dump() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "size": 1,
+    }
+
+
+def test_repository_reads_through_and_invalidates_on_write():
+    repository, session, project_id = _repository(RepositoryCache(ttl=60))
+
+    async def run():
+        first = await repository.get(project_id)
+        first.name = "Mutated"
+        second = await repository.get(project_id)
+        assert second.name == "Project"
+        assert session.gets == 1
+
+        await repository.update(project_id, {"name": "Renamed"})
+        await repository.get(project_id)
+        assert session.gets == 2
+
+    asyncio.run(run())
+    assert repository.cache_stats.hit_rate == 1 / 3
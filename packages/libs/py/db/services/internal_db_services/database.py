@@ -8,12 +8,13 @@ from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
 from dependency_injector import resources
-from pydantic import PostgresDsn
+from pydantic import BaseModel, PostgresDsn
 from sqlalchemy.ext.asyncio import (
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 if TYPE_CHECKING:
@@ -26,11 +27,56 @@ logger = logging.getLogger(__name__)
 
 ENGINE_ECHO = False
 POOL_ECHO = True
-POOL_SIZE = 30
-MAX_OVERFLOW = 20
 POOL_RECYCLE = 3600
 
 
+class EngineProfile(BaseModel):
+    pool_size: int = 0
+    max_overflow: int = 0
+    null_pool: bool = False
+    pool_pre_ping: bool = False
+
+
+RUNTIME_PROFILES: dict[str, EngineProfile] = {
+    "api": EngineProfile(pool_size=30, max_overflow=20),
+    # Temporal workers run up to 100 activities at once.
+    "worker": EngineProfile(pool_size=40, max_overflow=60),
+    # A Lambda sandbox serves one invocation at a time. Its connections are
+    # kept between warm invocations, but may be dropped while it is frozen.
+    "lambda": EngineProfile(pool_size=1, max_overflow=4, pool_pre_ping=True),
+    "consumer": EngineProfile(pool_size=5, max_overflow=5),
+}
+
+
+def engine_options(db_settings: "DatabaseSettings") -> dict:
+    """create_async_engine options for the runtime profile of the settings."""
+    profile = RUNTIME_PROFILES[db_settings.runtime]
+    options: dict = {"pool_recycle": POOL_RECYCLE}
+    if profile.null_pool or db_settings.transaction_pooler:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=db_settings.pool_size or profile.pool_size,
+            max_overflow=db_settings.max_overflow
+            if db_settings.max_overflow is not None
+            else profile.max_overflow,
+            pool_pre_ping=profile.pool_pre_ping,
+        )
+
+    if db_settings.transaction_pooler:
+        # Server-side prepared statements don't survive the pooler switching
+        # connections between transactions.
+        if "asyncpg" in db_settings.scheme:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        else:
+            options["connect_args"] = {"prepare_threshold": None}
+
+    return options
+
+
 class Database(resources.AsyncResource):
     async def init(
         self,
@@ -68,14 +114,14 @@ class Database(resources.AsyncResource):
             _build_db_url(db_settings.ro_host) if db_settings.ro_host else db_url
         )
 
+        options = engine_options(db_settings)
+        logger.info(f"Database runtime profile: {db_settings.runtime}")
         engine = create_async_engine(
             str(db_url),
             logging_name=logging_name,
             echo=ENGINE_ECHO,
             echo_pool=POOL_ECHO,
-            pool_size=POOL_SIZE,
-            max_overflow=MAX_OVERFLOW,
-            pool_recycle=POOL_RECYCLE,
+            **options,
         )
         self._engine = engine
 
@@ -84,9 +130,7 @@ class Database(resources.AsyncResource):
             logging_name=f"{logging_name}-ro",
             echo=ENGINE_ECHO,
             echo_pool=POOL_ECHO,
-            pool_size=POOL_SIZE,
-            max_overflow=MAX_OVERFLOW,
-            pool_recycle=POOL_RECYCLE,
+            **options,
         )
         self._ro_engine = ro_engine
 
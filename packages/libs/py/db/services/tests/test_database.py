@@ -0,0 +1,25 @@
+from internal_db_models.settings import DatabaseSettings
+from sqlalchemy.pool import NullPool
+
+from internal_db_services.database import engine_options
+
+
+def test_runtime_profiles():
+    assert engine_options(DatabaseSettings(runtime="api"))["pool_size"] == 30
+
+    options = engine_options(DatabaseSettings(runtime="lambda", max_overflow=0))
+    assert (options["pool_size"], options["max_overflow"]) == (1, 0)
+    assert options["pool_pre_ping"]
+
+
+def test_transaction_pooler_disables_pool_and_prepared_statements():
+    options = engine_options(
+        DatabaseSettings(runtime="worker", transaction_pooler=True)
+    )
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"] == {"prepare_threshold": None}
+
+    options = engine_options(
+        DatabaseSettings(scheme="postgresql+asyncpg", transaction_pooler=True)
+    )
+    assert options["connect_args"]["statement_cache_size"] == 0
@@ -21,6 +21,13 @@ class HttpEvaluationCreate(BaseModel):
     )
 
     template_id: UUID | None = Field(None, description="Template ID")
+    cache_enabled: bool = Field(
+        True, description="Reuse previous answers for identical LLM requests"
+    )
+    model_tier: str | None = Field(
+        None,
+        description="Model tier used to answer, defaults by evaluation type",
+    )
 
     # Allow either category_id or category_name, but not both
     category_id: UUID | None = Field(None, description="ID of existing category")
@@ -1,4 +1,5 @@
 from .evaluation import EvaluationService
+from .llm_payload import LlmPayloadService
 from .workflow.engine import WorkflowEngineService
 
-__all__ = ["EvaluationService", "WorkflowEngineService"]
+__all__ = ["EvaluationService", "LlmPayloadService", "WorkflowEngineService"]
@@ -6,6 +6,7 @@ from internal_services.openai_key import OpenAIKeyResource
 from internal_services.workflow.engine import WorkflowEngineService
 
 from .evaluation import EvaluationService
+from .llm_payload import LlmPayloadService
 from .settings import Settings
 
 
@@ -24,6 +25,13 @@ class ServicesContainer(AWSContainer):
         evaluation_template_repository=RepositoriesContainer.evaluation_template_repository,
     )
 
+    llm_payload_service = providers.Singleton(
+        LlmPayloadService,
+        llm_payload_repository=RepositoriesContainer.llm_payload_repository,
+        file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+        file_content_repository=RepositoriesContainer.file_content_repository,
+    )
+
     workflow_engine_service = providers.Singleton(
         WorkflowEngineService,
         aioboto3_session=AWSContainer.aioboto3_session,
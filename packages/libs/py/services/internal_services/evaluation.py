@@ -1,4 +1,7 @@
 import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Generic, TypeVar
 from uuid import UUID
 
 import internal_db_models
@@ -7,9 +10,95 @@ from internal_db_repositories.evaluation import EvaluationRepository
 from internal_db_repositories.evaluation_template import (
     EvaluationTemplateRepository,
 )
+from jinja2.sandbox import SandboxedEnvironment
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_CACHE_SIZE = 256
+RENDERED_PROMPT_CACHE_SIZE = 4096
+
+_jinja_env = SandboxedEnvironment()
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+_TemplateKey = tuple[UUID, datetime]
+_RenderedPromptKey = tuple[UUID, datetime, UUID, datetime]
+
+
+class _LRUCache(Generic[K, V]):
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._items: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+
+# Both caches are process wide and keyed by updated_at, so an edited template
+# or evaluation gets a new entry and the stale one ages out of the LRU.
+_compiled_templates: _LRUCache[
+    _TemplateKey, tuple[jinja2.Template | None, jinja2.Template]
+] = _LRUCache(TEMPLATE_CACHE_SIZE)
+_rendered_prompts: _LRUCache[_RenderedPromptKey, tuple[str | None, str | None]] = (
+    _LRUCache(RENDERED_PROMPT_CACHE_SIZE)
+)
+
+
+def compile_template(
+    template: internal_db_models.EvaluationTemplateRead,
+) -> tuple[jinja2.Template | None, jinja2.Template]:
+    key = (template.id, template.updated_at)
+    compiled = _compiled_templates.get(key)
+    if compiled is None:
+        compiled = (
+            _jinja_env.from_string(template.system_prompt)
+            if template.system_prompt
+            else None,
+            _jinja_env.from_string(template.prompt),
+        )
+        _compiled_templates.set(key, compiled)
+
+    return compiled
+
+
+def render_prompts(
+    evaluation: internal_db_models.EvaluationRead
+    | internal_db_models.EvaluationReadWithTemplate,
+    template: internal_db_models.EvaluationTemplateRead,
+) -> tuple[str | None, str | None]:
+    key = (evaluation.id, evaluation.updated_at, template.id, template.updated_at)
+    rendered = _rendered_prompts.get(key)
+    if rendered is not None:
+        return rendered
+
+    system_prompt_template, prompt_template = compile_template(template)
+    context = evaluation.model_dump(mode="json")
+    system_prompt = evaluation.system_prompt
+    prompt = evaluation.prompt
+
+    if not system_prompt and system_prompt_template:
+        logger.info("System prompt is not set in evaluation, rendering from template")
+        system_prompt = system_prompt_template.render(context)
+        context["system_prompt"] = system_prompt
+
+    if not prompt:
+        logger.info("Prompt is not set in evaluation, rendering from template")
+        prompt = prompt_template.render(context)
+
+    rendered = (system_prompt, prompt)
+    _rendered_prompts.set(key, rendered)
+    return rendered
+
 
 class EvaluationService:
     def __init__(
@@ -67,21 +156,7 @@ class EvaluationService:
         if not template:
             return evaluation
 
-        jinja_env = jinja2.Environment()
-        if not evaluation.system_prompt:
-            logger.info(
-                "System prompt is not set in evaluation, rendering from template"
-            )
-            jinja_template = jinja_env.from_string(template.system_prompt)
-            evaluation.system_prompt = jinja_template.render(
-                evaluation.model_dump(mode="json")
-            )
-
-        if not evaluation.prompt:
-            logger.info("Prompt is not set in evaluation, rendering from template")
-            jinja_template = jinja_env.from_string(template.prompt)
-            evaluation.prompt = jinja_template.render(
-                evaluation.model_dump(mode="json")
-            )
-
+        evaluation.system_prompt, evaluation.prompt = render_prompts(
+            evaluation, template
+        )
         return evaluation
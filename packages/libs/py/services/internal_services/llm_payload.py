@@ -0,0 +1,69 @@
+from uuid import UUID
+
+from internal_db_models.llm_payload import decode_llm_payload, rehydrate_llm_request
+from internal_db_repositories.file_content import FileContentRepository
+from internal_db_repositories.file_evaluation import FileEvaluationRepository
+from internal_db_repositories.llm_payload import LlmPayloadRepository
+from pydantic import BaseModel
+
+
+class FileEvaluationLlmPayloads(BaseModel):
+    llm_request: dict | None = None
+    llm_response: dict | None = None
+
+
+class LlmPayloadService:
+    def __init__(
+        self,
+        llm_payload_repository: LlmPayloadRepository,
+        file_evaluation_repository: FileEvaluationRepository,
+        file_content_repository: FileContentRepository,
+    ):
+        self._llm_payload_repository = llm_payload_repository
+        self._file_evaluation_repository = file_evaluation_repository
+        self._file_content_repository = file_content_repository
+
+    async def get_file_evaluation_payloads(
+        self, project_id: UUID, file_evaluation_id: UUID
+    ) -> FileEvaluationLlmPayloads | None:
+        """The full LLM request and response of a file evaluation.
+
+        Rows only keep references to their payloads, they are rebuilt here on
+        demand instead of being loaded with every file evaluation.
+        """
+        file_evaluation = (
+            await self._file_evaluation_repository.get_by_project_id_and_id(
+                project_id, file_evaluation_id
+            )
+        )
+        if not file_evaluation:
+            return None
+
+        payloads = await self._llm_payload_repository.get_by_hashes(
+            [
+                payload_hash
+                for payload_hash in (
+                    file_evaluation.llm_request_hash,
+                    file_evaluation.llm_response_hash,
+                )
+                if payload_hash
+            ]
+        )
+
+        llm_request = file_evaluation.llm_request
+        request_payload = payloads.get(file_evaluation.llm_request_hash or "")
+        if request_payload:
+            llm_request = rehydrate_llm_request(
+                file_evaluation.llm_request,
+                decode_llm_payload(request_payload.payload),
+                await self._file_content_repository.get(file_evaluation.content_id),
+            )
+
+        llm_response = file_evaluation.llm_response
+        response_payload = payloads.get(file_evaluation.llm_response_hash or "")
+        if response_payload:
+            llm_response = decode_llm_payload(response_payload.payload)
+
+        return FileEvaluationLlmPayloads(
+            llm_request=llm_request, llm_response=llm_response
+        )
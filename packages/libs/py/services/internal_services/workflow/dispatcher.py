@@ -0,0 +1,271 @@
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from collections.abc import Iterator
+
+from dependency_injector import resources
+from vmxai.types import CompletionBatchItemUpdateCallbackPayload
+
+from internal_services.workflow.engine import (
+    BaseWorkflowEngineService,
+    CallbackRejectedError,
+)
+
+logger = logging.getLogger(__name__)
+
+CallbackItem = tuple[dict[str, str], CompletionBatchItemUpdateCallbackPayload]
+
+
+class CallbackQueueFullError(Exception):
+    pass
+
+
+class CallbackDeliveryError(Exception):
+    pass
+
+
+class CallbackDispatcher:
+    """Delivers VM-X callbacks to the workflow engine in the background.
+
+    Callbacks are queued by the ingestion callback route, which returns right
+    away. The dispatcher drains the queue in batches, groups the callbacks by
+    their query params (the workflow they belong to) and delivers each group
+    with a single engine call, up to ``max_concurrency`` groups at a time.
+    Groups hold at most ``group_size`` callbacks and ``max_group_bytes`` of
+    serialized callbacks, to stay under the engine's payload size limit.
+
+    Failed deliveries are retried with capped backoff until they succeed.
+    Groups the engine rejects for good are split down to single callbacks, a
+    rejected single callback is logged and dropped. While a delivery is
+    failing, or if the dispatcher stopped, callbacks are delivered
+    synchronously by ``submit`` instead, so that errors reach VM-X and it
+    delivers them again.
+    """
+
+    def __init__(
+        self,
+        workflow_engine_service: BaseWorkflowEngineService,
+        queue_size: int = 10_000,
+        batch_size: int = 500,
+        group_size: int = 50,
+        max_group_bytes: int = 1_000_000,
+        flush_interval: float = 0.05,
+        max_concurrency: int = 20,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0,
+        enqueue_timeout: float = 1.0,
+        shutdown_timeout: float = 30.0,
+    ):
+        self._workflow_engine_service = workflow_engine_service
+        self._queue: asyncio.Queue[CallbackItem] = asyncio.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._group_size = group_size
+        self._max_group_bytes = max_group_bytes
+        self._flush_interval = flush_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._enqueue_timeout = enqueue_timeout
+        self._shutdown_timeout = shutdown_timeout
+        self._failing_groups = 0
+        self._batches: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self._task is not None
+            and not self._task.done()
+            and self._failing_groups == 0
+        )
+
+    async def submit(
+        self,
+        query_params: dict[str, str],
+        payload: CompletionBatchItemUpdateCallbackPayload,
+    ) -> None:
+        """Queue a callback, waiting up to ``enqueue_timeout`` for room.
+
+        Raises CallbackQueueFullError when the queue stays full and
+        CallbackDeliveryError when a synchronous delivery fails, the caller
+        should then reject the callback so that VM-X delivers it again later.
+        """
+        if not self.healthy:
+            try:
+                await self._workflow_engine_service.receive_batch_item_update_callbacks(
+                    query_params, [payload]
+                )
+            except CallbackRejectedError:
+                logger.exception(f"Callback for {query_params} rejected, dropping it")
+            except Exception as e:
+                raise CallbackDeliveryError(f"Callback delivery failed: {e}") from e
+            return
+
+        try:
+            await asyncio.wait_for(
+                self._queue.put((query_params, payload)), self._enqueue_timeout
+            )
+        except TimeoutError as e:
+            raise CallbackQueueFullError(
+                f"Callback queue is full ({self._queue.maxsize} items)"
+            ) from e
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the dispatcher once the queued callbacks are delivered.
+
+        Waits at most ``shutdown_timeout`` seconds, callbacks still queued then
+        are lost and logged.
+        """
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._queue.join(), self._shutdown_timeout)
+        if self._queue.qsize() or self._failing_groups:
+            logger.error(
+                f"Stopping with {self._queue.qsize()} queued callbacks and "
+                f"{self._failing_groups} undelivered groups"
+            )
+        for task in [self._task, *self._batches]:
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Wait briefly for the rest of a burst, callbacks of a batch tend
+            # to arrive together.
+            deadline = asyncio.get_running_loop().time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            # A group that keeps failing must not hold up the next batches.
+            task = asyncio.create_task(self._dispatch_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _dispatch_batch(self, batch: list[CallbackItem]) -> None:
+        try:
+            await self.dispatch(batch)
+        except Exception:
+            logger.exception("Callback dispatch failed")
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    async def dispatch(self, batch: list[CallbackItem]) -> None:
+        groups: dict[tuple[tuple[str, str], ...], list[CallbackItem]] = defaultdict(
+            list
+        )
+        for item in batch:
+            groups[tuple(sorted(item[0].items()))].append(item)
+
+        await asyncio.gather(
+            *(
+                self._deliver(items[0][0], payloads)
+                for items in groups.values()
+                for payloads in self._split([payload for _, payload in items])
+            )
+        )
+
+    def _split(
+        self, payloads: list[CompletionBatchItemUpdateCallbackPayload]
+    ) -> Iterator[list[CompletionBatchItemUpdateCallbackPayload]]:
+        group: list[CompletionBatchItemUpdateCallbackPayload] = []
+        group_bytes = 0
+        for payload in payloads:
+            # Each callback carries its LLM request and response, a single
+            # one over the limit is still sent on its own.
+            size = len(payload.model_dump_json(warnings=False))
+            if group and (
+                len(group) == self._group_size
+                or group_bytes + size > self._max_group_bytes
+            ):
+                yield group
+                group, group_bytes = [], 0
+            group.append(payload)
+            group_bytes += size
+
+        if group:
+            yield group
+
+    async def _deliver(
+        self,
+        query_params: dict[str, str],
+        payloads: list[CompletionBatchItemUpdateCallbackPayload],
+    ) -> None:
+        engine = self._workflow_engine_service
+        attempt = 0
+        rejected: CallbackRejectedError | None = None
+        while True:
+            async with self._semaphore:
+                try:
+                    await engine.receive_batch_item_update_callbacks(
+                        query_params, payloads
+                    )
+                    break
+                except CallbackRejectedError as e:
+                    rejected = e
+                    break
+                except Exception:
+                    attempt += 1
+                    logger.warning(
+                        f"Callback delivery for {query_params} failed, "
+                        f"attempt {attempt}",
+                        exc_info=True,
+                    )
+            if attempt == 1:
+                self._failing_groups += 1
+            # The semaphore is released while waiting, other workflows keep
+            # being served.
+            await asyncio.sleep(
+                min(
+                    self._retry_backoff * 2 ** (attempt - 1),
+                    self._max_retry_backoff,
+                )
+            )
+
+        if attempt:
+            self._failing_groups -= 1
+
+        if rejected is None:
+            return
+        if len(payloads) == 1:
+            logger.error(
+                f"Callback for {query_params} rejected, dropping it",
+                exc_info=rejected,
+            )
+            return
+        # Deliver what the engine accepts, down to the rejected callbacks.
+        half = len(payloads) // 2
+        await asyncio.gather(
+            self._deliver(query_params, payloads[:half]),
+            self._deliver(query_params, payloads[half:]),
+        )
+
+
+class CallbackDispatcherResource(resources.AsyncResource):
+    async def init(
+        self, workflow_engine_service: BaseWorkflowEngineService, **options
+    ) -> CallbackDispatcher:
+        dispatcher = CallbackDispatcher(workflow_engine_service, **options)
+        dispatcher.start()
+        return dispatcher
+
+    async def shutdown(self, dispatcher: CallbackDispatcher):
+        await dispatcher.stop()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from abc import ABC, ABCMeta, abstractmethod
 from typing import Literal
@@ -7,6 +8,10 @@ from pydantic import BaseModel
 from vmxai.types import CompletionBatchItemUpdateCallbackPayload
 
 
+class CallbackRejectedError(Exception):
+    """The engine will never accept the callbacks, delivering them again fails."""
+
+
 class AsyncDelegateMeta(ABCMeta):
     def __new__(mcs, name, bases, namespace, **kwargs):
         abstract_methods = set()
@@ -44,6 +49,23 @@ class BaseWorkflowEngineService(ABC, metaclass=AsyncDelegateMeta):
         payload: CompletionBatchItemUpdateCallbackPayload,
     ): ...
 
+    @abstractmethod
+    async def receive_batch_item_update_callbacks(
+        self,
+        query_params: dict[str, str],
+        payloads: list[CompletionBatchItemUpdateCallbackPayload],
+    ):
+        """Deliver callbacks that share the same query params (same workflow).
+
+        Raises CallbackRejectedError when the engine rejects them for good.
+        """
+
+    async def warm_up(self) -> None:
+        """Open the clients of the engine ahead of the first request."""
+
+    async def close(self) -> None:
+        """Release the clients held by the engine."""
+
 
 class WorkflowEngineService(BaseWorkflowEngineService):
     _engines: dict[Literal["temporal", "step_functions"], BaseWorkflowEngineService]
@@ -55,35 +77,49 @@ class WorkflowEngineService(BaseWorkflowEngineService):
     ):
         super().__init__()
         self._engines = {}
+        self._engines_lock = asyncio.Lock()
         self._workflow_engine = workflow_engine
         self._aioboto3_session = aioboto3_session
 
     async def _get_delegate_async(self):
         return await self._get_engine(self._workflow_engine)
 
+    async def warm_up(self) -> None:
+        engine = await self._get_delegate_async()
+        await engine.warm_up()
+
+    async def close(self) -> None:
+        async with self._engines_lock:
+            for engine in self._engines.values():
+                await engine.close()
+            self._engines = {}
+
     async def _get_engine(
         self, workflow_engine: Literal["temporal", "step_functions"]
     ) -> BaseWorkflowEngineService:
-        self._logger.info(f"Getting engine {workflow_engine}")
         if workflow_engine in self._engines:
             return self._engines[workflow_engine]
 
-        if workflow_engine == "temporal":
-            from internal_temporal_utils.containers import TemporalContainer
-
-            from internal_services.workflow.temporal import TemporalWorkflowService
-
-            temporal_container = TemporalContainer()
-            await temporal_container.init_resources()
-
-            engine = TemporalWorkflowService(await temporal_container.temporal_client())
-        elif workflow_engine == "step_functions":
-            from internal_services.workflow.step_functions import (
-                StepFunctionsWorkflowService,
-            )
-
-            engine = StepFunctionsWorkflowService(
-                aioboto3_session=self._aioboto3_session,
-            )
-
-        return engine
+        # Concurrent first calls would otherwise each open their own client.
+        async with self._engines_lock:
+            if workflow_engine in self._engines:
+                return self._engines[workflow_engine]
+
+            self._logger.info(f"Creating engine {workflow_engine}")
+            if workflow_engine == "temporal":
+                from internal_services.workflow.temporal import (
+                    TemporalWorkflowService,
+                )
+
+                engine = await TemporalWorkflowService.create()
+            elif workflow_engine == "step_functions":
+                from internal_services.workflow.step_functions import (
+                    StepFunctionsWorkflowService,
+                )
+
+                engine = StepFunctionsWorkflowService(
+                    aioboto3_session=self._aioboto3_session,
+                )
+
+            self._engines[workflow_engine] = engine
+            return engine
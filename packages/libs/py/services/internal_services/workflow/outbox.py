@@ -0,0 +1,129 @@
+import asyncio
+import contextlib
+import logging
+from datetime import timedelta
+
+import internal_db_models
+from dependency_injector import resources
+from internal_db_repositories.workflow_outbox import WorkflowOutboxRepository
+
+from internal_services.workflow.engine import BaseWorkflowEngineService
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowOutboxDispatcher:
+    """Starts the workflows recorded in the workflow outbox.
+
+    Writes record their workflow start as a ``WorkflowOutbox`` row in the same
+    transaction, built by the caller and passed as ``extra_rows`` to
+    ``BaseRepository.add``/``update``. The dispatcher then claims due rows in
+    batches, starts them concurrently and deletes the started ones. Failed
+    starts are retried with exponential backoff. Workflow IDs are unique per
+    row, so a start repeated after a crash is a no-op.
+    """
+
+    def __init__(
+        self,
+        workflow_outbox_repository: WorkflowOutboxRepository,
+        workflow_engine_service: BaseWorkflowEngineService,
+        batch_size: int = 50,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+        retry_backoff: float = 1.0,
+        max_retry_backoff: float = 300.0,
+    ):
+        self._workflow_outbox_repository = workflow_outbox_repository
+        self._workflow_engine_service = workflow_engine_service
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease = timedelta(seconds=lease)
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._wake_up = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def notify(self) -> None:
+        """Dispatch right away instead of at the next poll."""
+        self._wake_up.set()
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                dispatched = await self.dispatch()
+            except Exception:
+                logger.exception("Workflow outbox dispatch failed")
+                dispatched = 0
+
+            # A full batch likely left more rows behind.
+            if dispatched < self._batch_size:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wake_up.wait(), self._poll_interval)
+                self._wake_up.clear()
+
+    async def dispatch(self) -> int:
+        """Start one batch of due workflows, returns the number claimed."""
+        entries = await self._workflow_outbox_repository.claim_due(
+            self._batch_size, self._lease
+        )
+        if not entries:
+            return 0
+
+        started = await asyncio.gather(*(self._start(entry) for entry in entries))
+        await self._workflow_outbox_repository.delete_many(
+            [entry.id for entry, ok in zip(entries, started, strict=True) if ok]
+        )
+
+        return len(entries)
+
+    async def _start(self, entry: internal_db_models.WorkflowOutboxRead) -> bool:
+        try:
+            await self._workflow_engine_service.start_workflow(
+                workflow_name=entry.workflow_name,
+                id=entry.workflow_id,
+                payload=entry.payload,
+            )
+            return True
+        except Exception as e:
+            delay = min(
+                self._retry_backoff * 2 ** (entry.attempts - 1),
+                self._max_retry_backoff,
+            )
+            logger.warning(
+                f"Starting workflow {entry.workflow_id} failed "
+                f"(attempt {entry.attempts}), retrying in {delay:.0f}s",
+                exc_info=True,
+            )
+            await self._workflow_outbox_repository.retry_later(
+                entry.id, str(e), timedelta(seconds=delay)
+            )
+            return False
+
+
+class WorkflowOutboxDispatcherResource(resources.AsyncResource):
+    async def init(
+        self,
+        workflow_outbox_repository: WorkflowOutboxRepository,
+        workflow_engine_service: BaseWorkflowEngineService,
+        **options,
+    ) -> WorkflowOutboxDispatcher:
+        dispatcher = WorkflowOutboxDispatcher(
+            workflow_outbox_repository, workflow_engine_service, **options
+        )
+        dispatcher.start()
+        return dispatcher
+
+    async def shutdown(self, dispatcher: WorkflowOutboxDispatcher):
+        # Rows left behind are claimed again by the next dispatcher.
+        await dispatcher.stop()
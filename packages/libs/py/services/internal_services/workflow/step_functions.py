@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import json
 import os
 import urllib.parse
@@ -27,6 +29,32 @@ class StepFunctionsWorkflowService(BaseWorkflowEngineService):
         super().__init__()
 
         self._aioboto3_session = aioboto3_session
+        self._client_lock = asyncio.Lock()
+        self._exit_stack: contextlib.AsyncExitStack | None = None
+        self._sfn = None
+
+    async def _client(self):
+        """The Step Functions client, opened once and kept until close()."""
+        if self._sfn:
+            return self._sfn
+
+        async with self._client_lock:
+            if not self._sfn:
+                self._exit_stack = contextlib.AsyncExitStack()
+                self._sfn = await self._exit_stack.enter_async_context(
+                    self._aioboto3_session.client("stepfunctions")
+                )
+
+        return self._sfn
+
+    async def warm_up(self) -> None:
+        await self._client()
+
+    async def close(self) -> None:
+        if self._exit_stack:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._sfn = None
 
     async def start_workflow(
         self, workflow_name: str, id: str, payload: dict | BaseModel
@@ -34,14 +62,14 @@ class StepFunctionsWorkflowService(BaseWorkflowEngineService):
         if workflow_name not in WORKFLOW_NAME_MAP:
             raise ValueError(f"Workflow {workflow_name} not found")
 
-        async with self._aioboto3_session.client("stepfunctions") as sfn:
-            await sfn.start_execution(
-                stateMachineArn=f"{STATE_MACHINE_BASE_ARN}{WORKFLOW_NAME_MAP[workflow_name]}",
-                name=str(uuid.uuid4()),
-                input=payload.model_dump_json()
-                if isinstance(payload, BaseModel)
-                else json.dumps(payload),
-            )
+        sfn = await self._client()
+        await sfn.start_execution(
+            stateMachineArn=f"{STATE_MACHINE_BASE_ARN}{WORKFLOW_NAME_MAP[workflow_name]}",
+            name=str(uuid.uuid4()),
+            input=payload.model_dump_json()
+            if isinstance(payload, BaseModel)
+            else json.dumps(payload),
+        )
 
     async def receive_batch_item_update_callback(
         self,
@@ -49,8 +77,17 @@ class StepFunctionsWorkflowService(BaseWorkflowEngineService):
         payload: CompletionBatchItemUpdateCallbackPayload,
     ) -> None:
         if payload.event == "ITEM_UPDATE":
-            async with self._aioboto3_session.client("stepfunctions") as sfn:
-                await sfn.send_task_success(
-                    taskToken=urllib.parse.unquote(query_params["taskToken"]),
-                    output=payload.model_dump_json(),
-                )
+            sfn = await self._client()
+            await sfn.send_task_success(
+                taskToken=urllib.parse.unquote(query_params["taskToken"]),
+                output=payload.model_dump_json(),
+            )
+
+    async def receive_batch_item_update_callbacks(
+        self,
+        query_params: dict[str, str],
+        payloads: list[CompletionBatchItemUpdateCallbackPayload],
+    ) -> None:
+        # Every task token is its own execution step, there is no batch API.
+        for payload in payloads:
+            await self.receive_batch_item_update_callback(query_params, payload)
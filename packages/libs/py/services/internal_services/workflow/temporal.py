@@ -1,28 +1,71 @@
-import asyncio
-
+from internal_temporal_utils.containers import TemporalContainer
+from internal_temporal_utils.settings import TaskQueueSettings
 from pydantic import BaseModel
 from temporalio.client import Client
+from temporalio.common import WorkflowIDReusePolicy
+from temporalio.exceptions import WorkflowAlreadyStartedError
+from temporalio.service import RPCError, RPCStatusCode
 from vmxai.types import CompletionBatchItemUpdateCallbackPayload
 
-from internal_services.workflow.engine import BaseWorkflowEngineService
+from internal_services.workflow.engine import (
+    BaseWorkflowEngineService,
+    CallbackRejectedError,
+)
 
 
 class TemporalWorkflowService(BaseWorkflowEngineService):
-    def __init__(self, temporal_client: Client):
+    def __init__(
+        self,
+        temporal_client: Client,
+        temporal_container: TemporalContainer | None = None,
+        task_queue_settings: TaskQueueSettings | None = None,
+    ):
         super().__init__()
         self._temporal_client = temporal_client
+        self._temporal_container = temporal_container
+        self._task_queue_settings = task_queue_settings or TaskQueueSettings()
+
+    @classmethod
+    async def create(cls) -> "TemporalWorkflowService":
+        temporal_container = TemporalContainer()
+        await temporal_container.init_resources()
+
+        return cls(
+            await temporal_container.temporal_client(),
+            temporal_container,
+            temporal_container.task_queue_settings(),
+        )
+
+    async def close(self) -> None:
+        if self._temporal_container:
+            await self._temporal_container.shutdown_resources()
 
     async def start_workflow(
         self, workflow_name: str, id: str, payload: dict | BaseModel
     ):
-        asyncio.ensure_future(
-            self._temporal_client.start_workflow(
+        # Workflows can't read settings in their sandbox, the task queues of
+        # their activities are passed with their options.
+        payload = (
+            payload.model_dump(mode="json")
+            if isinstance(payload, BaseModel)
+            else dict(payload)
+        )
+        payload["options"] = {
+            **(payload.get("options") or {}),
+            "task_queues": self._task_queue_settings.task_queues(),
+        }
+        try:
+            await self._temporal_client.start_workflow(
                 workflow_name,
                 id=id,
-                task_queue="temporal-worker",
+                task_queue=self._task_queue_settings.resolve("default"),
                 args=[payload],
+                # An ID is started at most once, even after the run closed.
+                id_reuse_policy=WorkflowIDReusePolicy.REJECT_DUPLICATE,
             )
-        )
+        except WorkflowAlreadyStartedError:
+            # Starts are retried by the workflow outbox, the first one won.
+            self._logger.info(f"Workflow {id} already started")
 
     async def receive_batch_item_update_callback(
         self,
@@ -35,3 +78,34 @@ class TemporalWorkflowService(BaseWorkflowEngineService):
         )
         if payload.event == "ITEM_UPDATE":
             await workflow_handle.signal("evaluate_item", payload)
+
+    async def receive_batch_item_update_callbacks(
+        self,
+        query_params: dict[str, str],
+        payloads: list[CompletionBatchItemUpdateCallbackPayload],
+    ) -> None:
+        items = [payload for payload in payloads if payload.event == "ITEM_UPDATE"]
+        if not items:
+            return
+
+        self._logger.info(f"Ingestion callbacks for {query_params}: {len(items)}")
+        workflow_handle = self._temporal_client.get_workflow_handle(
+            query_params["workflow_id"]
+        )
+        try:
+            await workflow_handle.signal("evaluate_items", items)
+        except RPCError as e:
+            # Signals over the payload size limit are rejected, as any other
+            # invalid signal, the same way on every attempt.
+            if e.status == RPCStatusCode.INVALID_ARGUMENT:
+                raise CallbackRejectedError(
+                    f"Callbacks rejected for {query_params}: {e.message}"
+                ) from e
+            # Nothing waits for the callbacks of a closed workflow, retrying
+            # them would never succeed.
+            if e.status != RPCStatusCode.NOT_FOUND:
+                raise
+            self._logger.warning(
+                f"Workflow {query_params['workflow_id']} is closed, "
+                f"ignoring {len(items)} callbacks"
+            )
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from vmxai.types import CompletionBatchItemUpdateCallbackPayload
+
+from internal_services.workflow.dispatcher import (
+    CallbackDeliveryError,
+    CallbackDispatcher,
+    CallbackQueueFullError,
+)
+from internal_services.workflow.engine import CallbackRejectedError
+
+
+def _callback(item_id: str, size: int = 0) -> CompletionBatchItemUpdateCallbackPayload:
+    return CompletionBatchItemUpdateCallbackPayload.model_construct(
+        event="ITEM_UPDATE", payload={"item_id": item_id, "response": "x" * size}
+    )
+
+
+class WorkflowEngineService:
+    def __init__(self, failures: int = 0, max_bytes: int | None = None):
+        self.failures = failures
+        self.max_bytes = max_bytes
+        self.calls: list[tuple[dict[str, str], int]] = []
+
+    async def receive_batch_item_update_callbacks(self, query_params, payloads):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Temporal unavailable")
+        if self.max_bytes is not None and (
+            sum(len(payload.model_dump_json()) for payload in payloads) > self.max_bytes
+            or any(payload.payload["item_id"] == "invalid" for payload in payloads)
+        ):
+            raise CallbackRejectedError("Signal rejected")
+        self.calls.append((query_params, len(payloads)))
+
+
+def test_callbacks_are_grouped_by_workflow():
+    async def run():
+        engine = WorkflowEngineService(failures=1)
+        dispatcher = CallbackDispatcher(engine, group_size=3, retry_backoff=0)
+        dispatcher.start()
+        for index in range(5):
+            await dispatcher.submit({"workflow_id": "a"}, _callback(f"a{index}"))
+        await dispatcher.submit({"workflow_id": "b"}, _callback("b0"))
+        await dispatcher.stop()
+        return engine.calls
+
+    calls = asyncio.run(run())
+
+    assert sorted((params["workflow_id"], size) for params, size in calls) == [
+        ("a", 2),
+        ("a", 3),
+        ("b", 1),
+    ]
+
+
+def test_full_queue_rejects_callbacks():
+    async def run():
+        dispatcher = CallbackDispatcher(
+            WorkflowEngineService(), queue_size=1, enqueue_timeout=0.01
+        )
+        # Looks healthy, but nothing drains the queue.
+        dispatcher._task = asyncio.create_task(asyncio.sleep(1))
+        await dispatcher.submit({"workflow_id": "a"}, _callback("a0"))
+        with pytest.raises(CallbackQueueFullError):
+            await dispatcher.submit({"workflow_id": "a"}, _callback("a1"))
+        dispatcher._task.cancel()
+
+    asyncio.run(run())
+
+
+def test_callbacks_are_retried_until_delivered():
+    async def run():
+        engine = WorkflowEngineService(failures=20)
+        dispatcher = CallbackDispatcher(engine, retry_backoff=0)
+        dispatcher.start()
+        await dispatcher.submit({"workflow_id": "a"}, _callback("a0"))
+        await dispatcher.stop()
+        return engine.calls
+
+    assert asyncio.run(run()) == [({"workflow_id": "a"}, 1)]
+
+
+def test_unhealthy_dispatcher_delivers_synchronously():
+    async def run():
+        engine = WorkflowEngineService(failures=1)
+        # Not started, callbacks can't be queued.
+        dispatcher = CallbackDispatcher(engine)
+        with pytest.raises(CallbackDeliveryError):
+            await dispatcher.submit({"workflow_id": "a"}, _callback("a0"))
+        await dispatcher.submit({"workflow_id": "a"}, _callback("a0"))
+        # Nothing queued, stopping returns right away.
+        await dispatcher.stop()
+        return engine.calls, dispatcher.pending
+
+    assert asyncio.run(run()) == ([({"workflow_id": "a"}, 1)], 0)
+
+
+def test_rejected_callbacks_do_not_keep_the_dispatcher_unhealthy():
+    async def run():
+        engine = WorkflowEngineService(max_bytes=2_000)
+        # The size cap is above the engine's limit, the group is rejected.
+        dispatcher = CallbackDispatcher(engine, max_group_bytes=10_000, retry_backoff=0)
+        dispatcher.start()
+        for index in range(4):
+            await dispatcher.submit({"workflow_id": "a"}, _callback(f"a{index}", 900))
+        await dispatcher.submit({"workflow_id": "b"}, _callback("b0"))
+        await dispatcher.submit({"workflow_id": "b"}, _callback("invalid"))
+        await dispatcher._queue.join()
+        healthy = dispatcher.healthy
+        await dispatcher.stop()
+        return engine.calls, healthy
+
+    calls, healthy = asyncio.run(run())
+
+    assert healthy
+    assert sorted((params["workflow_id"], size) for params, size in calls) == [
+        ("a", 2),
+        ("a", 2),
+        ("b", 1),
+    ]
+
+
+def test_groups_are_capped_by_size():
+    async def run():
+        engine = WorkflowEngineService()
+        dispatcher = CallbackDispatcher(engine, max_group_bytes=2_000)
+        dispatcher.start()
+        for index in range(5):
+            await dispatcher.submit({"workflow_id": "a"}, _callback(f"a{index}", 900))
+        await dispatcher.stop()
+        return engine.calls
+
+    assert sorted(size for _, size in asyncio.run(run())) == [1, 2, 2]
@@ -0,0 +1,119 @@
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import internal_db_models
+import jinja2
+
+from internal_services.evaluation import EvaluationService, render_prompts
+
+PROJECT_ID = uuid.uuid4()
+CATEGORY_ID = uuid.uuid4()
+NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+TEMPLATES = [
+    (
+        "You are an assistant that classifies pages of {{ title }} documents.",
+        "Does the page match the following description? {{ description }}",
+    ),
+    (
+        None,
+        "Answer with one of {{ evaluation_options | join(', ') }}.\n"
+        "{% if parent_evaluation_option %}"
+        "The parent answer was {{ parent_evaluation_option }}.{% endif %}",
+    ),
+    (
+        "{{ system_prompt or 'Be concise.' }}",
+        "{% for option in evaluation_options %}- {{ option }}\n{% endfor %}",
+    ),
+]
+
+
+def _template(system_prompt: str | None, prompt: str, updated_at: datetime = NOW):
+    return internal_db_models.EvaluationTemplateRead(
+        id=uuid.uuid4(),
+        name="Template",
+        description="Template",
+        project_id=PROJECT_ID,
+        system_prompt=system_prompt,
+        prompt=prompt,
+        category_id=CATEGORY_ID,
+        created_at=NOW,
+        updated_at=updated_at,
+    )
+
+
+def _evaluation(template_id: uuid.UUID):
+    return internal_db_models.EvaluationRead(
+        id=uuid.uuid4(),
+        title="Invoice",
+        description="The page is an invoice",
+        system_prompt=None,
+        prompt="",
+        project_id=PROJECT_ID,
+        evaluation_type=internal_db_models.EvaluationType.ENUM_CHOICE,
+        evaluation_options=["invoice", "receipt", "other"],
+        parent_evaluation_id=None,
+        parent_evaluation_option="true",
+        template_id=template_id,
+        category_id=CATEGORY_ID,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _render_uncached(evaluation, template) -> tuple[str | None, str]:
+    env = jinja2.Environment()
+    system_prompt = None
+    if template.system_prompt:
+        system_prompt = env.from_string(template.system_prompt).render(
+            evaluation.model_dump(mode="json")
+        )
+    context = evaluation.model_dump(mode="json")
+    context["system_prompt"] = system_prompt
+    return system_prompt, env.from_string(template.prompt).render(context)
+
+
+def test_cached_templates_render_like_uncached_ones():
+    service = EvaluationService(None, None)
+    for system_prompt, prompt in TEMPLATES:
+        template = _template(system_prompt, prompt)
+        evaluation = _evaluation(template.id)
+        expected = _render_uncached(evaluation, template)
+
+        for _ in range(2):
+            applied = service._apply_template(evaluation.model_copy(), template)
+            assert (applied.system_prompt, applied.prompt) == expected
+
+
+def test_updated_template_is_recompiled():
+    template = _template(None, "v1 {{ title }}")
+    evaluation = _evaluation(template.id)
+    assert render_prompts(evaluation, template)[1] == "v1 Invoice"
+
+    updated = template.model_copy(
+        update={"prompt": "v2 {{ title }}", "updated_at": NOW + timedelta(minutes=1)}
+    )
+    assert render_prompts(evaluation, updated)[1] == "v2 Invoice"
+
+
+def test_template_cache_benchmark():
+    templates = [_template(*template) for template in TEMPLATES]
+    # One evaluation per template, applied once for every tree branch.
+    pairs = [(_evaluation(template.id), template) for template in templates] * 500
+
+    started = time.perf_counter()
+    for evaluation, template in pairs:
+        _render_uncached(evaluation, template)
+    uncached = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for evaluation, template in pairs:
+        render_prompts(evaluation, template)
+    cached = time.perf_counter() - started
+
+    print(
+        f"\n{len(pairs)} renders: uncached={uncached * 1000:.1f}ms "
+        f"cached={cached * 1000:.1f}ms"
+    )
+    assert cached < uncached
@@ -0,0 +1,58 @@
+import asyncio
+
+from internal_temporal_utils.settings import TaskQueueSettings
+
+from internal_services.workflow.engine import WorkflowEngineService
+from internal_services.workflow.temporal import TemporalWorkflowService
+
+
+def test_engine_is_created_once(monkeypatch):
+    created: list[TemporalWorkflowService] = []
+
+    async def create():
+        await asyncio.sleep(0.01)
+        created.append(TemporalWorkflowService(temporal_client=None))
+        return created[-1]
+
+    monkeypatch.setattr(TemporalWorkflowService, "create", create)
+
+    async def run():
+        service = WorkflowEngineService(
+            aioboto3_session=None, workflow_engine="temporal"
+        )
+        engines = await asyncio.gather(
+            *(service._get_delegate_async() for _ in range(10))
+        )
+        await service.warm_up()
+        return engines
+
+    engines = asyncio.run(run())
+
+    assert len(created) == 1
+    assert all(engine is created[0] for engine in engines)
+
+
+def test_temporal_workflows_get_the_resolved_task_queues():
+    class TemporalClient:
+        async def start_workflow(self, workflow_name, **kwargs):
+            self.kwargs = kwargs
+
+    client = TemporalClient()
+    service = TemporalWorkflowService(
+        temporal_client=client,
+        task_queue_settings=TaskQueueSettings(default="workflows", llm="llm"),
+    )
+
+    asyncio.run(
+        service.start_workflow(
+            "UpdateEvaluationWorkflow",
+            "workflow",
+            {"evaluation": {}, "options": {"pack_evaluations": True}},
+        )
+    )
+
+    assert client.kwargs["task_queue"] == "workflows"
+    [payload] = client.kwargs["args"]
+    assert payload["options"]["pack_evaluations"]
+    assert payload["options"]["task_queues"]["llm"] == "llm"
+    assert payload["options"]["task_queues"]["parse"] == "workflows"
@@ -0,0 +1,60 @@
+import asyncio
+import uuid
+from datetime import timedelta
+
+import internal_db_models
+
+from internal_services.workflow.outbox import WorkflowOutboxDispatcher
+
+
+def _entry(workflow_id: str, attempts: int = 1):
+    return internal_db_models.WorkflowOutboxRead(
+        id=uuid.uuid4(),
+        workflow_name="UpdateEvaluationWorkflow",
+        workflow_id=workflow_id,
+        payload={},
+        attempts=attempts,
+        last_error=None,
+        available_at="2026-01-01T00:00:00Z",
+        created_at="2026-01-01T00:00:00Z",
+    )
+
+
+class WorkflowOutboxRepository:
+    def __init__(self, entries):
+        self.entries = entries
+        self.deleted: list[uuid.UUID] = []
+        self.retried: list[tuple[uuid.UUID, timedelta]] = []
+
+    async def claim_due(self, limit, lease):
+        claimed, self.entries = self.entries[:limit], self.entries[limit:]
+        return claimed
+
+    async def delete_many(self, ids):
+        self.deleted.extend(ids)
+
+    async def retry_later(self, id, error, delay):
+        self.retried.append((id, delay))
+
+
+class WorkflowEngineService:
+    def __init__(self):
+        self.started: list[str] = []
+
+    async def start_workflow(self, workflow_name, id, payload):
+        if id == "failing":
+            raise RuntimeError("Temporal unavailable")
+        self.started.append(id)
+
+
+def test_started_entries_are_deleted_and_failures_retried():
+    ok, failing = _entry("ok"), _entry("failing", attempts=3)
+    repository = WorkflowOutboxRepository([ok, failing])
+    engine = WorkflowEngineService()
+    dispatcher = WorkflowOutboxDispatcher(repository, engine, retry_backoff=1.0)
+
+    assert asyncio.run(dispatcher.dispatch()) == 2
+
+    assert engine.started == ["ok"]
+    assert repository.deleted == [ok.id]
+    assert repository.retried == [(failing.id, timedelta(seconds=4))]
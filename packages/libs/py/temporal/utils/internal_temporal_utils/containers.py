@@ -1,11 +1,12 @@
 from dependency_injector import containers, providers
 
 from .client import init_temporal_client
-from .settings import TemporalSettings
+from .settings import TaskQueueSettings, TemporalSettings
 
 
 class TemporalContainer(containers.DeclarativeContainer):
     temporal_settings = providers.Singleton(TemporalSettings)
+    task_queue_settings = providers.Singleton(TaskQueueSettings)
 
     temporal_client = providers.Resource(
         init_temporal_client,
@@ -1,4 +1,5 @@
 from os import environ
+from typing import Literal, get_args
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -13,3 +14,28 @@ class TemporalSettings(BaseSettings):
         env_prefix="TEMPORAL_",
     )
     host: str
+
+
+TaskQueueKind = Literal["default", "parse", "embed", "db", "llm"]
+
+
+class TaskQueueSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="TEMPORAL_TASK_QUEUE_",
+    )
+    # Kinds without a dedicated task queue fall back to the default one.
+    default: str = "temporal-worker"
+    parse: str | None = None
+    embed: str | None = None
+    db: str | None = None
+    llm: str | None = None
+
+    def resolve(self, kind: TaskQueueKind) -> str:
+        return getattr(self, kind) or self.default
+
+    def task_queues(self) -> dict[str, str]:
+        """Task queue of every kind, passed to workflows with their options."""
+        return {kind: self.resolve(kind) for kind in get_args(TaskQueueKind)}
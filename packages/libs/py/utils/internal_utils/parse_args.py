@@ -8,13 +8,14 @@ from pydantic import BaseModel
 
 def parse_args(callable: Callable, raw_args: dict):
     parsed_args = {}
-    for param_name, param_type in inspect.signature(callable).parameters.items():
+    for param_name, param in inspect.signature(callable).parameters.items():
         if param_name not in raw_args:
+            if param.default is not inspect.Parameter.empty:
+                continue
+
             raise ValueError(f"Missing argument: {param_name}")
 
-        parsed_args[param_name] = _parse_param(
-            raw_args, param_name, param_type.annotation
-        )
+        parsed_args[param_name] = _parse_param(raw_args, param_name, param.annotation)
 
     return parsed_args
 
@@ -10,6 +10,7 @@ from internal_vmx_utils.settings import VMXSettings
 class VMXClientResource(resources.AsyncResource):
     client: VMXClient
     resource_id: str
+    tier_resource_ids: dict[str, str]
 
     async def init(self, aioboto3_session: aioboto3.Session, vmx_settings: VMXSettings):
         if (
@@ -26,6 +27,7 @@ class VMXClientResource(resources.AsyncResource):
                 environment_id=vmx_settings.environment_id,
             )
             self.resource_id = vmx_settings.resource_id
+            self.tier_resource_ids = vmx_settings.tier_resource_ids
         else:
             async with aioboto3_session.client("secretsmanager") as client:
                 secret_value = await client.get_secret_value(
@@ -40,7 +42,18 @@ class VMXClientResource(resources.AsyncResource):
                 environment_id=creds["environment_id"],
             )
             self.resource_id = creds["resource_id"]
+            self.tier_resource_ids = {
+                **creds.get("tier_resource_ids", {}),
+                **vmx_settings.tier_resource_ids,
+            }
 
         return self
 
+    def resource_for_tier(self, tier: str | None) -> str:
+        """VM-X resource of a tier, the default resource for unknown tiers."""
+        if not tier:
+            return self.resource_id
+
+        return self.tier_resource_ids.get(tier, self.resource_id)
+
     async def shutdown(self, resource: "VMXClientResource"): ...
@@ -19,3 +19,5 @@ class VMXSettings(BaseSettings):
     environment_id: str | None = None
     secret_name: str | None = None
     resource_id: str | None = None
+    # Tier name -> VM-X resource, e.g. {"fast": "...", "large": "..."}.
+    tier_resource_ids: dict[str, str] = {}
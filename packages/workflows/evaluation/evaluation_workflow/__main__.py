@@ -5,9 +5,11 @@ import aioboto3
 from dependency_injector.wiring import Provide, inject
 from internal_aws_sqs_consumer import BaseMessageHandler, SQSConsumer
 from internal_logger import setup_logger
+from internal_temporal_utils.settings import TaskQueueSettings
 from temporalio.client import Client
 
 from .containers import Container
+from .settings import EvaluationWorkflowSettings
 
 setup_logger()
 
@@ -18,11 +20,20 @@ class IncomingMessageHandler(BaseMessageHandler):
         self,
         queue_url: str,
         temporal_client: Client,
+        evaluation_workflow_settings: EvaluationWorkflowSettings = Provide[
+            Container.evaluation_workflow_settings
+        ],
+        task_queue_settings: TaskQueueSettings = Provide[Container.task_queue_settings],
         aioboto3_session: aioboto3.Session = Provide[Container.aioboto3_session],
     ):
         super().__init__(queue_url, aioboto3_session)
 
         self._temporal_client = temporal_client
+        self._task_queue = task_queue_settings.resolve("default")
+        # Task queues are resolved here, workflows can't read settings.
+        self._evaluation_workflow_settings = evaluation_workflow_settings.model_copy(
+            update={"task_queues": task_queue_settings.task_queues()}
+        )
 
     async def _handle(self, message: dict):
         self._logger.info(f"Received message: {message}")
@@ -35,9 +46,10 @@ class IncomingMessageHandler(BaseMessageHandler):
             self._temporal_client.start_workflow(
                 "EvaluationWorkflow",
                 id=f"evaluation-workflow-{message['MessageId']}",
-                task_queue="temporal-worker",
+                task_queue=self._task_queue,
                 args=[
                     file_id,
+                    self._evaluation_workflow_settings,
                 ],
             )
         )
@@ -1,13 +1,26 @@
+from .get_evaluation_tree import EvaluationTree, GetEvaluationTreeActivity
+from .get_file_page_count import GetFilePageCountActivity
 from .get_files_to_evaluate import (
+    FilesToEvaluatePage,
     GetFilesToEvaluateActivity,
+    GetFilesToEvaluatePageActivity,
 )
+from .get_workflow_options import GetEvaluationWorkflowOptionsActivity
 from .start_evaluations import (
     StartEvaluationsActivity,
 )
 from .store_evaluation import StoreEvaluationActivity
+from .store_evaluations import StoreEvaluationsActivity
 
 __all__ = [
     "StartEvaluationsActivity",
     "StoreEvaluationActivity",
+    "StoreEvaluationsActivity",
     "GetFilesToEvaluateActivity",
+    "GetFilesToEvaluatePageActivity",
+    "FilesToEvaluatePage",
+    "GetEvaluationTreeActivity",
+    "GetFilePageCountActivity",
+    "GetEvaluationWorkflowOptionsActivity",
+    "EvaluationTree",
 ]
@@ -0,0 +1,65 @@
+import logging
+from uuid import UUID
+
+from internal_db_repositories.evaluation import EvaluationRepository
+from internal_db_repositories.file import FileRepository
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+def evaluation_tree_key(
+    parent_evaluation_id: UUID | None, parent_evaluation_option: str | None
+) -> str:
+    return f"{parent_evaluation_id or ''}:{parent_evaluation_option or ''}"
+
+
+class EvaluationTree(BaseModel):
+    # (parent evaluation, option) -> child evaluations, see evaluation_tree_key.
+    children: dict[str, list[UUID]] = {}
+
+    def has_children(
+        self,
+        parent_evaluation_id: UUID | None,
+        parent_evaluation_option: str | None,
+    ) -> bool:
+        return (
+            evaluation_tree_key(parent_evaluation_id, parent_evaluation_option)
+            in self.children
+        )
+
+
+class GetEvaluationTreeActivity:
+    def __init__(
+        self,
+        file_repository: FileRepository,
+        evaluation_repository: EvaluationRepository,
+    ):
+        self._file_repository = file_repository
+        self._evaluation_repository = evaluation_repository
+
+    async def run(self, file_id: UUID) -> EvaluationTree:
+        file = await self._file_repository.get(file_id)
+        if not file:
+            raise ValueError(f"File {file_id} not found")
+
+        evaluations = await self._evaluation_repository.get_by_project_id(
+            file.project_id
+        )
+
+        tree = EvaluationTree()
+        for evaluation in evaluations:
+            tree.children.setdefault(
+                evaluation_tree_key(
+                    evaluation.parent_evaluation_id,
+                    evaluation.parent_evaluation_option,
+                ),
+                [],
+            ).append(evaluation.id)
+
+        logger.info(
+            f"Loaded {len(evaluations)} evaluations in {len(tree.children)} "
+            f"branches for project {file.project_id}"
+        )
+
+        return tree
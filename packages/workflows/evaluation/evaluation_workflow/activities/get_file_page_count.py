@@ -0,0 +1,16 @@
+import logging
+from uuid import UUID
+
+from internal_db_repositories.file_content import FileContentRepository
+
+logger = logging.getLogger(__name__)
+
+
+class GetFilePageCountActivity:
+    def __init__(self, file_content_repository: FileContentRepository):
+        self._file_content_repository = file_content_repository
+
+    async def run(self, file_id: UUID) -> int:
+        page_count = await self._file_content_repository.count_by_file_id(file_id)
+        logger.info(f"File {file_id} has {page_count} pages")
+        return page_count
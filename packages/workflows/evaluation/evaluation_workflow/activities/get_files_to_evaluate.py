@@ -1,11 +1,21 @@
 import logging
+from uuid import UUID
 
 import internal_db_models
 from internal_db_repositories.file import FileRepository
 from internal_db_repositories.file_evaluation import FileEvaluationRepository
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 1000
+
+
+class FilesToEvaluatePage(BaseModel):
+    file_ids: list[UUID]
+    # Pass it back as ``cursor`` to get the next page, ``None`` on the last one.
+    next_cursor: UUID | None = None
+
 
 class GetFilesToEvaluateActivity:
     def __init__(
@@ -21,17 +31,33 @@ class GetFilesToEvaluateActivity:
         evaluation: internal_db_models.EvaluationRead,
         old_evaluation: internal_db_models.EvaluationRead | None = None,
     ) -> list[str]:
+        result: list[str] = []
+        cursor: UUID | None = None
+
+        while True:
+            page = await self.get_page(evaluation, old_evaluation, cursor)
+            result.extend(str(file_id) for file_id in page.file_ids)
+            if not page.next_cursor:
+                return result
+            cursor = page.next_cursor
+
+    async def get_page(
+        self,
+        evaluation: internal_db_models.EvaluationRead,
+        old_evaluation: internal_db_models.EvaluationRead | None = None,
+        cursor: UUID | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> FilesToEvaluatePage:
         parent_evaluation_option_changed = (
             old_evaluation
             and old_evaluation.parent_evaluation_option
             != evaluation.parent_evaluation_option
         )
-        result: list[str] = []
+        evaluation_responses: list[tuple[UUID, str | None]] = []
 
         if evaluation.parent_evaluation_id and evaluation.parent_evaluation_option:
-            parent_file_evaluations = (
-                await self._file_evaluation_repository.get_by_evaluation_id(
-                    evaluation.project_id,
+            evaluation_responses.append(
+                (
                     evaluation.parent_evaluation_id,
                     old_evaluation.parent_evaluation_option
                     if parent_evaluation_option_changed
@@ -39,33 +65,31 @@ class GetFilesToEvaluateActivity:
                 )
             )
 
-            for file_evaluation in parent_file_evaluations:
-                if (
-                    file_evaluation.file_id not in result
-                    and str(file_evaluation.file_id) not in result
-                ):
-                    result.append(str(file_evaluation.file_id))
-
         if old_evaluation:
-            file_evaluations = (
-                await self._file_evaluation_repository.get_by_evaluation_id(
-                    evaluation.project_id, evaluation.id
-                )
-            )
+            evaluation_responses.append((evaluation.id, None))
+
+        file_ids = await self._file_repository.get_ids_to_evaluate(
+            evaluation.project_id,
+            evaluation_responses,
+            status=None if old_evaluation else internal_db_models.FileStatus.COMPLETED,
+            after=cursor,
+            limit=limit,
+        )
+
+        return FilesToEvaluatePage(
+            file_ids=file_ids,
+            next_cursor=file_ids[-1] if len(file_ids) == limit else None,
+        )
+
 
-            for file_evaluation in file_evaluations:
-                if (
-                    file_evaluation.file_id not in result
-                    and str(file_evaluation.file_id) not in result
-                ):
-                    result.append(str(file_evaluation.file_id))
-        else:
-            files = await self._file_repository.get_by_project_id(evaluation.project_id)
-            for file in files:
-                if (
-                    file.status == internal_db_models.FileStatus.COMPLETED
-                    and str(file.id) not in result
-                ):
-                    result.append(str(file.id))
-
-        return result
+class GetFilesToEvaluatePageActivity(GetFilesToEvaluateActivity):
+    """Returns a single page of file ids, so workflows never hold the full list."""
+
+    async def run(
+        self,
+        evaluation: internal_db_models.EvaluationRead,
+        old_evaluation: internal_db_models.EvaluationRead | None = None,
+        cursor: UUID | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> FilesToEvaluatePage:
+        return await self.get_page(evaluation, old_evaluation, cursor, limit)
@@ -0,0 +1,27 @@
+from evaluation_workflow.settings import (
+    EvaluationWorkflowOptions,
+    EvaluationWorkflowSettings,
+)
+
+
+class GetEvaluationWorkflowOptionsActivity:
+    """Reads the evaluation workflow settings of the worker.
+
+    Workflows can't read settings in their sandbox, those started with partial
+    options (such as by the API) complete them with this activity.
+    """
+
+    def __init__(
+        self,
+        evaluation_workflow_settings: EvaluationWorkflowSettings,
+        task_queues: dict[str, str] | None = None,
+    ):
+        self._options = EvaluationWorkflowOptions.model_validate(
+            {
+                **evaluation_workflow_settings.model_dump(),
+                "task_queues": task_queues or {},
+            }
+        )
+
+    async def run(self) -> EvaluationWorkflowOptions:
+        return self._options
@@ -1,10 +1,19 @@
+import asyncio
+import hashlib
+import json
 import logging
+import uuid
+from datetime import UTC, datetime
 from uuid import UUID
 
 import internal_db_models
+from internal_db_models.llm_payload import page_message_content
+from internal_db_repositories.evaluation_cache import EvaluationCacheRepository
 from internal_db_repositories.file import FileRepository
 from internal_db_repositories.file_content import FileContentRepository
+from internal_db_repositories.file_evaluation import FileEvaluationRepository
 from internal_services.evaluation import EvaluationService
+from internal_utils.chunk import chunk
 from internal_vmx_utils.client import VMXClientResource
 from pydantic import BaseModel
 from vmxai import (
@@ -15,17 +24,60 @@ from vmxai import (
 )
 from vmxai.types import (
     BatchRequestCallbackOptions,
+    CompletionBatchItemUpdateCallbackPayload,
+    CompletionBatchRequestStatus,
     CompletionRequest,
     RequestMessage,
 )
 
+from evaluation_workflow.settings import EvaluationWorkflowOptions, MessageLayout
+from evaluation_workflow.tokens import count_tokens, split_tokens
+
 logger = logging.getLogger(__name__)
 
 
+class EvaluationBranch(BaseModel):
+    evaluation_id: UUID | None = None
+    parent_evaluation_id: UUID | None = None
+    parent_evaluation_option: str | None = None
+    parent_file_content_id: UUID | None = None
+    # Restricts a root branch to a range of pages.
+    from_page: int | None = None
+    to_page: int | None = None
+
+
+class EvaluationAnswer(BaseModel):
+    evaluation_id: UUID
+    file_content_id: UUID
+    response: str | None
+
+
 class StartEvaluationOutput(BaseModel):
     evaluation_ids: list[UUID]
+    # First of batch_ids, requests are submitted in one batch per VM-X resource.
     batch_id: UUID | None
     batch_item_ids: list[UUID] | None
+    batch_ids: list[UUID] = []
+    # Results of requests completed without a batch, to be stored like callbacks.
+    direct_results: list[CompletionBatchItemUpdateCallbackPayload] = []
+    # Answers reused from the evaluation cache, already stored for the file.
+    cached_results: list[EvaluationAnswer] = []
+    cache_hits: int = 0
+    cache_tokens_saved: int = 0
+    # Prompt tokens of the submitted requests, counted when they were built.
+    estimated_tokens: int = 0
+
+
+def evaluation_request_hash(request: CompletionRequest) -> str:
+    """Hash of everything that decides the answer: prompts, page, tools and model.
+
+    The metadata only identifies the file and workflow, it is left out so the
+    same question on an identical page hits the cache across files and runs.
+    """
+    payload = request.model_dump(mode="json", exclude={"metadata"}, exclude_none=True)
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
 
 
 BOOLEAN_TOOL = RequestToolFunction(
@@ -62,67 +114,356 @@ def ENUM_TOOL(options: list[str]) -> RequestToolFunction:
     )
 
 
+PACKED_TOOL_NAME = "evaluation_answers"
+PACKABLE_EVALUATION_TYPES = (
+    internal_db_models.EvaluationType.BOOLEAN,
+    internal_db_models.EvaluationType.ENUM_CHOICE,
+)
+
+
+def packed_answer_key(index: int) -> str:
+    return f"answer_{index}"
+
+
+def PACKED_TOOL(
+    evaluations: list[internal_db_models.EvaluationRead],
+) -> RequestToolFunction:
+    properties: dict[str, dict] = {}
+    for index, evaluation in enumerate(evaluations, start=1):
+        description = f"The answer to question {index}"
+        match evaluation.evaluation_type:
+            case internal_db_models.EvaluationType.BOOLEAN:
+                properties[packed_answer_key(index)] = {
+                    "type": "boolean",
+                    "description": description,
+                }
+            case internal_db_models.EvaluationType.ENUM_CHOICE:
+                properties[packed_answer_key(index)] = {
+                    "type": "string",
+                    "description": description,
+                    "enum": evaluation.evaluation_options,
+                }
+
+    return RequestToolFunction(
+        name=PACKED_TOOL_NAME,
+        description="Answer every numbered question",
+        parameters={
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+        },
+    )
+
+
+def evaluation_tier(
+    evaluation: internal_db_models.EvaluationRead, type_tiers: dict[str, str]
+) -> str | None:
+    return evaluation.model_tier or type_tiers.get(evaluation.evaluation_type.value)
+
+
+def pack_evaluations(
+    evaluations: list[internal_db_models.EvaluationRead],
+    pack_size: int,
+    type_tiers: dict[str, str] | None = None,
+) -> tuple[
+    list[list[internal_db_models.EvaluationRead]],
+    list[internal_db_models.EvaluationRead],
+]:
+    """Group the boolean and enum evaluations sharing a system prompt and tier.
+
+    Returns the packs of up to ``pack_size`` evaluations and the evaluations
+    left to be asked on their own.
+    """
+    groups: dict[
+        tuple[str | None, str | None], list[internal_db_models.EvaluationRead]
+    ] = {}
+    singles: list[internal_db_models.EvaluationRead] = []
+    for evaluation in evaluations:
+        if pack_size > 1 and evaluation.evaluation_type in PACKABLE_EVALUATION_TYPES:
+            key = (
+                evaluation.system_prompt,
+                evaluation_tier(evaluation, type_tiers or {}),
+            )
+            groups.setdefault(key, []).append(evaluation)
+        else:
+            singles.append(evaluation)
+
+    packs: list[list[internal_db_models.EvaluationRead]] = []
+    for group in groups.values():
+        for pack in chunk(group, pack_size):
+            if len(pack) > 1:
+                packs.append(pack)
+            else:
+                singles.extend(pack)
+
+    return packs, singles
+
+
+def page_messages(
+    system_prompt: str | None,
+    file_content: internal_db_models.FileContentRead,
+    prompt: str,
+    message_layout: MessageLayout = "instructions_first",
+) -> list[RequestMessage]:
+    page_message = RequestMessage(
+        role="system", content=page_message_content(file_content)
+    )
+    instructions = (
+        [RequestMessage(role="system", content=system_prompt)] if system_prompt else []
+    )
+
+    match message_layout:
+        case "page_first":
+            messages = [page_message, *instructions]
+        case _:
+            messages = [*instructions, page_message]
+
+    messages.append(
+        RequestMessage(
+            role="user",
+            content=prompt,
+        )
+    )
+
+    return messages
+
+
+def request_tokens(request: CompletionRequest) -> int:
+    tokens = sum(count_tokens(message.content or "") for message in request.messages)
+    if request.tools:
+        tokens += count_tokens(
+            json.dumps([tool.model_dump(mode="json") for tool in request.tools])
+        )
+
+    return tokens
+
+
+def page_windows(
+    file_content: internal_db_models.FileContentRead, max_tokens: int
+) -> list[internal_db_models.FileContentRead]:
+    """Drop the metadata of the page, then split its content, to fit max_tokens.
+
+    Returns the page itself when it fits without its metadata.
+    """
+    page = file_content.model_copy(update={"content_metadata": {}})
+    if count_tokens(page_message_content(page)) <= max_tokens:
+        return [page]
+
+    window_tokens = max_tokens - count_tokens(
+        page_message_content(page.model_copy(update={"content": ""}))
+    )
+    while True:
+        windows = [
+            page.model_copy(update={"content": content})
+            for content in split_tokens(page.content, window_tokens)
+        ]
+        # Counts of a text and of its parts can differ by a token or so, the
+        # split is repeated until every window fits.
+        excess = (
+            max(count_tokens(page_message_content(window)) for window in windows)
+            - max_tokens
+        )
+        if excess <= 0:
+            return windows
+
+        window_tokens -= excess
+
+
 class StartEvaluationsActivity:
     def __init__(
         self,
         evaluation_service: EvaluationService,
         file_repository: FileRepository,
         file_content_repository: FileContentRepository,
+        file_evaluation_repository: FileEvaluationRepository,
+        evaluation_cache_repository: EvaluationCacheRepository,
         vmx_client_resource: VMXClientResource,
         ingestion_callback_url: str,
     ):
         self._evaluation_service = evaluation_service
         self._file_repository = file_repository
         self._file_content_repository = file_content_repository
+        self._file_evaluation_repository = file_evaluation_repository
+        self._evaluation_cache_repository = evaluation_cache_repository
+        self._vmx_client_resource = vmx_client_resource
         self._vmx_client = vmx_client_resource.client
-        self._vmx_resource_id = vmx_client_resource.resource_id
         self._ingestion_callback_url = ingestion_callback_url
 
     async def run(
         self,
         file_id: UUID,
-        evaluation_id: UUID | None = None,
-        parent_evaluation_id: UUID | None = None,
-        parent_evaluation_option: str | None = None,
-        parent_file_content_id: UUID | None = None,
+        branches: list[EvaluationBranch],
+        options: EvaluationWorkflowOptions | None = None,
     ) -> StartEvaluationOutput:
+        """Submit the requests of every branch as a single VM-X batch.
+
+        Up to ``options.direct_max_requests`` requests are instead completed
+        right away and returned in ``direct_results``.
+        """
         from temporalio import activity
 
+        options = options or EvaluationWorkflowOptions()
         workflow_id = activity.info().workflow_id
-        requests, evaluations = await self.generate_llm_requests(
-            file_id,
-            workflow_id,
-            evaluation_id,
-            parent_evaluation_id,
-            parent_evaluation_option,
-            parent_file_content_id,
+        file = await self._get_file_to_evaluate(file_id)
+
+        requests: list[CompletionRequest] = []
+        evaluations: dict[UUID, internal_db_models.EvaluationRead] = {}
+        # Branches of different pages usually share the same parent evaluation
+        # and option, their evaluations are only looked up once.
+        branch_evaluations: dict[
+            tuple[UUID | None, UUID | None, str | None],
+            list[internal_db_models.EvaluationRead],
+        ] = {}
+        for branch in branches:
+            key = (
+                branch.evaluation_id,
+                branch.parent_evaluation_id,
+                branch.parent_evaluation_option,
+            )
+            if key not in branch_evaluations:
+                branch_evaluations[key] = await self._get_branch_evaluations(
+                    file, branch
+                )
+
+            requests.extend(
+                await self._generate_branch_requests(
+                    file,
+                    workflow_id,
+                    branch,
+                    branch_evaluations[key],
+                    options,
+                )
+            )
+            evaluations.update(
+                {evaluation.id: evaluation for evaluation in branch_evaluations[key]}
+            )
+
+        # Requests of the same page are submitted next to each other, whichever
+        # branch they come from, so their shared prefix is still cached by the
+        # provider when they are processed.
+        requests.sort(key=lambda request: request.metadata["file_content_id"])
+
+        requests, cached_results, cache_tokens_saved = await self._apply_cache(
+            file, requests
         )
+        if cached_results:
+            logger.info(
+                f"Reused {len(cached_results)} cached evaluations for file "
+                f"{file_id}, saving {cache_tokens_saved} tokens"
+            )
 
         if len(requests) == 0:
             return StartEvaluationOutput(
-                evaluation_ids=[],
+                evaluation_ids=list(evaluations) if cached_results else [],
                 batch_id=None,
                 batch_item_ids=None,
+                cached_results=cached_results,
+                cache_hits=len(cached_results),
+                cache_tokens_saved=cache_tokens_saved,
+            )
+
+        estimated_tokens = sum(
+            request.metadata["estimated_tokens"] for request in requests
+        )
+        logger.info(
+            f"Submitting {len(requests)} requests for file {file_id}, "
+            f"~{estimated_tokens} prompt tokens"
+        )
+
+        # Small evaluations skip the batch queue, the callback and the signal.
+        if len(requests) <= options.direct_max_requests:
+            direct_results = await self._complete_direct(
+                requests, options.direct_max_concurrency
+            )
+            return StartEvaluationOutput(
+                evaluation_ids=list(evaluations),
+                batch_id=None,
+                batch_item_ids=None,
+                cached_results=cached_results,
+                direct_results=direct_results,
+                cache_hits=len(cached_results),
+                cache_tokens_saved=cache_tokens_saved,
+                estimated_tokens=estimated_tokens,
             )
 
-        workflow_id = activity.info().workflow_id
         callback_url = f"{self._ingestion_callback_url}?workflow_id={workflow_id}"
 
-        batch_response = await self._vmx_client.completion_batch_callback(
-            requests=requests,
-            callback_options=BatchRequestCallbackOptions(
-                headers={},
-                url=callback_url,
-                events=["ITEM_UPDATE"],
-            ),
+        # Requests keep their page order within the batch of their resource.
+        resource_requests: dict[str, list[CompletionRequest]] = {}
+        for request in requests:
+            resource_requests.setdefault(request.resource, []).append(request)
+
+        batch_responses = await asyncio.gather(
+            *[
+                self._vmx_client.completion_batch_callback(
+                    requests=batch_requests,
+                    callback_options=BatchRequestCallbackOptions(
+                        headers={},
+                        url=callback_url,
+                        events=["ITEM_UPDATE"],
+                    ),
+                )
+                for batch_requests in resource_requests.values()
+            ]
         )
 
         return StartEvaluationOutput(
-            evaluation_ids=[evaluation.id for evaluation in evaluations],
-            batch_id=batch_response.batch_id,
-            batch_item_ids=[item.item_id for item in batch_response.items],
+            evaluation_ids=list(evaluations),
+            batch_id=batch_responses[0].batch_id,
+            batch_ids=[response.batch_id for response in batch_responses],
+            batch_item_ids=[
+                item.item_id for response in batch_responses for item in response.items
+            ],
+            cached_results=cached_results,
+            cache_hits=len(cached_results),
+            cache_tokens_saved=cache_tokens_saved,
+            estimated_tokens=estimated_tokens,
         )
 
+    async def _complete_direct(
+        self, requests: list[CompletionRequest], max_concurrency: int
+    ) -> list[CompletionBatchItemUpdateCallbackPayload]:
+        """Complete the requests concurrently, shaped as batch callbacks.
+
+        The results are stored by the workflow exactly like the callbacks of a
+        batch. The VM-X gRPC client is blocking, requests run in threads. A
+        failed completion fails the activity so that it is retried, instead of
+        storing a result without a response.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        batch_id = str(uuid.uuid4())
+
+        async def complete(
+            request: CompletionRequest,
+        ) -> CompletionBatchItemUpdateCallbackPayload:
+            async with semaphore:
+                response = await asyncio.to_thread(
+                    self._vmx_client.completion, request=request, stream=False
+                )
+
+            timestamp = datetime.now(UTC).isoformat()
+            return CompletionBatchItemUpdateCallbackPayload.model_validate(
+                {
+                    "event": "ITEM_UPDATE",
+                    "payload": {
+                        "createdAt": timestamp,
+                        "updatedAt": timestamp,
+                        "createdBy": "",
+                        "updatedBy": "",
+                        "workspaceEnvironmentItemId": "",
+                        "timestamp": timestamp,
+                        "itemId": str(uuid.uuid4()),
+                        "batchId": batch_id,
+                        "request": request,
+                        "response": response,
+                        "status": CompletionBatchRequestStatus.COMPLETED,
+                        "error": None,
+                    },
+                }
+            )
+
+        return await asyncio.gather(*[complete(request) for request in requests])
+
     async def generate_llm_requests(
         self,
         file_id: UUID,
@@ -132,6 +473,77 @@ class StartEvaluationsActivity:
         parent_evaluation_option: str | None = None,
         parent_file_content_id: UUID | None = None,
     ) -> tuple[list[CompletionRequest], list[internal_db_models.EvaluationRead]]:
+        file = await self._get_file_to_evaluate(file_id)
+        branch = EvaluationBranch(
+            evaluation_id=evaluation_id,
+            parent_evaluation_id=parent_evaluation_id,
+            parent_evaluation_option=parent_evaluation_option,
+            parent_file_content_id=parent_file_content_id,
+        )
+        evaluations = await self._get_branch_evaluations(file, branch)
+        requests = await self._generate_branch_requests(
+            file,
+            workflow_id,
+            branch,
+            evaluations,
+        )
+
+        return requests, evaluations
+
+    async def _apply_cache(
+        self,
+        file: internal_db_models.FileRead,
+        requests: list[CompletionRequest],
+    ) -> tuple[list[CompletionRequest], list[EvaluationAnswer], int]:
+        """Store the cached answers, returning the requests still to be sent."""
+        entries = await self._evaluation_cache_repository.get_by_request_hashes(
+            [
+                request.metadata["request_hash"]
+                for request in requests
+                if request.metadata.get("request_hash")
+            ]
+        )
+        if not entries:
+            return requests, [], 0
+
+        pending: list[CompletionRequest] = []
+        cached_results: list[EvaluationAnswer] = []
+        file_evaluations: list[internal_db_models.FileEvaluationCreate] = []
+        tokens_saved = 0
+        for request in requests:
+            entry = entries.get(request.metadata.get("request_hash"))
+            if not entry:
+                pending.append(request)
+                continue
+
+            result = EvaluationAnswer(
+                evaluation_id=UUID(request.metadata["evaluation_id"]),
+                file_content_id=UUID(request.metadata["file_content_id"]),
+                response=entry.response,
+            )
+            cached_results.append(result)
+            tokens_saved += entry.total_tokens
+            file_evaluations.append(
+                internal_db_models.FileEvaluationCreate(
+                    id=uuid.uuid4(),
+                    file_id=file.id,
+                    evaluation_id=result.evaluation_id,
+                    response=entry.response,
+                    content_id=result.file_content_id,
+                    status=internal_db_models.FileEvaluationStatus.COMPLETED,
+                    error=None,
+                    llm_request=request.model_dump(mode="json"),
+                    llm_response=entry.llm_response or {},
+                )
+            )
+
+        await self._file_evaluation_repository.upsert_many_by_evaluation_id_and_content_id(  # noqa: E501
+            file_evaluations
+        )
+
+        return pending, cached_results, tokens_saved
+
+    async def _get_file_to_evaluate(self, file_id: UUID) -> internal_db_models.FileRead:
         file = await self._file_repository.get(file_id)
         if not file:
             raise ValueError(f"File {file_id} not found")
@@ -140,103 +552,243 @@ class StartEvaluationsActivity:
             file_id, {"status": internal_db_models.FileStatus.EVALUATING}
         )
 
-        logger.info(f"Starting evaluations for file {file_id}")
+        return file
+
+    async def _get_branch_evaluations(
+        self,
+        file: internal_db_models.FileRead,
+        branch: EvaluationBranch,
+    ) -> list[internal_db_models.EvaluationRead]:
         logger.info(f"Getting questions for project {file.project_id}")
-        if evaluation_id and not parent_evaluation_id and not parent_evaluation_option:
-            evaluations = [await self._evaluation_service.get(evaluation_id)]
+        if (
+            branch.evaluation_id
+            and not branch.parent_evaluation_id
+            and not branch.parent_evaluation_option
+        ):
+            evaluations = [await self._evaluation_service.get(branch.evaluation_id)]
         else:
             evaluations = await self._evaluation_service.get_by_project_id_and_parent_evaluation_id(  # noqa: E501
                 project_id=file.project_id,
-                parent_evaluation_id=parent_evaluation_id,
-                parent_evaluation_option=parent_evaluation_option,
+                parent_evaluation_id=branch.parent_evaluation_id,
+                parent_evaluation_option=branch.parent_evaluation_option,
             )
 
         logger.info(
             f"Found {len(evaluations)} evaluations for project {file.project_id}"
         )
 
+        return evaluations
+
+    async def _generate_branch_requests(
+        self,
+        file: internal_db_models.FileRead,
+        workflow_id: str,
+        branch: EvaluationBranch,
+        evaluations: list[internal_db_models.EvaluationRead],
+        options: EvaluationWorkflowOptions | None = None,
+    ) -> list[CompletionRequest]:
+        options = options or EvaluationWorkflowOptions()
+        file_id = file.id
+        parent_evaluation_id = branch.parent_evaluation_id
+        parent_evaluation_option = branch.parent_evaluation_option
+        parent_file_content_id = branch.parent_file_content_id
+
         if not evaluations:
-            return [], []
+            return []
 
+        logger.info(f"Starting evaluations for file {file_id}")
         requests: list[CompletionRequest] = []
-        file_contents = (
-            [await self._file_content_repository.get(parent_file_content_id)]
-            if parent_file_content_id
-            else await self._file_content_repository.get_by_file_id(file_id)
+        if parent_file_content_id:
+            file_contents = [
+                await self._file_content_repository.get(parent_file_content_id)
+            ]
+        elif branch.from_page:
+            file_contents = await self._file_content_repository.get_by_file_id_and_page(
+                file_id, branch.from_page, branch.to_page
+            )
+        else:
+            file_contents = await self._file_content_repository.get_by_file_id(file_id)
+        packs, single_evaluations = pack_evaluations(
+            evaluations,
+            options.pack_size if options.pack_evaluations else 1,
+            options.evaluation_type_tiers,
         )
 
         for file_content in file_contents:
-            for evaluation in evaluations:
-                messages: list[RequestMessage] = []
-                if evaluation.system_prompt:
-                    messages.append(
-                        RequestMessage(
-                            role="system",
-                            content=evaluation.system_prompt,
-                        )
-                    )
+            metadata = {
+                "file_id": str(file_id),
+                "file_content_id": str(file_content.id),
+                "page_metadata": file_content.content_metadata,
+                "workflow_id": workflow_id,
+                "parent_evaluation_id": str(parent_evaluation_id)
+                if parent_evaluation_id
+                else None,
+                "parent_evaluation_option": parent_evaluation_option,
+            }
 
-                messages.append(
-                    RequestMessage(
-                        role="system",
-                        content=(
-                            f"Document Page: {file_content.content}"
-                            f"\n\nMetadata: {file_content.content_metadata}"
-                        ),
-                    )
+            page_requests = self._page_requests(
+                file_content, metadata, packs, single_evaluations, options
+            )
+            estimates = [request_tokens(request) for request in page_requests]
+            excess = max(
+                (
+                    estimate - options.request_token_budget(request.resource)
+                    for request, estimate in zip(page_requests, estimates, strict=True)
+                ),
+                default=0,
+            )
+            if excess > 0:
+                windows = page_windows(
+                    file_content,
+                    count_tokens(page_message_content(file_content)) - excess,
+                )
+                logger.warning(
+                    f"Page {file_content.id} of file {file_id} exceeds the request "
+                    f"token budget by {excess}, splitting it in {len(windows)} "
+                    "windows"
                 )
+                page_requests = self._window_requests(
+                    windows, metadata, packs, single_evaluations, options
+                )
+                estimates = [request_tokens(request) for request in page_requests]
 
-                messages.append(
-                    RequestMessage(
-                        role="user",
-                        content=evaluation.prompt,
-                    )
+            for request, estimate in zip(page_requests, estimates, strict=True):
+                request.metadata["estimated_tokens"] = estimate
+            requests.extend(page_requests)
+
+        return requests
+
+    def _window_requests(
+        self,
+        windows: list[internal_db_models.FileContentRead],
+        metadata: dict,
+        packs: list[list[internal_db_models.EvaluationRead]],
+        single_evaluations: list[internal_db_models.EvaluationRead],
+        options: EvaluationWorkflowOptions,
+    ) -> list[CompletionRequest]:
+        """Requests of a page split in windows, one per question and window.
+
+        The requests asking the same question share a ``window_group``, their
+        answers are merged into a single answer for the page when stored.
+        """
+        if len(windows) == 1:
+            # Sent without its metadata, the stored request keeps its page.
+            return self._page_requests(
+                windows[0],
+                {**metadata, "page_windows": 1},
+                packs,
+                single_evaluations,
+                options,
+            )
+
+        window_requests = [
+            self._page_requests(window, metadata, packs, single_evaluations, options)
+            for window in windows
+        ]
+        window_groups = [str(uuid.uuid4()) for _ in window_requests[0]]
+        requests: list[CompletionRequest] = []
+        for index, page_requests in enumerate(window_requests):
+            for window_group, request in zip(window_groups, page_requests, strict=True):
+                # The answer of a window is partial, it is never cached.
+                request.metadata.pop("request_hash", None)
+                request.metadata.update(
+                    {
+                        "window_group": window_group,
+                        "page_window": index,
+                        "page_windows": len(windows),
+                    }
                 )
+                requests.append(request)
+
+        return requests
 
-                request = CompletionRequest(
-                    messages=messages,
-                    resource=self._vmx_resource_id,
+    def _page_requests(
+        self,
+        file_content: internal_db_models.FileContentRead,
+        metadata: dict,
+        packs: list[list[internal_db_models.EvaluationRead]],
+        single_evaluations: list[internal_db_models.EvaluationRead],
+        options: EvaluationWorkflowOptions,
+    ) -> list[CompletionRequest]:
+        message_layout = options.message_layout
+        page_requests: list[CompletionRequest] = []
+        for pack in packs:
+            tier = evaluation_tier(pack[0], options.evaluation_type_tiers)
+            page_requests.append(
+                CompletionRequest(
+                    messages=page_messages(
+                        pack[0].system_prompt,
+                        file_content,
+                        "Answer every question below about the document page, "
+                        "each in the answer with the same number.\n\n"
+                        + "\n\n".join(
+                            f"{index}. {evaluation.prompt}"
+                            for index, evaluation in enumerate(pack, start=1)
+                        ),
+                        message_layout,
+                    ),
+                    resource=self._vmx_client_resource.resource_for_tier(tier),
                     metadata={
-                        "evaluation_id": str(evaluation.id),
-                        "file_id": str(file_id),
-                        "file_content_id": str(file_content.id),
-                        "page_metadata": file_content.content_metadata,
-                        "workflow_id": workflow_id,
-                        "parent_evaluation_id": str(parent_evaluation_id)
-                        if parent_evaluation_id
-                        else None,
-                        "parent_evaluation_option": parent_evaluation_option,
+                        "evaluation_ids": [str(evaluation.id) for evaluation in pack],
+                        "model_tier": tier,
+                        **metadata,
                     },
+                    tools=[RequestTools(type="function", function=PACKED_TOOL(pack))],
+                    tool_choice=RequestToolChoiceItem(
+                        type="function",
+                        function=RequestToolChoiceFunction(name=PACKED_TOOL_NAME),
+                    ),
                 )
+            )
+
+        for evaluation in single_evaluations:
+            tier = evaluation_tier(evaluation, options.evaluation_type_tiers)
+            request = CompletionRequest(
+                messages=page_messages(
+                    evaluation.system_prompt,
+                    file_content,
+                    evaluation.prompt,
+                    message_layout,
+                ),
+                resource=self._vmx_client_resource.resource_for_tier(tier),
+                metadata={
+                    "evaluation_id": str(evaluation.id),
+                    "model_tier": tier,
+                    **metadata,
+                },
+            )
 
-                match evaluation.evaluation_type:
-                    case internal_db_models.EvaluationType.BOOLEAN:
-                        request.tools = [
-                            RequestTools(
-                                type="function",
-                                function=BOOLEAN_TOOL,
-                            )
-                        ]
-                        request.tool_choice = RequestToolChoiceItem(
+            match evaluation.evaluation_type:
+                case internal_db_models.EvaluationType.BOOLEAN:
+                    request.tools = [
+                        RequestTools(
                             type="function",
-                            function=RequestToolChoiceFunction(
-                                name="boolean_answer",
-                            ),
+                            function=BOOLEAN_TOOL,
                         )
-                    case internal_db_models.EvaluationType.ENUM_CHOICE:
-                        request.tools = [
-                            RequestTools(
-                                type="function",
-                                function=ENUM_TOOL(evaluation.evaluation_options),
-                            )
-                        ]
-                        request.tool_choice = RequestToolChoiceItem(
+                    ]
+                    request.tool_choice = RequestToolChoiceItem(
+                        type="function",
+                        function=RequestToolChoiceFunction(
+                            name="boolean_answer",
+                        ),
+                    )
+                case internal_db_models.EvaluationType.ENUM_CHOICE:
+                    request.tools = [
+                        RequestTools(
                             type="function",
-                            function=RequestToolChoiceFunction(
-                                name="enum_answer",
-                            ),
+                            function=ENUM_TOOL(evaluation.evaluation_options),
                         )
+                    ]
+                    request.tool_choice = RequestToolChoiceItem(
+                        type="function",
+                        function=RequestToolChoiceFunction(
+                            name="enum_answer",
+                        ),
+                    )
 
-                requests.append(request)
+            if evaluation.cache_enabled:
+                request.metadata["request_hash"] = evaluation_request_hash(request)
 
-        return requests, evaluations
+            page_requests.append(request)
+
+        return page_requests
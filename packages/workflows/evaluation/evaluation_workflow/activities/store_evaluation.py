@@ -6,6 +6,7 @@ from uuid import UUID
 import internal_db_models
 from google.protobuf.json_format import MessageToDict
 from internal_db_repositories.evaluation import EvaluationRepository
+from internal_db_repositories.evaluation_cache import EvaluationCacheRepository
 from internal_db_repositories.file import FileRepository
 from internal_db_repositories.file_evaluation import FileEvaluationRepository
 from vmxai.types import (
@@ -13,19 +14,243 @@ from vmxai.types import (
     CompletionBatchRequestStatus,
 )
 
+from evaluation_workflow.activities.start_evaluations import (
+    PACKED_TOOL_NAME,
+    EvaluationAnswer,
+    packed_answer_key,
+)
+
 logger = logging.getLogger(__name__)
 
 
+def parse_evaluation_response(
+    evaluation: internal_db_models.EvaluationRead,
+    result: CompletionBatchItemUpdateCallbackPayload,
+) -> str | None:
+    if not result.payload.response:
+        raise ValueError("No response from VMX")
+
+    response: str | None = None
+
+    match evaluation.evaluation_type:
+        case internal_db_models.EvaluationType.BOOLEAN:
+            if not result.payload.response.tool_calls:
+                raise ValueError("No tool calls from VMX")
+
+            tool_call = result.payload.response.tool_calls[0]
+            if tool_call.function.name != "boolean_answer":
+                raise ValueError("Invalid tool call from VMX")
+
+            boolean_answer = tool_call.function.arguments
+            if not boolean_answer:
+                raise ValueError("No boolean answer from VMX")
+
+            boolean_answer = json.loads(boolean_answer)
+            response = str(boolean_answer["answer"]).lower()
+        case internal_db_models.EvaluationType.ENUM_CHOICE:
+            if not result.payload.response.tool_calls:
+                raise ValueError("No tool calls from VMX")
+
+            tool_call = result.payload.response.tool_calls[0]
+            if tool_call.function.name != "enum_answer":
+                raise ValueError("Invalid tool call from VMX")
+
+            enum_answer = tool_call.function.arguments
+            if not enum_answer:
+                raise ValueError("No enum answer from VMX")
+
+            enum_answer = json.loads(enum_answer)
+            response = enum_answer["answer"]
+        case internal_db_models.EvaluationType.TEXT:
+            response = result.payload.response.message
+
+    return response
+
+
+def parse_packed_evaluation_responses(
+    evaluations: list[internal_db_models.EvaluationRead],
+    result: CompletionBatchItemUpdateCallbackPayload,
+) -> list[str]:
+    if not result.payload.response:
+        raise ValueError("No response from VMX")
+
+    if not result.payload.response.tool_calls:
+        raise ValueError("No tool calls from VMX")
+
+    tool_call = result.payload.response.tool_calls[0]
+    if tool_call.function.name != PACKED_TOOL_NAME:
+        raise ValueError("Invalid tool call from VMX")
+
+    if not tool_call.function.arguments:
+        raise ValueError("No packed answers from VMX")
+
+    answers = json.loads(tool_call.function.arguments)
+    responses: list[str] = []
+    for index, evaluation in enumerate(evaluations, start=1):
+        answer = answers.get(packed_answer_key(index))
+        if answer is None:
+            raise ValueError(f"No answer for evaluation {evaluation.id} from VMX")
+
+        match evaluation.evaluation_type:
+            case internal_db_models.EvaluationType.BOOLEAN:
+                responses.append(str(answer).lower())
+            case _:
+                responses.append(answer)
+
+    return responses
+
+
+def result_evaluation_ids(
+    result: CompletionBatchItemUpdateCallbackPayload,
+) -> list[UUID]:
+    metadata = result.payload.request.metadata
+    return [
+        UUID(evaluation_id)
+        for evaluation_id in metadata.get("evaluation_ids")
+        or [metadata["evaluation_id"]]
+    ]
+
+
+def parse_evaluation_answers(
+    evaluations: dict[UUID, internal_db_models.EvaluationRead],
+    result: CompletionBatchItemUpdateCallbackPayload,
+) -> list[EvaluationAnswer]:
+    """Parse the answers of a result, several for a packed request."""
+    metadata = result.payload.request.metadata
+    evaluation_ids = result_evaluation_ids(result)
+    for evaluation_id in evaluation_ids:
+        if evaluation_id not in evaluations:
+            raise ValueError(f"Evaluation {evaluation_id} not found")
+
+    if "evaluation_ids" in metadata:
+        responses = parse_packed_evaluation_responses(
+            [evaluations[evaluation_id] for evaluation_id in evaluation_ids], result
+        )
+    else:
+        responses = [parse_evaluation_response(evaluations[evaluation_ids[0]], result)]
+
+    return [
+        EvaluationAnswer(
+            evaluation_id=evaluation_id,
+            file_content_id=UUID(metadata["file_content_id"]),
+            response=response,
+        )
+        for evaluation_id, response in zip(evaluation_ids, responses, strict=True)
+    ]
+
+
+def merge_window_responses(
+    evaluation: internal_db_models.EvaluationRead, responses: list[str | None]
+) -> str | None:
+    """Answer of a page from the answers of its windows, in page order.
+
+    A boolean is true when any window is, an enum takes the most common answer
+    (the earliest window breaks ties) and texts are joined.
+    """
+    answered = [response for response in responses if response is not None]
+    if not answered:
+        return None
+
+    match evaluation.evaluation_type:
+        case internal_db_models.EvaluationType.BOOLEAN:
+            return "true" if "true" in answered else "false"
+        case internal_db_models.EvaluationType.ENUM_CHOICE:
+            return max(answered, key=answered.count)
+        case _:
+            return "\n\n".join(answered)
+
+
+def parse_window_answers(
+    evaluations: dict[UUID, internal_db_models.EvaluationRead],
+    results: list[CompletionBatchItemUpdateCallbackPayload],
+) -> list[EvaluationAnswer]:
+    """Parse the answers of the windows of a page, merged into one per evaluation.
+
+    A page that was not split has a single result.
+    """
+    expected = results[0].payload.request.metadata.get("page_windows") or 1
+    if len(results) != expected:
+        raise ValueError(
+            f"Expected {expected} page windows, got {len(results)} results"
+        )
+
+    window_answers = [
+        parse_evaluation_answers(evaluations, result)
+        for result in sorted(
+            results,
+            key=lambda result: result.payload.request.metadata.get("page_window", 0),
+        )
+    ]
+    return [
+        answer.model_copy(
+            update={
+                "response": merge_window_responses(
+                    evaluations[answer.evaluation_id],
+                    [answers[index].response for answers in window_answers],
+                )
+            }
+        )
+        for index, answer in enumerate(window_answers[0])
+    ]
+
+
+def prompt_token_usage(llm_response: dict) -> tuple[int, int]:
+    """Prompt tokens of a stored ``llm_response`` and how many were cached.
+
+    VM-X does not normalize cached tokens, they are read from the provider
+    usage in the raw response (OpenAI ``prompt_tokens_details.cached_tokens``
+    or Anthropic ``cache_read_input_tokens``).
+    """
+    usage = (llm_response.get("rawResponse") or {}).get("usage") or {}
+    cached_tokens = (usage.get("prompt_tokens_details") or {}).get(
+        "cached_tokens"
+    ) or usage.get("cache_read_input_tokens")
+    prompt_tokens = (llm_response.get("usage") or {}).get("prompt")
+
+    return int(prompt_tokens or 0), int(cached_tokens or 0)
+
+
+def file_evaluation_status(
+    result: CompletionBatchItemUpdateCallbackPayload,
+) -> internal_db_models.FileEvaluationStatus:
+    return (
+        internal_db_models.FileEvaluationStatus.COMPLETED
+        if result.payload.status == CompletionBatchRequestStatus.COMPLETED
+        else internal_db_models.FileEvaluationStatus.FAILED
+    )
+
+
+def evaluation_cache_entry(
+    result: CompletionBatchItemUpdateCallbackPayload,
+    response: str | None,
+) -> internal_db_models.EvaluationCacheCreate | None:
+    """Cache entry of a result, ``None`` if it failed or caching is disabled."""
+    request_hash = (result.payload.request.metadata or {}).get("request_hash")
+    if not request_hash or file_evaluation_status(result) != (
+        internal_db_models.FileEvaluationStatus.COMPLETED
+    ):
+        return None
+
+    return internal_db_models.EvaluationCacheCreate(
+        request_hash=request_hash,
+        response=response,
+        llm_response=MessageToDict(result.payload.response) or {},
+        total_tokens=result.payload.response.usage.total,
+    )
+
+
 class StoreEvaluationActivity:
     def __init__(
         self,
         file_repository: FileRepository,
         evaluation_repository: EvaluationRepository,
         file_evaluation_repository: FileEvaluationRepository,
+        evaluation_cache_repository: EvaluationCacheRepository,
     ):
         self._file_repository = file_repository
         self._evaluation_repository = evaluation_repository
         self._file_evaluation_repository = file_evaluation_repository
+        self._evaluation_cache_repository = evaluation_cache_repository
 
     async def run(
         self,
@@ -42,98 +267,41 @@ class StoreEvaluationActivity:
         if not evaluation:
             raise ValueError(f"Evaluation {evaluation_id} not found")
 
-        if not result.payload.response:
-            raise ValueError("No response from VMX")
-
-        response: str | None = None
-
-        match evaluation.evaluation_type:
-            case internal_db_models.EvaluationType.BOOLEAN:
-                if not result.payload.response.tool_calls:
-                    raise ValueError("No tool calls from VMX")
-
-                tool_call = result.payload.response.tool_calls[0]
-                if tool_call.function.name != "boolean_answer":
-                    raise ValueError("Invalid tool call from VMX")
-
-                boolean_answer = tool_call.function.arguments
-                if not boolean_answer:
-                    raise ValueError("No boolean answer from VMX")
-
-                boolean_answer = json.loads(boolean_answer)
-                response = str(boolean_answer["answer"]).lower()
-            case internal_db_models.EvaluationType.ENUM_CHOICE:
-                if not result.payload.response.tool_calls:
-                    raise ValueError("No tool calls from VMX")
-
-                tool_call = result.payload.response.tool_calls[0]
-                if tool_call.function.name != "enum_answer":
-                    raise ValueError("Invalid tool call from VMX")
-
-                enum_answer = tool_call.function.arguments
-                if not enum_answer:
-                    raise ValueError("No enum answer from VMX")
-
-                enum_answer = json.loads(enum_answer)
-                response = enum_answer["answer"]
-            case internal_db_models.EvaluationType.TEXT:
-                response = result.payload.response.message
-
-        existing_file_evaluation = (
-            await self._file_evaluation_repository.get_by_evaluation_id_and_content_id(
-                project_id=file.project_id,
-                evaluation_id=evaluation_id,
-                content_id=file_content_id,
-            )
-        )
-
-        status = (
-            internal_db_models.FileEvaluationStatus.COMPLETED
-            if result.payload.status == CompletionBatchRequestStatus.COMPLETED
-            else internal_db_models.FileEvaluationStatus.FAILED
-        )
+        response = parse_evaluation_response(evaluation, result)
 
         llm_request = result.payload.request.model_dump(mode="json")
         llm_response = MessageToDict(result.payload.response)
 
         if not llm_response or not llm_request:
             logger.warning(
-                "No LLM request or response for "
-                f"file evaluation {existing_file_evaluation.id}"
-            )
-
-        logger.info(f"LLM request: {type(llm_request)}")
-        logger.info(f"LLM response: {type(llm_response)}")
-
-        if existing_file_evaluation:
-            logger.info(f"Updating file evaluation {existing_file_evaluation.id}")
-            await self._file_evaluation_repository.update(
-                existing_file_evaluation.id,
-                {
-                    "response": response,
-                    "status": status,
-                    "error": result.payload.error,
-                    "llm_request": llm_request,
-                    "llm_response": llm_response,
-                },
-            )
-        else:
-            logger.info(
-                "Creating new file evaluation, "
+                "No LLM request or response for file evaluation, "
                 f"evaluation_id: {evaluation_id}, content_id: {file_content_id}"
             )
-            await self._file_evaluation_repository.add(
+
+        logger.info(
+            "Storing file evaluation, "
+            f"evaluation_id: {evaluation_id}, content_id: {file_content_id}"
+        )
+        await self._file_evaluation_repository.upsert_many_by_evaluation_id_and_content_id(  # noqa: E501
+            [
                 internal_db_models.FileEvaluationCreate(
                     id=uuid.uuid4(),
                     file_id=file.id,
                     evaluation_id=evaluation_id,
                     response=response,
                     content_id=file_content_id,
-                    status=status,
+                    status=file_evaluation_status(result),
                     error=result.payload.error,
                     llm_request=llm_request or {},
                     llm_response=llm_response or {},
                 )
+            ]
+        )
+
+        cache_entry = evaluation_cache_entry(result, response)
+        if cache_entry:
+            await self._evaluation_cache_repository.upsert_many_by_request_hash(
+                [cache_entry]
             )
 
         return response
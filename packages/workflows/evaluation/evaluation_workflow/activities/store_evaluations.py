@@ -0,0 +1,168 @@
+import logging
+import uuid
+from uuid import UUID
+
+import internal_db_models
+from google.protobuf.json_format import MessageToDict
+from internal_db_repositories.evaluation import EvaluationRepository
+from internal_db_repositories.evaluation_cache import EvaluationCacheRepository
+from internal_db_repositories.file import FileRepository
+from internal_db_repositories.file_evaluation import FileEvaluationRepository
+from pydantic import BaseModel
+from vmxai.types import CompletionBatchItemUpdateCallbackPayload
+
+from evaluation_workflow.activities.start_evaluations import EvaluationAnswer
+from evaluation_workflow.activities.store_evaluation import (
+    evaluation_cache_entry,
+    file_evaluation_status,
+    parse_window_answers,
+    prompt_token_usage,
+    result_evaluation_ids,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TierUsage(BaseModel):
+    requests: int = 0
+    total_tokens: int = 0
+    # Sum of the VM-X reported durations, for the responses that have one.
+    duration: float = 0.0
+    timed_requests: int = 0
+
+    def add(self, llm_response: dict):
+        self.requests += 1
+        self.total_tokens += int((llm_response.get("usage") or {}).get("total") or 0)
+        duration = (llm_response.get("metrics") or {}).get("duration")
+        if duration is not None:
+            self.duration += float(duration)
+            self.timed_requests += 1
+
+    @property
+    def average_duration(self) -> float | None:
+        return self.duration / self.timed_requests if self.timed_requests else None
+
+
+class StoreEvaluationsActivity:
+    def __init__(
+        self,
+        file_repository: FileRepository,
+        evaluation_repository: EvaluationRepository,
+        file_evaluation_repository: FileEvaluationRepository,
+        evaluation_cache_repository: EvaluationCacheRepository,
+    ):
+        self._file_repository = file_repository
+        self._evaluation_repository = evaluation_repository
+        self._file_evaluation_repository = file_evaluation_repository
+        self._evaluation_cache_repository = evaluation_cache_repository
+
+    async def run(
+        self,
+        file_id: UUID,
+        results: list[CompletionBatchItemUpdateCallbackPayload],
+    ) -> list[list[EvaluationAnswer]]:
+        """Store a batch of VM-X results, returning the parsed answers of each."""
+        file = await self._file_repository.get(file_id)
+        if not file:
+            raise ValueError(f"File {file_id} not found")
+
+        evaluations = {
+            evaluation.id: evaluation
+            for evaluation in await self._evaluation_repository.get_many(
+                list(
+                    {
+                        evaluation_id
+                        for result in results
+                        for evaluation_id in result_evaluation_ids(result)
+                    }
+                )
+            )
+        }
+
+        answers: list[list[EvaluationAnswer]] = []
+        file_evaluations: dict[
+            tuple[UUID, UUID], internal_db_models.FileEvaluationCreate
+        ] = {}
+        cache_entries: list[internal_db_models.EvaluationCacheCreate] = []
+        prompt_tokens = cached_tokens = 0
+        tier_usage: dict[str, TierUsage] = {}
+        # Windows of a split page are stored together, answered by the last.
+        window_results: dict[str, list[CompletionBatchItemUpdateCallbackPayload]] = {}
+        for result in results:
+            window_group = result.payload.request.metadata.get("window_group")
+            if window_group:
+                window_results.setdefault(window_group, []).append(result)
+
+        for result in results:
+            llm_response = MessageToDict(result.payload.response) or {}
+            result_prompt_tokens, result_cached_tokens = prompt_token_usage(
+                llm_response
+            )
+            prompt_tokens += result_prompt_tokens
+            cached_tokens += result_cached_tokens
+            tier = result.payload.request.metadata.get("model_tier") or "default"
+            tier_usage.setdefault(tier, TierUsage()).add(llm_response)
+
+            window_group = result.payload.request.metadata.get("window_group")
+            if window_group and result is not window_results[window_group][-1]:
+                answers.append([])
+                continue
+
+            group = window_results[window_group] if window_group else [result]
+            result_answers = parse_window_answers(evaluations, group)
+            answers.append(result_answers)
+
+            # Packed and windowed requests carry no request hash and are never
+            # cached.
+            cache_entry = evaluation_cache_entry(result, result_answers[0].response)
+            if cache_entry:
+                cache_entries.append(cache_entry)
+
+            status = (
+                internal_db_models.FileEvaluationStatus.FAILED
+                if internal_db_models.FileEvaluationStatus.FAILED
+                in {file_evaluation_status(window) for window in group}
+                else internal_db_models.FileEvaluationStatus.COMPLETED
+            )
+            error = next(
+                (window.payload.error for window in group if window.payload.error),
+                None,
+            )
+            # A split page keeps the request and response of its first window.
+            llm_request = group[0].payload.request.model_dump(mode="json") or {}
+            llm_response = MessageToDict(group[0].payload.response) or {}
+            for answer in result_answers:
+                # A redelivered result replaces the previous one within the batch.
+                file_evaluations[(answer.evaluation_id, answer.file_content_id)] = (
+                    internal_db_models.FileEvaluationCreate(
+                        id=uuid.uuid4(),
+                        file_id=file.id,
+                        evaluation_id=answer.evaluation_id,
+                        response=answer.response,
+                        content_id=answer.file_content_id,
+                        status=status,
+                        error=error,
+                        llm_request=llm_request,
+                        llm_response=llm_response,
+                    )
+                )
+
+        logger.info(
+            f"Storing {len(file_evaluations)} file evaluations for file {file_id}, "
+            f"prompt tokens: {prompt_tokens}, cached prompt tokens: {cached_tokens}"
+        )
+        for tier, usage in tier_usage.items():
+            logger.info(
+                f"Tier {tier}: {usage.requests} responses, "
+                f"{usage.total_tokens} tokens, average duration "
+                f"{usage.average_duration}"
+            )
+
+        await self._file_evaluation_repository.upsert_many_by_evaluation_id_and_content_id(  # noqa: E501
+            list(file_evaluations.values())
+        )
+        await self._evaluation_cache_repository.upsert_many_by_request_hash(
+            cache_entries
+        )
+
+        return answers
@@ -1,22 +1,55 @@
 from workflow_shared_actitivies.activity_meta import TemporalActivityMeta
 
+from evaluation_workflow.activities.get_evaluation_tree import (
+    GetEvaluationTreeActivity,
+)
+from evaluation_workflow.activities.get_file_page_count import (
+    GetFilePageCountActivity,
+)
 from evaluation_workflow.activities.get_files_to_evaluate import (
-    GetFilesToEvaluateActivity,
+    GetFilesToEvaluatePageActivity,
+)
+from evaluation_workflow.activities.get_workflow_options import (
+    GetEvaluationWorkflowOptionsActivity,
 )
 from evaluation_workflow.activities.start_evaluations import StartEvaluationsActivity
 from evaluation_workflow.activities.store_evaluation import StoreEvaluationActivity
+from evaluation_workflow.activities.store_evaluations import StoreEvaluationsActivity
+
+
+class GetFilesToEvaluatePageActivityTemporal(
+    GetFilesToEvaluatePageActivity, metaclass=TemporalActivityMeta, task_queue="db"
+): ...
 
 
-class GetFilesToEvaluateActivityTemporal(
-    GetFilesToEvaluateActivity, metaclass=TemporalActivityMeta
+class GetEvaluationTreeActivityTemporal(
+    GetEvaluationTreeActivity, metaclass=TemporalActivityMeta, task_queue="db"
+): ...
+
+
+class GetFilePageCountActivityTemporal(
+    GetFilePageCountActivity, metaclass=TemporalActivityMeta, task_queue="db"
+): ...
+
+
+class GetEvaluationWorkflowOptionsActivityTemporal(
+    GetEvaluationWorkflowOptionsActivity,
+    metaclass=TemporalActivityMeta,
+    task_queue="default",
+    local=True,
 ): ...
 
 
 class StartEvaluationsActivityTemporal(
-    StartEvaluationsActivity, metaclass=TemporalActivityMeta
+    StartEvaluationsActivity, metaclass=TemporalActivityMeta, task_queue="llm"
 ): ...
 
 
 class StoreEvaluationActivityTemporal(
-    StoreEvaluationActivity, metaclass=TemporalActivityMeta
+    StoreEvaluationActivity, metaclass=TemporalActivityMeta, task_queue="db"
+): ...
+
+
+class StoreEvaluationsActivityTemporal(
+    StoreEvaluationsActivity, metaclass=TemporalActivityMeta, task_queue="db"
 ): ...
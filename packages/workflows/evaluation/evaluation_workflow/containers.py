@@ -3,6 +3,9 @@ from internal_aws_shared.containers import AWSContainer
 from internal_aws_sqs_consumer.settings import SQSConsumerSettings
 from internal_temporal_utils.containers import TemporalContainer
 
+from .settings import EvaluationWorkflowSettings
+
 
 class Container(TemporalContainer, AWSContainer):
     sqs_consumer_settings = providers.Singleton(SQSConsumerSettings)
+    evaluation_workflow_settings = providers.Singleton(EvaluationWorkflowSettings)
@@ -20,6 +20,8 @@ class LambdaContainer(RepositoriesContainer, ServicesContainer, VMXContainer):
         evaluation_service=ServicesContainer.evaluation_service,
         file_repository=RepositoriesContainer.file_repository,
         file_content_repository=RepositoriesContainer.file_content_repository,
+        file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+        evaluation_cache_repository=RepositoriesContainer.evaluation_cache_repository,
         vmx_client_resource=VMXContainer.vmx_client,
         ingestion_callback_url=settings.provided.ingestion_callback.url,
     )
@@ -29,6 +31,7 @@ class LambdaContainer(RepositoriesContainer, ServicesContainer, VMXContainer):
         file_repository=RepositoriesContainer.file_repository,
         evaluation_repository=RepositoriesContainer.evaluation_repository,
         file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+        evaluation_cache_repository=RepositoriesContainer.evaluation_cache_repository,
     )
 
     get_files_to_evaluate_activity = providers.Singleton(
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import logging
 import uuid
@@ -6,27 +5,20 @@ from typing import Any
 
 import boto3
 from internal_utils import parse_args
+from workflow_shared_actitivies import lambda_runtime
 
 from evaluation_workflow.activities.start_evaluations import StartEvaluationsActivity
 from evaluation_workflow.lambda_functions.containers import LambdaContainer
 
 logger = logging.getLogger(__name__)
 
-_container: LambdaContainer | None = None
+warm_container = lambda_runtime.WarmContainer(LambdaContainer)
 
 s3 = boto3.client("s3")
 
 
-async def get_container():
-    global _container
-    if _container is None:
-        _container = LambdaContainer()
-        await _container.init_resources()
-    return _container
-
-
 async def main(event: dict):
-    container = await get_container()
+    container = await warm_container.get()
 
     logger.info(f"Initializing start evaluations activity for file {event['file_id']}")
     activity: StartEvaluationsActivity = await container.start_evaluations_activity()
@@ -63,4 +55,4 @@ async def main(event: dict):
 
 def handler(event: dict, context: Any):
     logger.info(f"Event: {event}")
-    return asyncio.run(main(event))
+    return lambda_runtime.run(main(event))
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 import urllib.parse
 from typing import Any
@@ -9,26 +8,19 @@ from vmxai.types import (
     BatchRequestCallbackOptions,
     CompletionRequest,
 )
+from workflow_shared_actitivies import lambda_runtime
 
 from evaluation_workflow.lambda_functions.containers import LambdaContainer
 
 logger = logging.getLogger(__name__)
 
-_container: LambdaContainer | None = None
+warm_container = lambda_runtime.WarmContainer(LambdaContainer)
 
 s3 = boto3.client("s3")
 
 
-async def get_container():
-    global _container
-    if _container is None:
-        _container = LambdaContainer()
-        await _container.init_resources()
-    return _container
-
-
 async def main(event: dict):
-    container = await get_container()
+    container = await warm_container.get()
 
     logger.info("Initializing VM-X client")
     vmx_client: VMXClientResource = await container.vmx_client()
@@ -56,4 +48,4 @@ async def main(event: dict):
 
 def handler(event: dict, context: Any):
     logger.info(f"Event: {event}")
-    return asyncio.run(main(event))
+    return lambda_runtime.run(main(event))
@@ -0,0 +1,70 @@
+from os import environ
+from typing import Literal
+
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+env_file = f".env.{environ.get('ENV', 'local')}"
+
+# instructions_first: evaluation system prompt, page, question.
+# page_first: page, evaluation system prompt, question. Requests of a page then
+# share their longest part as a prefix, which providers can serve from their
+# prompt cache.
+MessageLayout = Literal["instructions_first", "page_first"]
+
+
+class EvaluationWorkflowOptions(BaseModel):
+    # Task queue of each activity kind. Workflows can't read settings in their
+    # sandbox, the names are resolved by whoever starts them.
+    task_queues: dict[str, str] = {}
+    # Activities in flight per workflow run.
+    max_concurrent_activities: int = 20
+    # VM-X results are buffered and stored in bulk once this many are pending,
+    # or after store_flush_interval seconds. Every result carries its LLM
+    # request, keep batches well below Temporal's 2MB payload limit.
+    store_batch_size: int = 50
+    store_flush_interval: float = 2.0
+    # Files with more pages are evaluated in child workflows of this many pages,
+    # each with its own batches and signals, to keep histories bounded.
+    pages_per_child_workflow: int = 100
+    # UpdateEvaluationWorkflow evaluates each file in a child workflow.
+    max_concurrent_child_workflows: int = 20
+    max_child_workflows_per_run: int = 500
+    # Ask up to pack_size boolean and enum evaluations of a page in a single
+    # request, so the page is sent once instead of once per evaluation.
+    pack_evaluations: bool = False
+    pack_size: int = 10
+    message_layout: MessageLayout = "instructions_first"
+    # Levels with at most direct_max_requests requests are completed right away
+    # by StartEvaluationsActivity, up to direct_max_concurrency at a time,
+    # instead of going through a VM-X batch and its callbacks. 0 disables it.
+    direct_max_requests: int = 10
+    direct_max_concurrency: int = 5
+    # Requests are token-counted when built. Pages that would take a request
+    # over the budget of its resource first lose their metadata, then are
+    # split into windows that fit. request_token_reserve is kept for the answer.
+    max_request_tokens: int = 100_000
+    resource_max_request_tokens: dict[str, int] = {}
+    request_token_reserve: int = 2_000
+    # Tier of evaluations without a model_tier, by evaluation type. Tiers are
+    # mapped to VM-X resources by VMX_TIER_RESOURCE_IDS, unmapped tiers use the
+    # default resource.
+    evaluation_type_tiers: dict[str, str] = {
+        "boolean": "fast",
+        "enum_choice": "fast",
+    }
+
+    def request_token_budget(self, resource: str) -> int:
+        return (
+            self.resource_max_request_tokens.get(resource, self.max_request_tokens)
+            - self.request_token_reserve
+        )
+
+
+class EvaluationWorkflowSettings(EvaluationWorkflowOptions, BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="EVALUATION_WORKFLOW_",
+    )
@@ -0,0 +1,53 @@
+import functools
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "o200k_base"
+# Rough ratio used when no tokenizer is available, errs on the high side for
+# English prose.
+CHARS_PER_TOKEN = 3.5
+
+
+@functools.cache
+def _encoding():
+    """Load the tokenizer once per process, None when it is not available.
+
+    tiktoken is only installed with the ingestion dependencies and downloads
+    its encodings on first use, so both may be missing where evaluations run.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating tokens from length: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    # Requests of a page repeat the same page text, it is only counted once.
+    encoding = _encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def split_tokens(text: str, max_tokens: int) -> list[str]:
+    """Split ``text`` into consecutive parts of at most ``max_tokens`` tokens."""
+    if max_tokens <= 0:
+        raise ValueError(f"Can't split text into parts of {max_tokens} tokens")
+
+    encoding = _encoding()
+    if encoding is None:
+        size = max(int(max_tokens * CHARS_PER_TOKEN), 1)
+        return [text[start : start + size] for start in range(0, len(text), size)]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    return [
+        encoding.decode(tokens[start : start + max_tokens])
+        for start in range(0, len(tokens), max_tokens)
+    ]
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import logging
 from datetime import timedelta
 from uuid import UUID
@@ -7,13 +8,19 @@ import internal_db_models
 from pydantic import BaseModel
 from temporalio import workflow
 from temporalio.common import RetryPolicy
-from temporalio.exceptions import ApplicationError
+from temporalio.exceptions import ApplicationError, ChildWorkflowError
 
 with workflow.unsafe.imports_passed_through():
     from vmxai.types import CompletionBatchItemUpdateCallbackPayload
+    from workflow_shared_actitivies import map_bounded, page_ranges
     from workflow_shared_actitivies import temporal as shared_temporal
+    from workflow_shared_actitivies.execution import execute_activity
 
     from .activities import temporal
+    from .activities.get_evaluation_tree import EvaluationTree
+    from .activities.get_files_to_evaluate import FilesToEvaluatePage
+    from .activities.start_evaluations import EvaluationBranch
+    from .settings import EvaluationWorkflowOptions
 
 
 logger = logging.getLogger(__name__)
@@ -22,206 +29,417 @@ DEFAULT_RETRY_POLICY = RetryPolicy(maximum_attempts=3)
 DEFAULT_TIMEOUT = timedelta(seconds=300)
 
 
-@workflow.defn(name="EvaluationWorkflow")
-class EvaluationWorkflow:
-    @workflow.run
-    async def run(self, file_id: UUID) -> dict:
-        try:
-            self.evaluations_map: dict[str, UUID] = {}
-            await self.process_evaluations(file_id)
+async def resolve_options(
+    options: EvaluationWorkflowOptions | None,
+) -> EvaluationWorkflowOptions:
+    """Complete the options left unset by whoever started the workflow.
 
-            await workflow.execute_activity(
-                shared_temporal.UpdateFileStatusActivityTemporal.run,
-                args=[file_id, internal_db_models.FileStatus.COMPLETED],
+    Starters that pass a partial payload, such as the API which only sets the
+    task queues, get the worker's ``EvaluationWorkflowSettings`` for every
+    other option, read by a local activity outside the sandbox.
+    """
+    if options and options.model_fields_set >= set(
+        EvaluationWorkflowOptions.model_fields
+    ):
+        return options
+
+    worker_options = await execute_activity(
+        temporal.GetEvaluationWorkflowOptionsActivityTemporal,
+        start_to_close_timeout=DEFAULT_TIMEOUT,
+        retry_policy=DEFAULT_RETRY_POLICY,
+    )
+    return worker_options.model_copy(
+        update=options.model_dump(exclude_unset=True) if options else {}
+    )
+
+
+class EvaluationTreeWorkflow:
+    """Walks the evaluation tree of a file breadth-first.
+
+    Every branch of a level (evaluation, page and answer) is submitted in a
+    single VM-X batch, so the number of batches is bounded by the tree depth.
+    """
+
+    def __init__(self):
+        self._set_options(EvaluationWorkflowOptions())
+        self._file_id: UUID | None = None
+        self._evaluation_tree: EvaluationTree | None = None
+        self._level_results: dict[str, list[tuple[UUID, UUID, str]]] = {}
+        self._received_items: set[str] = set()
+        self._pending_results: list[CompletionBatchItemUpdateCallbackPayload] = []
+        # Windows of a split page, held until every window is received.
+        self._window_results: dict[
+            str, list[CompletionBatchItemUpdateCallbackPayload]
+        ] = {}
+
+    def _set_options(self, options: EvaluationWorkflowOptions):
+        self._options = options
+        self._activity_semaphore = asyncio.Semaphore(options.max_concurrent_activities)
+
+    @workflow.signal
+    def evaluate_item(self, result: CompletionBatchItemUpdateCallbackPayload):
+        # Callbacks may be delivered more than once.
+        if result.payload.item_id in self._received_items:
+            return
+        self._received_items.add(result.payload.item_id)
+
+        metadata = result.payload.request.metadata or {}
+        window_group = metadata.get("window_group")
+        if not window_group:
+            self._pending_results.append(result)
+            return
+
+        windows = self._window_results.setdefault(window_group, [])
+        windows.append(result)
+        if len(windows) == metadata["page_windows"]:
+            self._pending_results.extend(self._window_results.pop(window_group))
+
+    @workflow.signal
+    def evaluate_items(self, results: list[CompletionBatchItemUpdateCallbackPayload]):
+        # Callbacks of a workflow are batched by the API dispatcher.
+        for result in results:
+            self.evaluate_item(result)
+
+    async def process_evaluations(
+        self, file_id: UUID, branches: list[EvaluationBranch]
+    ):
+        # All files of a run belong to the same project, the tree is only
+        # loaded once.
+        if not self._evaluation_tree:
+            self._evaluation_tree = await execute_activity(
+                temporal.GetEvaluationTreeActivityTemporal,
+                args=[file_id],
                 start_to_close_timeout=DEFAULT_TIMEOUT,
                 retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=self._options.task_queues,
             )
 
-            return file_id
-        except Exception as e:
-            error_msg = f"Error in ingestion workflow: {e}"
-            workflow.logger.error(error_msg)
-            await workflow.execute_activity(
-                shared_temporal.UpdateFileStatusActivityTemporal.run,
-                args=[file_id, internal_db_models.FileStatus.FAILED],
+        evaluated: set[tuple[UUID, UUID, str]] = set()
+        level = 0
+
+        while branches:
+            logger.info(
+                f"Processing evaluations for file {file_id}, "
+                f"level: {level}, branches: {len(branches)}"
+            )
+            results = await self._evaluate_level(file_id, branches)
+
+            branches = []
+            for result in results:
+                evaluation_id, file_content_id, response_value = result
+                # Leaf answers have no child evaluations, skip the round-trip.
+                if result in evaluated or not self._evaluation_tree.has_children(
+                    evaluation_id, response_value
+                ):
+                    continue
+                evaluated.add(result)
+
+                branches.append(
+                    EvaluationBranch(
+                        parent_evaluation_id=evaluation_id,
+                        parent_evaluation_option=response_value,
+                        parent_file_content_id=file_content_id,
+                    )
+                )
+            level += 1
+
+    async def _evaluate_level(
+        self, file_id: UUID, branches: list[EvaluationBranch]
+    ) -> list[tuple[UUID, UUID, str]]:
+        self._file_id = file_id
+        self._level_results = {}
+
+        evaluation_output = await execute_activity(
+            temporal.StartEvaluationsActivityTemporal,
+            args=[file_id, branches, self._options],
+            start_to_close_timeout=DEFAULT_TIMEOUT,
+            retry_policy=DEFAULT_RETRY_POLICY,
+            task_queues=self._options.task_queues,
+        )
+
+        # Cached answers are stored by the activity and skip the batch.
+        results = [
+            (result.evaluation_id, result.file_content_id, result.response)
+            for result in evaluation_output.cached_results
+        ]
+        if evaluation_output.cache_hits:
+            workflow.logger.info(
+                f"Evaluation cache hits for file {file_id}: "
+                f"{evaluation_output.cache_hits}, "
+                f"tokens saved: {evaluation_output.cache_tokens_saved}"
+            )
+
+        # Direct results are stored like callbacks, without waiting for signals.
+        for result in evaluation_output.direct_results:
+            self.evaluate_item(result)
+
+        batch_item_ids = [
+            str(item_id) for item_id in evaluation_output.batch_item_ids or []
+        ] + [result.payload.item_id for result in evaluation_output.direct_results]
+        if not batch_item_ids:
+            return results
+
+        await self._store_results(batch_item_ids)
+
+        return results + [
+            result
+            for item_id in batch_item_ids
+            for result in self._level_results[item_id]
+        ]
+
+    async def _store_results(self, batch_item_ids: list[str]):
+        """Store the level results in bulk, flushing by size or time."""
+
+        def all_received() -> bool:
+            return all(item_id in self._received_items for item_id in batch_item_ids)
+
+        flushes: list[asyncio.Task] = []
+        while True:
+            # No timer while nothing is pending, a long batch would otherwise
+            # add a timer to the history every flush interval.
+            await workflow.wait_condition(
+                lambda: bool(self._pending_results) or all_received()
+            )
+            with contextlib.suppress(asyncio.TimeoutError):
+                await workflow.wait_condition(
+                    lambda: len(self._pending_results) >= self._options.store_batch_size
+                    or all_received(),
+                    timeout=timedelta(seconds=self._options.store_flush_interval),
+                )
+
+            done = all_received()
+            while self._pending_results:
+                flushes.append(
+                    asyncio.create_task(self._flush_results(self._take_results()))
+                )
+
+            if done:
+                break
+
+        await asyncio.gather(*flushes)
+
+    def _take_results(self) -> list[CompletionBatchItemUpdateCallbackPayload]:
+        """Take the next store batch, never splitting the windows of a page."""
+        size = self._options.store_batch_size
+
+        def window_group(index: int) -> str | None:
+            metadata = self._pending_results[index].payload.request.metadata or {}
+            return metadata.get("window_group")
+
+        while (
+            size < len(self._pending_results)
+            and window_group(size)
+            and window_group(size) == window_group(size - 1)
+        ):
+            size += 1
+
+        results = self._pending_results[:size]
+        self._pending_results = self._pending_results[size:]
+        return results
+
+    async def _flush_results(
+        self, results: list[CompletionBatchItemUpdateCallbackPayload]
+    ):
+        async with self._activity_semaphore:
+            answers = await execute_activity(
+                temporal.StoreEvaluationsActivityTemporal,
+                args=[self._file_id, results],
                 start_to_close_timeout=DEFAULT_TIMEOUT,
                 retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=self._options.task_queues,
             )
 
-            raise ApplicationError(error_msg) from e
+        # A packed request answers several evaluations of the page.
+        for result, result_answers in zip(results, answers, strict=True):
+            self._level_results[result.payload.item_id] = [
+                (answer.evaluation_id, answer.file_content_id, answer.response)
+                for answer in result_answers
+            ]
 
-    async def process_evaluations(
+
+@workflow.defn(name="EvaluationPageRangeWorkflow")
+class EvaluationPageRangeWorkflow(EvaluationTreeWorkflow):
+    """Evaluates a range of pages of a file.
+
+    Batches are submitted by this workflow, so their callbacks and signals are
+    routed to it rather than to the parent.
+    """
+
+    @workflow.run
+    async def run(
         self,
         file_id: UUID,
-        parent_evaluation_id: UUID | None = None,
-        parent_evaluation_option: str | None = None,
-        parent_file_content_id: UUID | None = None,
-    ):
-        logger.info(
-            f"Processing evaluations for file {file_id}, "
-            f"parent_evaluation_id: {parent_evaluation_id}, "
-            f"parent_evaluation_option: {parent_evaluation_option}, "
-            f"parent_file_content_id: {parent_file_content_id}"
-        )
-        evaluations_results: list[tuple[UUID, UUID, str]] = []
-        evaluation_output = await workflow.execute_activity(
-            temporal.StartEvaluationsActivityTemporal.run,
-            args=[
-                file_id,
-                None,
-                parent_evaluation_id,
-                parent_evaluation_option,
-                parent_file_content_id,
+        from_page: int,
+        to_page: int,
+        options: EvaluationWorkflowOptions,
+        evaluation_id: UUID | None = None,
+    ) -> None:
+        self._set_options(options)
+        await self.process_evaluations(
+            file_id,
+            [
+                EvaluationBranch(
+                    evaluation_id=evaluation_id, from_page=from_page, to_page=to_page
+                )
             ],
-            start_to_close_timeout=DEFAULT_TIMEOUT,
-            retry_policy=DEFAULT_RETRY_POLICY,
         )
 
-        if not evaluation_output.batch_item_ids:
-            return
 
-        @workflow.signal
-        async def evaluate_item(result: CompletionBatchItemUpdateCallbackPayload):
-            evaluation_id = UUID(result.payload.request.metadata["evaluation_id"])
-            file_content_id = UUID(result.payload.request.metadata["file_content_id"])
+@workflow.defn(name="EvaluationWorkflow")
+class EvaluationWorkflow(EvaluationTreeWorkflow):
+    @workflow.run
+    async def run(
+        self,
+        file_id: UUID,
+        options: EvaluationWorkflowOptions | None = None,
+        evaluation_id: UUID | None = None,
+    ) -> dict:
+        """Evaluate a file, starting from a single evaluation if given."""
+        options = await resolve_options(options)
+        self._set_options(options)
 
-            response_value = await workflow.execute_activity(
-                temporal.StoreEvaluationActivityTemporal.run,
-                args=[file_id, evaluation_id, file_content_id, result],
+        try:
+            page_count = await execute_activity(
+                temporal.GetFilePageCountActivityTemporal,
+                args=[file_id],
                 start_to_close_timeout=DEFAULT_TIMEOUT,
                 retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=options.task_queues,
             )
 
-            evaluations_results.append((evaluation_id, file_content_id, response_value))
-
-        workflow.set_signal_handler("evaluate_item", evaluate_item)
-
-        # # Wait for all evaluations
-        await workflow.wait_condition(
-            lambda: len(evaluations_results) == len(evaluation_output.batch_item_ids)
-        )
+            if page_count <= options.pages_per_child_workflow:
+                await self.process_evaluations(
+                    file_id, [EvaluationBranch(evaluation_id=evaluation_id)]
+                )
+            else:
+                # Large files are sharded by page range, this workflow only
+                # waits for the shards to complete.
+                async def evaluate_pages(page_range: tuple[int, int]):
+                    from_page, to_page = page_range
+                    await workflow.execute_child_workflow(
+                        EvaluationPageRangeWorkflow.run,
+                        args=[file_id, from_page, to_page, options, evaluation_id],
+                        id=f"{workflow.info().workflow_id}-pages-{from_page}-{to_page}",
+                    )
 
-        for evaluation_id, file_content_id, response_value in evaluations_results:
-            evaluation_key = f"{evaluation_id}-{file_content_id}-{response_value}"
+                await map_bounded(
+                    evaluate_pages,
+                    page_ranges(1, page_count, options.pages_per_child_workflow),
+                    options.max_concurrent_child_workflows,
+                )
 
-            if evaluation_key in self.evaluations_map:
-                continue
+            await execute_activity(
+                shared_temporal.UpdateFileStatusActivityTemporal,
+                args=[file_id, internal_db_models.FileStatus.COMPLETED],
+                start_to_close_timeout=DEFAULT_TIMEOUT,
+                retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=options.task_queues,
+            )
 
-            await self.process_evaluations(
-                file_id,
-                evaluation_id,
-                response_value,
-                file_content_id,
+            return file_id
+        except Exception as e:
+            error_msg = f"Error in ingestion workflow: {e}"
+            workflow.logger.error(error_msg)
+            await execute_activity(
+                shared_temporal.UpdateFileStatusActivityTemporal,
+                args=[file_id, internal_db_models.FileStatus.FAILED],
+                start_to_close_timeout=DEFAULT_TIMEOUT,
+                retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=options.task_queues,
             )
-            self.evaluations_map[evaluation_key] = evaluation_id
+
+            raise ApplicationError(error_msg) from e
 
 
 class UpdateEvaluationWorkflowPayload(BaseModel):
     evaluation: internal_db_models.EvaluationRead
     old_evaluation: internal_db_models.EvaluationRead | None = None
+    options: EvaluationWorkflowOptions = EvaluationWorkflowOptions()
+
+
+class UpdateEvaluationWorkflowState(BaseModel):
+    cursor: UUID | None = None
+    files_processed: int = 0
+    files_failed: int = 0
+
+
+class UpdateEvaluationProgress(BaseModel):
+    files_processed: int = 0
+    files_failed: int = 0
 
 
 @workflow.defn(name="UpdateEvaluationWorkflow")
 class UpdateEvaluationWorkflow:
+    def __init__(self):
+        self._progress = UpdateEvaluationProgress()
+
+    @workflow.query
+    def progress(self) -> UpdateEvaluationProgress:
+        return self._progress
+
     @workflow.run
     async def run(
         self,
         payload: UpdateEvaluationWorkflowPayload,
+        state: UpdateEvaluationWorkflowState | None = None,
     ):
+        options = await resolve_options(payload.options)
+        # Continued runs and child workflows get the complete options.
+        payload = payload.model_copy(update={"options": options})
+        state = state or UpdateEvaluationWorkflowState()
+
         try:
-            files_to_evaluate = await workflow.execute_activity(
-                temporal.GetFilesToEvaluateActivityTemporal.run,
-                args=[payload.evaluation, payload.old_evaluation],
+            self._update_progress(state)
+
+            # Each run only fetches and evaluates one page of file ids, the
+            # rest continues as new from the page cursor to keep the history
+            # and payloads bounded.
+            page: FilesToEvaluatePage = await execute_activity(
+                temporal.GetFilesToEvaluatePageActivityTemporal,
+                args=[
+                    payload.evaluation,
+                    payload.old_evaluation,
+                    state.cursor,
+                    options.max_child_workflows_per_run,
+                ],
                 start_to_close_timeout=DEFAULT_TIMEOUT,
                 retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=options.task_queues,
             )
 
-            self.evaluations_map: dict[str, UUID] = {}
-
-            for file_id in files_to_evaluate:
-                await self.process_evaluations(file_id, payload.evaluation.id)
-
-            await asyncio.gather(
-                *[
-                    workflow.execute_activity(
-                        shared_temporal.UpdateFileStatusActivityTemporal.run,
-                        args=[
-                            file_id,
-                            internal_db_models.FileStatus.COMPLETED,
-                        ],
-                        start_to_close_timeout=DEFAULT_TIMEOUT,
-                        retry_policy=DEFAULT_RETRY_POLICY,
+            async def evaluate_file(file_id: UUID):
+                try:
+                    await workflow.execute_child_workflow(
+                        EvaluationWorkflow.run,
+                        args=[file_id, options, payload.evaluation.id],
+                        id=f"{workflow.info().workflow_id}-file-{file_id}",
                     )
-                    for file_id in files_to_evaluate
-                ]
-            )
-        except Exception as e:
-            raise ApplicationError(f"Error in evaluation update workflow: {e}") from e
+                except ChildWorkflowError as e:
+                    # The child marks the file as failed, keep evaluating the
+                    # remaining files.
+                    workflow.logger.error(f"Error evaluating file {file_id}: {e}")
+                    state.files_failed += 1
 
-    async def process_evaluations(
-        self,
-        file_id: UUID,
-        evaluation_id: UUID,
-        parent_evaluation_id: UUID | None = None,
-        parent_evaluation_option: str | None = None,
-        parent_file_content_id: UUID | None = None,
-    ):
-        logger.info(
-            f"Processing evaluations for file {file_id}, "
-            f"evaluation_id: {evaluation_id}, "
-            f"parent_evaluation_id: {parent_evaluation_id}, "
-            f"parent_evaluation_option: {parent_evaluation_option}, "
-            f"parent_file_content_id: {parent_file_content_id}"
-        )
-        evaluations_results: list[tuple[UUID, UUID, str]] = []
-        evaluation_output = await workflow.execute_activity(
-            temporal.StartEvaluationsActivityTemporal.run,
-            args=[
-                file_id,
-                evaluation_id,
-                parent_evaluation_id,
-                parent_evaluation_option,
-                parent_file_content_id,
-            ],
-            start_to_close_timeout=DEFAULT_TIMEOUT,
-            retry_policy=DEFAULT_RETRY_POLICY,
-        )
-
-        if not evaluation_output.batch_item_ids:
-            return
+                state.files_processed += 1
+                self._update_progress(state)
 
-        @workflow.signal
-        async def evaluate_item(result: CompletionBatchItemUpdateCallbackPayload):
-            evaluation_id = UUID(result.payload.request.metadata["evaluation_id"])
-            file_content_id = UUID(result.payload.request.metadata["file_content_id"])
-
-            response_value = await workflow.execute_activity(
-                temporal.StoreEvaluationActivityTemporal.run,
-                args=[file_id, evaluation_id, file_content_id, result],
-                start_to_close_timeout=DEFAULT_TIMEOUT,
-                retry_policy=DEFAULT_RETRY_POLICY,
+            await map_bounded(
+                evaluate_file, page.file_ids, options.max_concurrent_child_workflows
             )
 
-            evaluations_results.append((evaluation_id, file_content_id, response_value))
+            if page.next_cursor:
+                state.cursor = page.next_cursor
+                workflow.continue_as_new(args=[payload, state])
 
-        workflow.set_signal_handler("evaluate_item", evaluate_item)
+            if state.files_failed:
+                raise ApplicationError(
+                    f"{state.files_failed} of {state.files_processed} files failed"
+                )
+        except Exception as e:
+            raise ApplicationError(f"Error in evaluation update workflow: {e}") from e
 
-        # # Wait for all evaluations
-        await workflow.wait_condition(
-            lambda: len(evaluations_results) == len(evaluation_output.batch_item_ids)
+    def _update_progress(self, state: UpdateEvaluationWorkflowState):
+        self._progress = UpdateEvaluationProgress(
+            files_processed=state.files_processed,
+            files_failed=state.files_failed,
         )
-
-        for evaluation_id, file_content_id, response_value in evaluations_results:
-            evaluation_key = f"{evaluation_id}-{file_content_id}-{response_value}"
-
-            if evaluation_key in self.evaluations_map:
-                continue
-
-            await self.process_evaluations(
-                file_id,
-                evaluation_id,
-                parent_evaluation_id,
-                response_value,
-                file_content_id,
-            )
-            self.evaluations_map[evaluation_key] = evaluation_id
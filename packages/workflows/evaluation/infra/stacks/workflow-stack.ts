@@ -192,6 +192,7 @@ export class EvaluationWorkflowStack extends BaseStack {
       VMX_SECRET_NAME: 'vmx-credentials',
       OPENAI_SECRET_NAME: 'openai-credentials',
       DB_SECRET_NAME: `${this.resourcePrefix}-app-database-secret-${props.stage}`,
+      DB_RUNTIME: 'lambda',
       ...(additionalFunctionProps.environment ?? {}),
     };
 
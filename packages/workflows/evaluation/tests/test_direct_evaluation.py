@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from vmxai.types import CompletionRequest, CompletionResponse
+
+from evaluation_workflow.activities.start_evaluations import StartEvaluationsActivity
+
+REQUESTS = 8
+MAX_CONCURRENCY = 3
+
+
+class BlockingVMXClient:
+    def __init__(self, failing_index: int | None = None):
+        self.failing_index = failing_index
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def completion(
+        self, *, request: CompletionRequest, stream: bool
+    ) -> CompletionResponse:
+        assert not stream
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+
+        if request.metadata["index"] == self.failing_index:
+            raise RuntimeError("Provider unavailable")
+        return CompletionResponse(message=str(request.metadata["index"]))
+
+
+class VMXClientResource:
+    def __init__(self, client: BlockingVMXClient):
+        self.client = client
+        self.resource_id = "resource"
+
+
+def _activity(client: BlockingVMXClient) -> StartEvaluationsActivity:
+    return StartEvaluationsActivity(
+        evaluation_service=None,
+        file_repository=None,
+        file_content_repository=None,
+        file_evaluation_repository=None,
+        evaluation_cache_repository=None,
+        vmx_client_resource=VMXClientResource(client),
+        ingestion_callback_url="",
+    )
+
+
+def _requests() -> list[CompletionRequest]:
+    return [
+        CompletionRequest(messages=[], resource="resource", metadata={"index": index})
+        for index in range(REQUESTS)
+    ]
+
+
+def test_direct_completions_are_bounded_and_shaped_as_callbacks():
+    client = BlockingVMXClient()
+    requests = _requests()
+
+    results = asyncio.run(_activity(client)._complete_direct(requests, MAX_CONCURRENCY))
+
+    assert client.max_in_flight == MAX_CONCURRENCY
+    assert [result.payload.request for result in results] == requests
+    assert len({result.payload.item_id for result in results}) == REQUESTS
+    assert all(result.payload.status == "COMPLETED" for result in results)
+    assert results[1].payload.response.message == "1"
+
+
+def test_failed_direct_completion_fails_the_activity():
+    # Raising lets Temporal retry the activity, a result without a response
+    # would fail every StoreEvaluationsActivity attempt instead.
+    activity = _activity(BlockingVMXClient(failing_index=0))
+
+    with pytest.raises(RuntimeError, match="Provider unavailable"):
+        asyncio.run(activity._complete_direct(_requests(), MAX_CONCURRENCY))
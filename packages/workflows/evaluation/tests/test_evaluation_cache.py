@@ -0,0 +1,26 @@
+from vmxai.types import CompletionRequest, RequestMessage
+
+from evaluation_workflow.activities.start_evaluations import evaluation_request_hash
+
+
+def _request(page: str, file_id: str) -> CompletionRequest:
+    return CompletionRequest(
+        messages=[
+            RequestMessage(role="system", content=f"Document Page: {page}"),
+            RequestMessage(role="user", content="Is it signed?"),
+        ],
+        resource="resource",
+        metadata={"file_id": file_id, "workflow_id": file_id},
+    )
+
+
+def test_request_hash_ignores_metadata():
+    assert evaluation_request_hash(_request("page", "a")) == evaluation_request_hash(
+        _request("page", "b")
+    )
+
+
+def test_request_hash_changes_with_page_content():
+    assert evaluation_request_hash(_request("page", "a")) != evaluation_request_hash(
+        _request("other page", "a")
+    )
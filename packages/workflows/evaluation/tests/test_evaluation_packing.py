@@ -0,0 +1,139 @@
+import json
+import uuid
+
+import internal_db_models
+import pytest
+from vmxai.types import (
+    CompletionBatchItemUpdateCallbackPayload,
+    CompletionRequest,
+    CompletionResponse,
+)
+
+from evaluation_workflow.activities.start_evaluations import (
+    PACKED_TOOL_NAME,
+    pack_evaluations,
+)
+from evaluation_workflow.activities.store_evaluation import (
+    parse_evaluation_answers,
+    parse_window_answers,
+)
+
+
+def _evaluation(
+    evaluation_type: internal_db_models.EvaluationType,
+    evaluation_options: list[str] | None = None,
+    system_prompt: str | None = None,
+) -> internal_db_models.EvaluationRead:
+    return internal_db_models.EvaluationRead(
+        id=uuid.uuid4(),
+        title="Evaluation",
+        description="Evaluation",
+        system_prompt=system_prompt,
+        prompt="Prompt",
+        project_id=uuid.uuid4(),
+        evaluation_type=evaluation_type,
+        evaluation_options=evaluation_options,
+        parent_evaluation_id=None,
+        parent_evaluation_option=None,
+        template_id=None,
+        category_id=uuid.uuid4(),
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+
+def test_pack_evaluations_groups_by_system_prompt():
+    booleans = [
+        _evaluation(internal_db_models.EvaluationType.BOOLEAN) for _ in range(3)
+    ]
+    enum = _evaluation(internal_db_models.EvaluationType.ENUM_CHOICE, ["a", "b"])
+    text = _evaluation(internal_db_models.EvaluationType.TEXT)
+    other_prompt = _evaluation(
+        internal_db_models.EvaluationType.BOOLEAN, system_prompt="Other"
+    )
+
+    packs, singles = pack_evaluations([*booleans, enum, text, other_prompt], 3)
+
+    assert packs == [booleans]
+    assert singles == [text, enum, other_prompt]
+    assert pack_evaluations([*booleans, enum], 1) == ([], [*booleans, enum])
+
+
+def _packed_result(
+    answers: dict, metadata: dict
+) -> CompletionBatchItemUpdateCallbackPayload:
+    response = CompletionResponse()
+    tool_call = response.tool_calls.add()
+    tool_call.function.name = PACKED_TOOL_NAME
+    tool_call.function.arguments = json.dumps(answers)
+    return CompletionBatchItemUpdateCallbackPayload.model_validate(
+        {
+            "event": "ITEM_UPDATE",
+            "payload": {
+                "createdAt": "",
+                "updatedAt": "",
+                "createdBy": "",
+                "updatedBy": "",
+                "workspaceEnvironmentItemId": "",
+                "timestamp": "",
+                "itemId": str(uuid.uuid4()),
+                "batchId": str(uuid.uuid4()),
+                "request": CompletionRequest(
+                    messages=[], resource="resource", metadata=metadata
+                ),
+                "response": response,
+                "status": "COMPLETED",
+            },
+        }
+    )
+
+
+def test_packed_answers_are_split_per_evaluation():
+    boolean = _evaluation(internal_db_models.EvaluationType.BOOLEAN)
+    enum = _evaluation(internal_db_models.EvaluationType.ENUM_CHOICE, ["a", "b"])
+    file_content_id = uuid.uuid4()
+    result = _packed_result(
+        {"answer_1": True, "answer_2": "b"},
+        {
+            "evaluation_ids": [str(boolean.id), str(enum.id)],
+            "file_content_id": str(file_content_id),
+        },
+    )
+
+    answers = parse_evaluation_answers({boolean.id: boolean, enum.id: enum}, result)
+
+    assert [(a.evaluation_id, a.file_content_id, a.response) for a in answers] == [
+        (boolean.id, file_content_id, "true"),
+        (enum.id, file_content_id, "b"),
+    ]
+
+
+def test_window_answers_are_merged_per_page():
+    boolean = _evaluation(internal_db_models.EvaluationType.BOOLEAN)
+    enum = _evaluation(internal_db_models.EvaluationType.ENUM_CHOICE, ["a", "b"])
+    evaluations = {boolean.id: boolean, enum.id: enum}
+    file_content_id = uuid.uuid4()
+    results = [
+        _packed_result(
+            {"answer_1": boolean_answer, "answer_2": enum_answer},
+            {
+                "evaluation_ids": [str(boolean.id), str(enum.id)],
+                "file_content_id": str(file_content_id),
+                "window_group": "group",
+                "page_window": index,
+                "page_windows": 3,
+            },
+        )
+        for index, (boolean_answer, enum_answer) in enumerate(
+            [(False, "a"), (True, "b"), (False, "b")]
+        )
+    ]
+
+    answers = parse_window_answers(evaluations, results[::-1])
+
+    assert [(a.evaluation_id, a.file_content_id, a.response) for a in answers] == [
+        (boolean.id, file_content_id, "true"),
+        (enum.id, file_content_id, "b"),
+    ]
+    with pytest.raises(ValueError):
+        parse_window_answers(evaluations, results[:2])
@@ -0,0 +1,43 @@
+import uuid
+
+import internal_db_models
+
+from evaluation_workflow.activities.start_evaluations import page_messages
+from evaluation_workflow.activities.store_evaluation import prompt_token_usage
+
+FILE_CONTENT = internal_db_models.FileContentRead(
+    id=uuid.uuid4(),
+    file_id=uuid.uuid4(),
+    content_number=1,
+    content_metadata={"page": 1},
+    content="Page content",
+    created_at="2026-01-01T00:00:00Z",
+    updated_at="2026-01-01T00:00:00Z",
+)
+
+
+def test_page_first_layout_shares_the_page_prefix():
+    first = page_messages("Be strict", FILE_CONTENT, "Is it signed?", "page_first")
+    second = page_messages("Be lenient", FILE_CONTENT, "Is it dated?", "page_first")
+
+    assert first[0] == second[0]
+    assert first[0].content.startswith("Document Page:")
+    assert [m.content for m in first[1:]] == ["Be strict", "Is it signed?"]
+    assert page_messages("Be strict", FILE_CONTENT, "Is it signed?")[0].content == (
+        "Be strict"
+    )
+
+
+def test_prompt_token_usage_reads_provider_cached_tokens():
+    assert prompt_token_usage(
+        {
+            "usage": {"prompt": 1200, "completion": 5, "total": 1205},
+            "rawResponse": {
+                "usage": {"prompt_tokens_details": {"cached_tokens": 1024}}
+            },
+        }
+    ) == (1200, 1024)
+    assert prompt_token_usage(
+        {"usage": {"prompt": 10}, "rawResponse": {"usage": {}}}
+    ) == (10, 0)
+    assert prompt_token_usage({}) == (0, 0)
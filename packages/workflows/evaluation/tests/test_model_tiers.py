@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+
+import internal_db_models
+from internal_vmx_utils.client import VMXClientResource
+
+from evaluation_workflow.activities.start_evaluations import (
+    EvaluationBranch,
+    StartEvaluationsActivity,
+)
+from evaluation_workflow.activities.store_evaluations import TierUsage
+from evaluation_workflow.settings import EvaluationWorkflowOptions
+
+
+class FileContentRepository:
+    async def get_by_file_id(self, file_id):
+        return [
+            internal_db_models.FileContentRead(
+                id=uuid.uuid4(),
+                file_id=file_id,
+                content_number=1,
+                content_metadata={},
+                content="A signed contract.",
+                created_at="2026-01-01T00:00:00Z",
+                updated_at="2026-01-01T00:00:00Z",
+            )
+        ]
+
+
+def _evaluation(
+    evaluation_type: internal_db_models.EvaluationType, model_tier: str | None = None
+) -> internal_db_models.EvaluationRead:
+    return internal_db_models.EvaluationRead(
+        id=uuid.uuid4(),
+        title="Evaluation",
+        description="Evaluation",
+        system_prompt=None,
+        prompt="Question",
+        project_id=uuid.uuid4(),
+        evaluation_type=evaluation_type,
+        evaluation_options=["a", "b"],
+        parent_evaluation_id=None,
+        parent_evaluation_option=None,
+        template_id=None,
+        category_id=uuid.uuid4(),
+        model_tier=model_tier,
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+
+def test_requests_are_routed_to_the_resource_of_their_tier():
+    vmx_client_resource = VMXClientResource()
+    vmx_client_resource.client = None
+    vmx_client_resource.resource_id = "default-resource"
+    vmx_client_resource.tier_resource_ids = {"fast": "fast-resource"}
+    activity = StartEvaluationsActivity(
+        evaluation_service=None,
+        file_repository=None,
+        file_content_repository=FileContentRepository(),
+        file_evaluation_repository=None,
+        evaluation_cache_repository=None,
+        vmx_client_resource=vmx_client_resource,
+        ingestion_callback_url="",
+    )
+    evaluations = [
+        _evaluation(internal_db_models.EvaluationType.BOOLEAN),
+        _evaluation(internal_db_models.EvaluationType.ENUM_CHOICE),
+        _evaluation(internal_db_models.EvaluationType.TEXT),
+        _evaluation(internal_db_models.EvaluationType.BOOLEAN, model_tier="large"),
+    ]
+
+    requests = asyncio.run(
+        activity._generate_branch_requests(
+            internal_db_models.FileRead.model_construct(id=uuid.uuid4()),
+            "workflow",
+            EvaluationBranch(),
+            evaluations,
+            EvaluationWorkflowOptions(),
+        )
+    )
+
+    assert [
+        (request.resource, request.metadata["model_tier"]) for request in requests
+    ] == [
+        ("fast-resource", "fast"),
+        ("fast-resource", "fast"),
+        ("default-resource", None),
+        # Tiers without a resource fall back to the default one.
+        ("default-resource", "large"),
+    ]
+
+
+def test_tier_usage_aggregates_stored_responses():
+    usage = TierUsage()
+    usage.add({"usage": {"total": 120}, "metrics": {"duration": 0.5}})
+    usage.add({"usage": {"total": 80}, "metrics": {"duration": 1.5}})
+    usage.add({})
+
+    assert (usage.requests, usage.total_tokens) == (3, 200)
+    assert usage.average_duration == 1.0
@@ -0,0 +1,115 @@
+import asyncio
+import uuid
+
+import internal_db_models
+
+from evaluation_workflow.activities.start_evaluations import (
+    EvaluationBranch,
+    StartEvaluationsActivity,
+    page_message_content,
+    page_windows,
+)
+from evaluation_workflow.settings import EvaluationWorkflowOptions
+from evaluation_workflow.tokens import count_tokens
+
+BUDGET = 2_000
+
+
+def _page(content: str) -> internal_db_models.FileContentRead:
+    return internal_db_models.FileContentRead(
+        id=uuid.uuid4(),
+        file_id=uuid.uuid4(),
+        content_number=1,
+        content_metadata={"ocr": "word " * 200},
+        content=content,
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+
+class FileContentRepository:
+    def __init__(self, pages: list[internal_db_models.FileContentRead]):
+        self.pages = pages
+
+    async def get_by_file_id(self, file_id):
+        return self.pages
+
+
+class VMXClientResource:
+    client = None
+
+    def resource_for_tier(self, tier: str | None) -> str:
+        return "resource"
+
+
+def test_page_windows_drop_metadata_before_splitting():
+    page = _page("Short page")
+    [window] = page_windows(page, count_tokens(page_message_content(page)) - 10)
+    assert window.content == page.content
+    assert not window.content_metadata
+
+    page = _page("text " * 5_000)
+    windows = page_windows(page, 500)
+    assert len(windows) > 1
+    assert "".join(window.content for window in windows) == page.content
+    assert all(count_tokens(page_message_content(window)) <= 500 for window in windows)
+
+
+def test_oversized_pages_are_split_into_windows():
+    small, dense = _page("A signed contract."), _page("dense text " * 10_000)
+    activity = StartEvaluationsActivity(
+        evaluation_service=None,
+        file_repository=None,
+        file_content_repository=FileContentRepository([small, dense]),
+        file_evaluation_repository=None,
+        evaluation_cache_repository=None,
+        vmx_client_resource=VMXClientResource(),
+        ingestion_callback_url="",
+    )
+    evaluation = internal_db_models.EvaluationRead(
+        id=uuid.uuid4(),
+        title="Signed",
+        description="Signed",
+        system_prompt="You review contracts.",
+        prompt="Is the contract signed?",
+        project_id=uuid.uuid4(),
+        evaluation_type=internal_db_models.EvaluationType.BOOLEAN,
+        evaluation_options=None,
+        parent_evaluation_id=None,
+        parent_evaluation_option=None,
+        template_id=None,
+        category_id=uuid.uuid4(),
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+    requests = asyncio.run(
+        activity._generate_branch_requests(
+            internal_db_models.FileRead.model_construct(id=uuid.uuid4()),
+            "workflow",
+            EvaluationBranch(),
+            [evaluation],
+            EvaluationWorkflowOptions(
+                max_request_tokens=BUDGET, request_token_reserve=0
+            ),
+        )
+    )
+
+    small_requests = [
+        request
+        for request in requests
+        if request.metadata["file_content_id"] == str(small.id)
+    ]
+    window_requests = requests[len(small_requests) :]
+    assert "Metadata:" in small_requests[0].messages[1].content
+    assert "window_group" not in small_requests[0].metadata
+    assert len(window_requests) > 1
+    assert [request.metadata["page_window"] for request in window_requests] == list(
+        range(len(window_requests))
+    )
+    assert {request.metadata["window_group"] for request in window_requests} == {
+        window_requests[0].metadata["window_group"]
+    }
+    assert all(
+        0 < request.metadata["estimated_tokens"] <= BUDGET for request in requests
+    )
@@ -0,0 +1,316 @@
+import asyncio
+import uuid
+from uuid import UUID
+
+import internal_db_models
+import pytest
+from internal_temporal_utils import pydantic_data_converter
+from temporalio import activity
+from temporalio.client import Client
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+from vmxai.types import CompletionBatchItemUpdateCallbackPayload, CompletionRequest
+
+from evaluation_workflow.activities.get_evaluation_tree import (
+    EvaluationTree,
+    evaluation_tree_key,
+)
+from evaluation_workflow.activities.get_files_to_evaluate import FilesToEvaluatePage
+from evaluation_workflow.activities.start_evaluations import (
+    EvaluationAnswer,
+    EvaluationBranch,
+    StartEvaluationOutput,
+)
+from evaluation_workflow.settings import EvaluationWorkflowOptions
+from evaluation_workflow.workflow import (
+    EvaluationPageRangeWorkflow,
+    EvaluationWorkflow,
+    UpdateEvaluationWorkflow,
+    UpdateEvaluationWorkflowPayload,
+)
+
+PAGE_COUNT = 20
+TREE_DEPTH = 3
+FILE_COUNT = 50
+
+
+def _callback(
+    item_id: str, evaluation_id: UUID, file_content_id: UUID
+) -> CompletionBatchItemUpdateCallbackPayload:
+    return CompletionBatchItemUpdateCallbackPayload.model_validate(
+        {
+            "event": "ITEM_UPDATE",
+            "payload": {
+                "createdAt": "",
+                "updatedAt": "",
+                "createdBy": "",
+                "updatedBy": "",
+                "workspaceEnvironmentItemId": "",
+                "timestamp": "",
+                "itemId": item_id,
+                "batchId": str(uuid.uuid4()),
+                "request": CompletionRequest(
+                    messages=[],
+                    resource="resource",
+                    metadata={
+                        "evaluation_id": str(evaluation_id),
+                        "file_content_id": str(file_content_id),
+                    },
+                ),
+                "status": "COMPLETED",
+            },
+        }
+    )
+
+
+class EvaluationTreeActivities:
+    """A chain of boolean evaluations, each one triggered by a "true" parent."""
+
+    def __init__(self, client: Client, page_count: int = PAGE_COUNT):
+        self.client = client
+        self.page_ids = [uuid.uuid4() for _ in range(page_count)]
+        self.evaluation_ids = [uuid.uuid4() for _ in range(TREE_DEPTH)]
+        self.batches: list[int] = []
+        self.start_calls = 0
+        self.stored_batches: list[int] = []
+        self.statuses: dict[UUID, str] = {}
+        self._signals: set[asyncio.Task] = set()
+        self.file_ids = sorted(uuid.uuid4() for _ in range(FILE_COUNT))
+        self.pages: list[int] = []
+
+    @activity.defn(name="GetEvaluationTreeActivity")
+    async def get_evaluation_tree(self, file_id: UUID) -> EvaluationTree:
+        parents = [None, *self.evaluation_ids[:-1]]
+        return EvaluationTree(
+            children={
+                evaluation_tree_key(parent, "true" if parent else None): [child]
+                for parent, child in zip(parents, self.evaluation_ids, strict=True)
+            }
+        )
+
+    @activity.defn(name="GetFilePageCountActivity")
+    async def get_file_page_count(self, file_id: UUID) -> int:
+        return len(self.page_ids)
+
+    @activity.defn(name="StartEvaluationsActivity")
+    async def start_evaluations(
+        self,
+        file_id: UUID,
+        branches: list[EvaluationBranch],
+        options: EvaluationWorkflowOptions,
+    ) -> StartEvaluationOutput:
+        self.start_calls += 1
+        items: list[tuple[str, UUID, UUID]] = []
+        for branch in branches:
+            if branch.parent_evaluation_id is None:
+                evaluation_id = self.evaluation_ids[0]
+            else:
+                depth = self.evaluation_ids.index(branch.parent_evaluation_id) + 1
+                if depth == TREE_DEPTH:
+                    continue
+                evaluation_id = self.evaluation_ids[depth]
+
+            if branch.parent_file_content_id:
+                page_ids = [branch.parent_file_content_id]
+            elif branch.from_page:
+                page_ids = self.page_ids[branch.from_page - 1 : branch.to_page]
+            else:
+                page_ids = self.page_ids
+            items.extend(
+                (str(uuid.uuid4()), evaluation_id, page_id) for page_id in page_ids
+            )
+
+        if not items:
+            return StartEvaluationOutput(
+                evaluation_ids=[], batch_id=None, batch_item_ids=None
+            )
+
+        self.batches.append(len(items))
+        handle = self.client.get_workflow_handle(activity.info().workflow_id)
+        for item in items:
+            task = asyncio.create_task(handle.signal("evaluate_item", _callback(*item)))
+            self._signals.add(task)
+            task.add_done_callback(self._signals.discard)
+
+        return StartEvaluationOutput(
+            evaluation_ids=list({evaluation_id for _, evaluation_id, _ in items}),
+            batch_id=uuid.uuid4(),
+            batch_item_ids=[UUID(item_id) for item_id, _, _ in items],
+        )
+
+    @activity.defn(name="StoreEvaluationsActivity")
+    async def store_evaluations(
+        self,
+        file_id: UUID,
+        results: list[CompletionBatchItemUpdateCallbackPayload],
+    ) -> list[list[EvaluationAnswer]]:
+        self.stored_batches.append(len(results))
+        return [
+            [
+                EvaluationAnswer(
+                    evaluation_id=UUID(
+                        result.payload.request.metadata["evaluation_id"]
+                    ),
+                    file_content_id=UUID(
+                        result.payload.request.metadata["file_content_id"]
+                    ),
+                    response="true",
+                )
+            ]
+            for result in results
+        ]
+
+    @activity.defn(name="UpdateFileStatusActivity")
+    async def update_file_status(self, file_id: UUID, status: str) -> None:
+        self.statuses[file_id] = status
+
+    @activity.defn(name="GetEvaluationWorkflowOptionsActivity")
+    async def get_workflow_options(self) -> EvaluationWorkflowOptions:
+        return EvaluationWorkflowOptions(max_child_workflows_per_run=20)
+
+    @activity.defn(name="GetFilesToEvaluatePageActivity")
+    async def get_files_to_evaluate(
+        self,
+        evaluation: internal_db_models.EvaluationRead,
+        old_evaluation: internal_db_models.EvaluationRead | None,
+        cursor: UUID | None,
+        limit: int,
+    ) -> FilesToEvaluatePage:
+        start = self.file_ids.index(cursor) + 1 if cursor else 0
+        file_ids = self.file_ids[start : start + limit]
+        self.pages.append(len(file_ids))
+        return FilesToEvaluatePage(
+            file_ids=file_ids,
+            next_cursor=file_ids[-1] if len(file_ids) == limit else None,
+        )
+
+
+async def _evaluate_tree(
+    page_count: int = PAGE_COUNT, options: EvaluationWorkflowOptions | None = None
+):
+    try:
+        env = await WorkflowEnvironment.start_time_skipping(
+            data_converter=pydantic_data_converter
+        )
+    except RuntimeError as e:
+        pytest.skip(f"Temporal test server unavailable: {e}")
+
+    async with env:
+        mocks = EvaluationTreeActivities(env.client, page_count=page_count)
+        async with Worker(
+            env.client,
+            task_queue="temporal-worker",
+            workflows=[EvaluationWorkflow, EvaluationPageRangeWorkflow],
+            activities=[
+                mocks.get_file_page_count,
+                mocks.get_evaluation_tree,
+                mocks.start_evaluations,
+                mocks.store_evaluations,
+                mocks.update_file_status,
+            ],
+        ):
+            await env.client.execute_workflow(
+                EvaluationWorkflow.run,
+                args=[
+                    uuid.uuid4(),
+                    options or EvaluationWorkflowOptions(store_batch_size=8),
+                ],
+                id="evaluation-workflow-tree",
+                task_queue="temporal-worker",
+            )
+
+    return mocks
+
+
+def test_evaluation_tree_runs_one_batch_per_level():
+    mocks = asyncio.run(_evaluate_tree())
+
+    assert mocks.batches == [PAGE_COUNT] * TREE_DEPTH
+    # Answers of the last level have no children and are not submitted.
+    assert mocks.start_calls == TREE_DEPTH
+    assert sum(mocks.stored_batches) == PAGE_COUNT * TREE_DEPTH
+    assert max(mocks.stored_batches) <= 8
+
+
+def test_large_file_is_sharded_by_page_range():
+    mocks = asyncio.run(
+        _evaluate_tree(
+            page_count=250,
+            options=EvaluationWorkflowOptions(pages_per_child_workflow=100),
+        )
+    )
+
+    # Every shard submits its own batch per level.
+    assert sorted(mocks.batches) == sorted([100, 100, 50] * TREE_DEPTH)
+    assert sum(mocks.stored_batches) == 250 * TREE_DEPTH
+
+
+async def _update_evaluation():
+    try:
+        env = await WorkflowEnvironment.start_time_skipping(
+            data_converter=pydantic_data_converter
+        )
+    except RuntimeError as e:
+        pytest.skip(f"Temporal test server unavailable: {e}")
+
+    async with env:
+        mocks = EvaluationTreeActivities(env.client, page_count=2)
+        async with Worker(
+            env.client,
+            task_queue="temporal-worker",
+            workflows=[EvaluationWorkflow, UpdateEvaluationWorkflow],
+            activities=[
+                mocks.get_workflow_options,
+                mocks.get_files_to_evaluate,
+                mocks.get_file_page_count,
+                mocks.get_evaluation_tree,
+                mocks.start_evaluations,
+                mocks.store_evaluations,
+                mocks.update_file_status,
+            ],
+        ):
+            handle = await env.client.start_workflow(
+                UpdateEvaluationWorkflow.run,
+                args=[
+                    UpdateEvaluationWorkflowPayload(
+                        evaluation=internal_db_models.EvaluationRead(
+                            id=mocks.evaluation_ids[0],
+                            title="Evaluation",
+                            description="Evaluation",
+                            system_prompt=None,
+                            prompt="Prompt",
+                            project_id=uuid.uuid4(),
+                            evaluation_type=internal_db_models.EvaluationType.BOOLEAN,
+                            evaluation_options=None,
+                            parent_evaluation_id=None,
+                            parent_evaluation_option=None,
+                            template_id=None,
+                            category_id=uuid.uuid4(),
+                            created_at="2026-01-01T00:00:00Z",
+                            updated_at="2026-01-01T00:00:00Z",
+                        ),
+                        # Partial options, as started by the API, the rest
+                        # comes from the worker.
+                        options=EvaluationWorkflowOptions(
+                            max_concurrent_child_workflows=5,
+                        ),
+                    ).model_dump(mode="json", exclude_unset=True)
+                ],
+                id="update-evaluation-workflow-fan-out",
+                task_queue="temporal-worker",
+            )
+            await handle.result()
+            progress = await handle.query(UpdateEvaluationWorkflow.progress)
+
+    return mocks, progress
+
+
+def test_update_evaluation_fans_out_files_to_child_workflows():
+    mocks, progress = asyncio.run(_update_evaluation())
+
+    assert len(mocks.statuses) == FILE_COUNT
+    # Files are fetched a page per run rather than all upfront.
+    assert mocks.pages == [20, 20, 10]
+    assert set(mocks.statuses.values()) == {"completed"}
+    assert progress.files_processed == FILE_COUNT
+    assert progress.files_failed == 0
@@ -263,6 +263,7 @@ export class IngestionWorkflowStack extends BaseStack {
           LOG_LEVEL: 'INFO',
           THUMBNAIL_S3_BUCKET_NAME: this.thumbnailBucket.bucketName,
           DB_SECRET_NAME: `${this.resourcePrefix}-app-database-secret-${props.stage}`,
+          DB_RUNTIME: 'lambda',
           OPENAI_SECRET_NAME: 'openai-credentials',
           POPPLER_INSTALLED: 'false',
           EVENT_BUS_NAME: eventBus.eventBusName,
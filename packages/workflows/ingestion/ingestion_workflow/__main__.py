@@ -6,9 +6,11 @@ from internal_aws_sqs_consumer import BaseMessageHandler, SQSConsumer
 from internal_logger import setup_logger
 from internal_schemas.s3 import S3Event
 from internal_schemas.sns import SnsMessage
+from internal_temporal_utils.settings import TaskQueueSettings
 from temporalio.client import Client
 
 from .containers import Container
+from .settings import IngestionWorkflowSettings
 
 setup_logger()
 
@@ -19,11 +21,20 @@ class IncomingMessageHandler(BaseMessageHandler):
         self,
         queue_url: str,
         temporal_client: Client,
+        ingestion_workflow_settings: IngestionWorkflowSettings = Provide[
+            Container.ingestion_workflow_settings
+        ],
+        task_queue_settings: TaskQueueSettings = Provide[Container.task_queue_settings],
         aioboto3_session: aioboto3.Session = Provide[Container.aioboto3_session],
     ):
         super().__init__(queue_url, aioboto3_session)
 
         self._temporal_client = temporal_client
+        self._task_queue = task_queue_settings.resolve("default")
+        # Task queues are resolved here, workflows can't read settings.
+        self._ingestion_workflow_settings = ingestion_workflow_settings.model_copy(
+            update={"task_queues": task_queue_settings.task_queues()}
+        )
 
     async def _handle(self, message: dict):
         self._logger.info(f"Received message: {message}")
@@ -38,9 +49,12 @@ class IncomingMessageHandler(BaseMessageHandler):
             self._temporal_client.start_workflow(
                 "IngestionWorkflow",
                 id=f"ingestion-workflow-{sns_message.root.message_id}",
-                task_queue="temporal-worker",
+                task_queue=self._task_queue,
                 args=[
-                    S3Event.model_validate_json(sns_message.root.message, by_alias=True)
+                    S3Event.model_validate_json(
+                        sns_message.root.message, by_alias=True
+                    ),
+                    self._ingestion_workflow_settings,
                 ],
             )
         )
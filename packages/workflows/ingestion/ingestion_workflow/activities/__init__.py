@@ -2,6 +2,7 @@ from .chunk_document import ChunkDocumentActivity
 from .create_chunk_embeddings import (
     CreateChunkEmbeddingsActivity,
 )
+from .get_file_content_ids import GetFileContentIdsActivity
 from .load_s3_file import (
     LoadS3FileActivity,
     LoadS3FileOutput,
@@ -10,6 +11,7 @@ from .load_s3_file import (
 __all__ = [
     "ChunkDocumentActivity",
     "CreateChunkEmbeddingsActivity",
+    "GetFileContentIdsActivity",
     "LoadS3FileActivity",
     "LoadS3FileOutput",
     "UpdateFileStatusActivity",
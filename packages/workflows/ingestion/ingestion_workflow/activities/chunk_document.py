@@ -9,10 +9,21 @@ from internal_db_repositories.file_embedding import FileEmbeddingRepository
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pydantic import BaseModel
+from workflow_shared_actitivies import ActivityHeartbeat, run_in_executor
 
 logger = logging.getLogger(__name__)
 
 
+def _split_document(content: str, metadata: dict) -> list[Document]:
+    text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        encoding_name="cl100k_base", chunk_size=100, chunk_overlap=20
+    )
+
+    return text_splitter.split_documents(
+        [Document(page_content=content, metadata=metadata)]
+    )
+
+
 class ChunkDocumentOutput(BaseModel):
     chunk_ids: list[UUID]
     file_content_id: UUID
@@ -34,33 +45,37 @@ class ChunkDocumentActivity:
         file_id: UUID,
         project_id: UUID,
         file_content_id: UUID,
+        update_file_status: bool = True,
     ) -> ChunkDocumentOutput:
         file_content = await self._file_content_repository.get(file_content_id)
         if not file_content:
             raise ValueError(f"File content {file_content_id} not found")
 
         logger.info(f"Chunking document length: {len(file_content.content)}")
-        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            encoding_name="cl100k_base", chunk_size=100, chunk_overlap=20
-        )
-
-        document = Document(
-            page_content=file_content.content,
-            metadata=file_content.content_metadata,
-        )
-
-        result = text_splitter.split_documents([document])
+        heartbeat = ActivityHeartbeat()
+        async with heartbeat.keep_alive():
+            result = await run_in_executor(
+                _split_document, file_content.content, file_content.content_metadata
+            )
         logger.info(f"Split {len(result)} chunks")
 
-        await self._file_repository.update(
-            file_id, {"status": internal_db_models.FileStatus.CHUNKED}
-        )
+        if update_file_status:
+            await self._file_repository.update(
+                file_id, {"status": internal_db_models.FileStatus.CHUNKED}
+            )
+
+        # Chunk ids are derived from the content so a retried activity inserts
+        # the same rows, which are then skipped on conflict.
+        chunk_ids = [
+            uuid.uuid5(file_content.id, str(chunk_number + 1))
+            for chunk_number in range(len(result))
+        ]
 
         logger.info("Adding chunks to database")
-        chunks = await self._file_embedding_repository.add_all(
+        await self._file_embedding_repository.add_all(
             [
                 internal_db_models.FileEmbeddingCreate(
-                    id=uuid.uuid4(),
+                    id=chunk_id,
                     file_id=file_id,
                     chunk_number=chunk_number + 1,
                     chunk_metadata=chunk.metadata,
@@ -70,13 +85,16 @@ class ChunkDocumentActivity:
                     embedding=None,
                     status=internal_db_models.FileEmbeddingStatus.CHUNKED,
                 )
-                for chunk_number, chunk in enumerate(result)
+                for chunk_number, (chunk_id, chunk) in enumerate(
+                    zip(chunk_ids, result, strict=True)
+                )
             ],
-            return_models=True,
+            ignore_conflicts=True,
         )
         logger.info("Added chunks to database")
+        heartbeat.beat()
 
         return ChunkDocumentOutput(
-            chunk_ids=[chunk.id for chunk in chunks],
+            chunk_ids=chunk_ids,
             file_content_id=file_content_id,
         )
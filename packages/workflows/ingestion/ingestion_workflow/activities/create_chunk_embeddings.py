@@ -25,10 +25,12 @@ class CreateChunkEmbeddingsActivity:
         file_id: uuid.UUID,
         chunk_id: uuid.UUID,
         chunk_number: int,
+        update_file_status: bool = True,
     ) -> None:
-        await self._file_repository.update(
-            file_id, {"status": internal_db_models.FileStatus.EMBEDDING}
-        )
+        if update_file_status:
+            await self._file_repository.update(
+                file_id, {"status": internal_db_models.FileStatus.EMBEDDING}
+            )
 
         logger.info(f"Creating embeddings for chunk {chunk_number}")
         embeddings = OpenAIEmbeddings(
@@ -55,6 +57,7 @@ class CreateChunkEmbeddingsActivity:
 
         logger.info(f"Updated embedding for chunk {chunk_number} to database")
 
-        await self._file_repository.update(
-            file_id, {"status": internal_db_models.FileStatus.EMBEDDED}
-        )
+        if update_file_status:
+            await self._file_repository.update(
+                file_id, {"status": internal_db_models.FileStatus.EMBEDDED}
+            )
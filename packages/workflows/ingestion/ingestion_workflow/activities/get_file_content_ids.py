@@ -0,0 +1,25 @@
+import logging
+from uuid import UUID
+
+from internal_db_repositories.file_content import FileContentRepository
+
+logger = logging.getLogger(__name__)
+
+
+class GetFileContentIdsActivity:
+    def __init__(
+        self,
+        file_content_repository: FileContentRepository,
+    ):
+        self._file_content_repository = file_content_repository
+
+    async def run(
+        self,
+        file_id: UUID,
+        from_page: int,
+        to_page: int,
+    ) -> list[UUID]:
+        logger.info(f"Fetching contents of file {file_id} pages {from_page}-{to_page}")
+        return await self._file_content_repository.get_ids_by_file_id_and_page(
+            file_id, from_page, to_page
+        )
@@ -1,8 +1,10 @@
+import contextlib
 import logging
 import mimetypes
 import os
 import tempfile
 import uuid
+from datetime import datetime
 from io import BytesIO
 from uuid import UUID
 
@@ -12,18 +14,100 @@ from internal_db_repositories.file import FileRepository
 from internal_db_repositories.file_content import FileContentRepository
 from internal_db_repositories.project import ProjectRepository
 from internal_schemas.s3 import S3Event
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document
 from pydantic import BaseModel
+from pypdf import PdfReader
+from workflow_shared_actitivies import ActivityHeartbeat, run_in_executor
 
 logger = logging.getLogger(__name__)
 
 THUMBNAIL_SIZE = (1280, 1280)
+PAGE_BATCH_SIZE = 100
+
+
+def file_content_id(file_id: UUID, content_number: int) -> UUID:
+    # Deterministic so a retried load inserts the same rows (ignored on conflict).
+    return uuid.uuid5(file_id, str(content_number))
+
+
+def _pdf_page_count(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def _pdf_metadata(reader: PdfReader) -> dict[str, str]:
+    """Document metadata normalized like PyPDFLoader (lower keys, ISO dates)."""
+    metadata: dict[str, str] = {}
+    for key, value in (reader.metadata or {}).items():
+        key, value = key.lstrip("/").lower(), str(value).strip()
+        if key in ("creationdate", "moddate"):
+            with contextlib.suppress(ValueError):
+                value = datetime.strptime(
+                    value.replace("'", ""), "D:%Y%m%d%H%M%S%z"
+                ).isoformat("T")
+        metadata[key] = value
+
+    return metadata
+
+
+def _load_pdf_pages(file_path: str, start: int, stop: int) -> list[Document]:
+    """Pages ``start`` to ``stop`` (0-based, excluded) with PyPDFLoader's metadata.
+
+    Only these pages are parsed, so a resumed load skips the pages persisted
+    before.
+    """
+    reader = PdfReader(file_path)
+    metadata = {
+        "producer": "PyPDF",
+        "creator": "PyPDF",
+        "creationdate": "",
+        **_pdf_metadata(reader),
+        "source": file_path,
+        "total_pages": len(reader.pages),
+    }
+
+    return [
+        Document(
+            page_content=reader.pages[page].extract_text().strip(),
+            metadata={
+                **metadata,
+                "page": page,
+                "page_label": reader.page_labels[page],
+            },
+        )
+        for page in range(start, min(stop, len(reader.pages)))
+    ]
+
+
+def _render_pdf_thumbnail(file_path: str) -> bytes:
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        file_path,
+        first_page=1,
+        last_page=1,
+    )
+    img = images[0]
+    img.thumbnail(THUMBNAIL_SIZE)
+    thumbnail_bytes = BytesIO()
+    img.save(thumbnail_bytes, format="PNG")
+    return thumbnail_bytes.getvalue()
 
 
 class LoadS3FileOutput(BaseModel):
     file_id: UUID
     project_id: UUID
     file_content_ids: list[UUID]
+    page_count: int
+
+
+class LoadS3FileCheckpoint(BaseModel):
+    file_id: UUID
+    page_count: int | None = None
+    pages_persisted: int = 0
+
+    @property
+    def completed(self) -> bool:
+        return self.page_count is not None and self.pages_persisted >= self.page_count
 
 
 class LoadS3FileActivity:
@@ -41,7 +125,18 @@ class LoadS3FileActivity:
         self._aioboto3_session = aioboto3_session
         self._thumbnail_s3_bucket_name = thumbnail_s3_bucket_name
 
-    async def run(self, s3_event: S3Event) -> LoadS3FileOutput:
+    async def run(
+        self, s3_event: S3Event, return_content_ids: bool = True
+    ) -> LoadS3FileOutput:
+        heartbeat = ActivityHeartbeat()
+        checkpoint = (
+            LoadS3FileCheckpoint.model_validate(heartbeat.details[0])
+            if heartbeat.details
+            else None
+        )
+        if checkpoint:
+            logger.info(f"Resuming from checkpoint {checkpoint}")
+
         async with self._aioboto3_session.client("s3") as s3:
             for record in s3_event.records:
                 logger.info(
@@ -55,6 +150,14 @@ class LoadS3FileActivity:
                 if not project:
                     raise ValueError(f"Project {project_id} not found")
 
+                if checkpoint and checkpoint.completed:
+                    return self._output(
+                        checkpoint.file_id,
+                        project.id,
+                        checkpoint.page_count,
+                        return_content_ids,
+                    )
+
                 _, file_ext = os.path.splitext(file_name)
 
                 with tempfile.NamedTemporaryFile(suffix=file_ext) as temp_file:
@@ -62,18 +165,21 @@ class LoadS3FileActivity:
                         f"Downloading s3://{record.s3.bucket.name}/{record.s3.object.key}"
                         f"to {temp_file.name}"
                     )
-                    await s3.download_file(
-                        Bucket=record.s3.bucket.name,
-                        Key=record.s3.object.key,
-                        Filename=temp_file.name,
-                    )
+                    async with heartbeat.keep_alive():
+                        await s3.download_file(
+                            Bucket=record.s3.bucket.name,
+                            Key=record.s3.object.key,
+                            Filename=temp_file.name,
+                        )
 
                     head_object = await s3.head_object(
                         Bucket=record.s3.bucket.name, Key=record.s3.object.key
                     )
 
                     object_metadata = head_object.get("Metadata", {})
-                    file_id = object_metadata.get("file_id", None)
+                    file_id = object_metadata.get("file_id", None) or (
+                        checkpoint and str(checkpoint.file_id)
+                    )
                     if not file_id:
                         file_id = uuid.uuid4()
                         file = await self._file_repository.add(
@@ -94,78 +200,131 @@ class LoadS3FileActivity:
                         if not file:
                             raise ValueError(f"File {file_id} not found")
 
+                    checkpoint = checkpoint or LoadS3FileCheckpoint(file_id=file.id)
+                    heartbeat.beat(checkpoint.model_dump(mode="json"))
+
                     match file_ext:
                         case ".pdf":
-                            if os.getenv("POPPLER_INSTALLED", "true") == "true":
-                                await self._generate_pdf_thumbnail(
-                                    project,
-                                    temp_file,
-                                    file,
-                                )
-
-                            loader = PyPDFLoader(temp_file.name)
-                            docs = await loader.aload()
-                            contents = await self._file_content_repository.add_all(
-                                [
-                                    internal_db_models.FileContentCreate(
-                                        id=uuid.uuid4(),
-                                        file_id=file.id,
-                                        content_number=idx + 1,
-                                        content=doc.page_content,
-                                        content_metadata=doc.metadata,
+                            if (
+                                not file.thumbnail_url
+                                and os.getenv("POPPLER_INSTALLED", "true") == "true"
+                            ):
+                                async with heartbeat.keep_alive():
+                                    await self._generate_pdf_thumbnail(
+                                        project,
+                                        temp_file,
+                                        file,
                                     )
-                                    for idx, doc in enumerate(docs)
-                                ],
-                                return_models=True,
+
+                            page_count = await run_in_executor(
+                                _pdf_page_count, temp_file.name
+                            )
+                            await self._persist_pages(
+                                file.id,
+                                temp_file.name,
+                                page_count,
+                                checkpoint,
+                                heartbeat,
                             )
 
-                            logger.info(f"Loaded {len(docs)} documents")
-                            return LoadS3FileOutput(
-                                file_id=file.id,
-                                project_id=project.id,
-                                file_content_ids=[content.id for content in contents],
+                            logger.info(f"Loaded {page_count} documents")
+                            return self._output(
+                                file.id, project.id, page_count, return_content_ids
                             )
                         case ".txt":
                             content = temp_file.read().decode("utf-8")
 
-                            file_content = await self._file_content_repository.add(
-                                internal_db_models.FileContentCreate(
-                                    id=uuid.uuid4(),
-                                    file_id=file.id,
-                                    content=content,
-                                    content_number=1,
-                                    content_metadata={
-                                        "total_lines": len(content.splitlines()),
-                                    },
-                                )
+                            await self._file_content_repository.add_all(
+                                [
+                                    internal_db_models.FileContentCreate(
+                                        id=file_content_id(file.id, 1),
+                                        file_id=file.id,
+                                        content=content,
+                                        content_number=1,
+                                        content_metadata={
+                                            "total_lines": len(content.splitlines()),
+                                        },
+                                    )
+                                ],
+                                ignore_conflicts=True,
                             )
 
-                            return LoadS3FileOutput(
-                                file_id=file.id,
-                                project_id=project.id,
-                                file_content_ids=[file_content.id],
+                            return self._output(
+                                file.id, project.id, 1, return_content_ids
                             )
                         case _:
                             raise ValueError(f"Unsupported file extension: {file_ext}")
 
+    async def _persist_pages(
+        self,
+        file_id: UUID,
+        file_path: str,
+        page_count: int,
+        checkpoint: LoadS3FileCheckpoint,
+        heartbeat: ActivityHeartbeat,
+    ):
+        """Parse and persist the pages in batches, from the last checkpoint."""
+        if checkpoint.pages_persisted:
+            logger.info(f"Skipping {checkpoint.pages_persisted} persisted pages")
+
+        checkpoint.page_count = page_count
+        for batch_start in range(
+            checkpoint.pages_persisted, page_count, PAGE_BATCH_SIZE
+        ):
+            async with heartbeat.keep_alive():
+                batch = await run_in_executor(
+                    _load_pdf_pages,
+                    file_path,
+                    batch_start,
+                    batch_start + PAGE_BATCH_SIZE,
+                )
+
+            await self._file_content_repository.add_all(
+                [
+                    internal_db_models.FileContentCreate(
+                        id=file_content_id(file_id, content_number),
+                        file_id=file_id,
+                        content_number=content_number,
+                        content=doc.page_content,
+                        content_metadata=doc.metadata,
+                    )
+                    for content_number, doc in enumerate(batch, start=batch_start + 1)
+                ],
+                ignore_conflicts=True,
+            )
+
+            checkpoint.pages_persisted = batch_start + len(batch)
+            heartbeat.beat(checkpoint.model_dump(mode="json"))
+            logger.info(f"Persisted {checkpoint.pages_persisted}/{page_count} pages")
+
+    def _output(
+        self,
+        file_id: UUID,
+        project_id: UUID,
+        page_count: int,
+        return_content_ids: bool,
+    ) -> LoadS3FileOutput:
+        return LoadS3FileOutput(
+            file_id=file_id,
+            project_id=project_id,
+            file_content_ids=[
+                file_content_id(file_id, content_number)
+                for content_number in range(1, page_count + 1)
+            ]
+            if return_content_ids
+            else [],
+            page_count=page_count,
+        )
+
     async def _generate_pdf_thumbnail(
         self,
         project: internal_db_models.ProjectRead,
         temp_file: tempfile.NamedTemporaryFile,
         file: internal_db_models.FileRead,
     ):
-        from pdf2image import convert_from_path
-
-        images = convert_from_path(
-            temp_file.name,
-            first_page=1,
-            last_page=1,
+        thumbnail_bytes = BytesIO(
+            await run_in_executor(_render_pdf_thumbnail, temp_file.name)
         )
-        img = images[0]
-        img.thumbnail(THUMBNAIL_SIZE)
-        thumbnail_bytes = BytesIO()
-        img.save(thumbnail_bytes, format="PNG")
-        thumbnail_bytes.seek(0)
 
         thumbnail_key = f"{project.id}/{file.id}/thumbnail.png"
         thumbnail_url = f"s3://{self._thumbnail_s3_bucket_name}/{thumbnail_key}"
@@ -4,19 +4,27 @@ from ingestion_workflow.activities.chunk_document import ChunkDocumentActivity
 from ingestion_workflow.activities.create_chunk_embeddings import (
     CreateChunkEmbeddingsActivity,
 )
+from ingestion_workflow.activities.get_file_content_ids import (
+    GetFileContentIdsActivity,
+)
 from ingestion_workflow.activities.load_s3_file import LoadS3FileActivity
 
 
 class LoadS3FileActivityTemporal(
-    LoadS3FileActivity, metaclass=TemporalActivityMeta
+    LoadS3FileActivity, metaclass=TemporalActivityMeta, task_queue="parse"
 ): ...
 
 
 class CreateChunkEmbeddingsActivityTemporal(
-    CreateChunkEmbeddingsActivity, metaclass=TemporalActivityMeta
+    CreateChunkEmbeddingsActivity, metaclass=TemporalActivityMeta, task_queue="embed"
 ): ...
 
 
 class ChunkDocumentActivityTemporal(
-    ChunkDocumentActivity, metaclass=TemporalActivityMeta
+    ChunkDocumentActivity, metaclass=TemporalActivityMeta, task_queue="parse"
+): ...
+
+
+class GetFileContentIdsActivityTemporal(
+    GetFileContentIdsActivity, metaclass=TemporalActivityMeta, task_queue="db"
 ): ...
@@ -3,6 +3,9 @@ from internal_aws_shared.containers import AWSContainer
 from internal_aws_sqs_consumer.settings import SQSConsumerSettings
 from internal_temporal_utils.containers import TemporalContainer
 
+from .settings import IngestionWorkflowSettings
+
 
 class Container(TemporalContainer, AWSContainer):
     sqs_consumer_settings = providers.Singleton(SQSConsumerSettings)
+    ingestion_workflow_settings = providers.Singleton(IngestionWorkflowSettings)
@@ -1,20 +1,20 @@
-import asyncio
 import logging
 from typing import Any
 
+from workflow_shared_actitivies import lambda_runtime
 from workflow_shared_actitivies.activity_proxy import proxy_activity
 
 from ingestion_workflow.lambda_functions.containers import LambdaContainer
 
 logger = logging.getLogger(__name__)
 
-container = LambdaContainer()
+# Initialized on the first invocation and reused while the sandbox is warm.
+container = lambda_runtime.WarmContainer(LambdaContainer)
 
 
 async def main(event: dict):
-    await container.init_resources()
     return await proxy_activity(
-        container,
+        await container.get(),
         event["activity"],
         event["args"],
     )
@@ -22,4 +22,4 @@ async def main(event: dict):
 
 def handler(event: dict, context: Any):
     logger.info(f"Event: {event}")
-    return asyncio.run(main(event))
+    return lambda_runtime.run(main(event))
@@ -0,0 +1,27 @@
+from os import environ
+
+from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+env_file = f".env.{environ.get('ENV', 'local')}"
+
+
+class IngestionWorkflowOptions(BaseModel):
+    # Task queue of each activity kind. Workflows can't read settings in their
+    # sandbox, the names are resolved by whoever starts them.
+    task_queues: dict[str, str] = {}
+    # Files with more pages than this are split into page-range child workflows.
+    pages_per_child_workflow: int = 100
+    # Children started by a single run before it continues as new.
+    max_child_workflows_per_run: int = 20
+    # Chunking/embedding activities in flight per workflow run.
+    max_concurrent_activities: int = 20
+
+
+class IngestionWorkflowSettings(IngestionWorkflowOptions, BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="INGESTION_WORKFLOW_",
+    )
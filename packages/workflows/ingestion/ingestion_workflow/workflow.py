@@ -1,122 +1,315 @@
-import asyncio
 import logging
 from datetime import timedelta
+from uuid import UUID
 
 import internal_db_models
 from internal_schemas.s3 import S3Event
+from pydantic import BaseModel
 from temporalio import workflow
 from temporalio.common import RetryPolicy
 from temporalio.exceptions import ApplicationError
 
 with workflow.unsafe.imports_passed_through():
+    from workflow_shared_actitivies import map_bounded, page_ranges
     from workflow_shared_actitivies import temporal as shared_temporal
+    from workflow_shared_actitivies.execution import execute_activity
 
     from . import activities
     from .activities import temporal
+    from .settings import IngestionWorkflowOptions
 
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_RETRY_POLICY = RetryPolicy(maximum_attempts=3)
 DEFAULT_TIMEOUT = timedelta(seconds=300)
+# Long running activities heartbeat, so a lost worker is detected after
+# HEARTBEAT_TIMEOUT rather than after the whole start-to-close timeout.
+HEARTBEAT_TIMEOUT = timedelta(seconds=60)
+LOAD_FILE_TIMEOUT = timedelta(minutes=30)
+
+
+class IngestionWorkflowState(BaseModel):
+    file_id: UUID
+    project_id: UUID
+    page_count: int
+    next_page: int = 1
+    chunk_count: int = 0
+    options: IngestionWorkflowOptions
+
+
+class IngestionProgress(BaseModel):
+    file_id: UUID | None = None
+    page_count: int = 0
+    pages_processed: int = 0
+    chunk_count: int = 0
+
+
+async def set_file_status(
+    file_id: UUID,
+    status: internal_db_models.FileStatus,
+    task_queues: dict[str, str] | None = None,
+):
+    await execute_activity(
+        shared_temporal.UpdateFileStatusActivityTemporal,
+        args=[file_id, status],
+        start_to_close_timeout=DEFAULT_TIMEOUT,
+        retry_policy=DEFAULT_RETRY_POLICY,
+        task_queues=task_queues,
+    )
+
+
+async def ingest_page_range(
+    file_id: UUID,
+    project_id: UUID,
+    file_content_ids: list[UUID],
+    chunk_number_offset: int,
+    max_concurrent_activities: int,
+    task_queues: dict[str, str] | None = None,
+    update_file_status: bool = False,
+) -> int:
+    async def chunk_document(file_content_id: UUID):
+        return await execute_activity(
+            temporal.ChunkDocumentActivityTemporal,
+            args=[file_id, project_id, file_content_id, False],
+            start_to_close_timeout=DEFAULT_TIMEOUT,
+            heartbeat_timeout=HEARTBEAT_TIMEOUT,
+            retry_policy=DEFAULT_RETRY_POLICY,
+            task_queues=task_queues,
+        )
+
+    async def create_chunk_embeddings(numbered_chunk: tuple[int, UUID]):
+        chunk_number, chunk_id = numbered_chunk
+        await execute_activity(
+            temporal.CreateChunkEmbeddingsActivityTemporal,
+            args=[file_id, chunk_id, chunk_number_offset + chunk_number, False],
+            start_to_close_timeout=DEFAULT_TIMEOUT,
+            retry_policy=DEFAULT_RETRY_POLICY,
+            task_queues=task_queues,
+        )
+
+    # The file status is set once per phase, not by each chunking/embedding
+    # activity. The first range (or a small file's only one) marks the file
+    # chunked and embedding once its pages are chunked, IngestionWorkflow sets
+    # the other statuses around all the ranges.
+    file_chunks = await map_bounded(
+        chunk_document, file_content_ids, max_concurrent_activities
+    )
+    chunks = [chunk_id for out in file_chunks for chunk_id in out.chunk_ids]
+
+    if update_file_status:
+        await set_file_status(
+            file_id, internal_db_models.FileStatus.CHUNKED, task_queues
+        )
+        await set_file_status(
+            file_id, internal_db_models.FileStatus.EMBEDDING, task_queues
+        )
+
+    await map_bounded(
+        create_chunk_embeddings,
+        enumerate(chunks, start=1),
+        max_concurrent_activities,
+    )
+
+    return len(chunks)
+
+
+@workflow.defn(name="IngestionPageRangeWorkflow")
+class IngestionPageRangeWorkflow:
+    @workflow.run
+    async def run(
+        self,
+        file_id: UUID,
+        project_id: UUID,
+        from_page: int,
+        to_page: int,
+        chunk_number_offset: int,
+        max_concurrent_activities: int,
+        task_queues: dict[str, str] | None = None,
+        update_file_status: bool = False,
+    ) -> int:
+        file_content_ids = await execute_activity(
+            temporal.GetFileContentIdsActivityTemporal,
+            args=[file_id, from_page, to_page],
+            start_to_close_timeout=DEFAULT_TIMEOUT,
+            retry_policy=DEFAULT_RETRY_POLICY,
+            task_queues=task_queues,
+        )
+
+        return await ingest_page_range(
+            file_id,
+            project_id,
+            file_content_ids,
+            chunk_number_offset,
+            max_concurrent_activities,
+            task_queues,
+            update_file_status,
+        )
 
 
 @workflow.defn(name="IngestionWorkflow")
 class IngestionWorkflow:
+    def __init__(self):
+        self._progress = IngestionProgress()
+
+    @workflow.query
+    def progress(self) -> IngestionProgress:
+        return self._progress
+
     @workflow.run
-    async def run(self, message: S3Event) -> dict:
-        load_output: activities.LoadS3FileOutput | None = None
+    async def run(
+        self,
+        message: S3Event,
+        options: IngestionWorkflowOptions | None = None,
+        state: IngestionWorkflowState | None = None,
+    ) -> dict:
+        file_id: UUID | None = state.file_id if state else None
+        options = state.options if state else options or IngestionWorkflowOptions()
 
         try:
-            load_output = await workflow.execute_activity(
-                temporal.LoadS3FileActivityTemporal.run,
-                args=[message],
-                start_to_close_timeout=DEFAULT_TIMEOUT,
-                retry_policy=DEFAULT_RETRY_POLICY,
-            )
+            if not state:
+                load_output: activities.LoadS3FileOutput = await execute_activity(
+                    temporal.LoadS3FileActivityTemporal,
+                    args=[message, False],
+                    start_to_close_timeout=LOAD_FILE_TIMEOUT,
+                    heartbeat_timeout=HEARTBEAT_TIMEOUT,
+                    retry_policy=DEFAULT_RETRY_POLICY,
+                    task_queues=options.task_queues,
+                )
+                file_id = load_output.file_id
+                state = IngestionWorkflowState(
+                    file_id=load_output.file_id,
+                    project_id=load_output.project_id,
+                    page_count=load_output.page_count,
+                    options=options,
+                )
 
-            file_chunks = await asyncio.gather(
-                *[
-                    workflow.execute_activity(
-                        temporal.ChunkDocumentActivityTemporal.run,
-                        args=[
-                            load_output.file_id,
-                            load_output.project_id,
-                            file_content_id,
-                        ],
-                        start_to_close_timeout=DEFAULT_TIMEOUT,
-                        retry_policy=DEFAULT_RETRY_POLICY,
-                    )
-                    for file_content_id in load_output.file_content_ids
-                ]
-            )
+            self._update_progress(state)
 
-            chunks = [chunk_id for out in file_chunks for chunk_id in out.chunk_ids]
+            if state.next_page == 1:
+                await self._update_file_status(
+                    state, internal_db_models.FileStatus.CHUNKING
+                )
 
-            await asyncio.gather(
-                *[
-                    workflow.execute_activity(
-                        temporal.CreateChunkEmbeddingsActivityTemporal.run,
+            if state.page_count <= state.options.pages_per_child_workflow:
+                await self._ingest_inline(state)
+            else:
+                ranges = page_ranges(
+                    state.next_page,
+                    state.page_count,
+                    state.options.pages_per_child_workflow,
+                )
+                for from_page, to_page in ranges[
+                    : state.options.max_child_workflows_per_run
+                ]:
+                    state.chunk_count += await workflow.execute_child_workflow(
+                        IngestionPageRangeWorkflow.run,
                         args=[
-                            load_output.file_id,
-                            chunk_id,
-                            chunk_number + 1,
+                            state.file_id,
+                            state.project_id,
+                            from_page,
+                            to_page,
+                            state.chunk_count,
+                            state.options.max_concurrent_activities,
+                            state.options.task_queues,
+                            from_page == 1,
                         ],
-                        start_to_close_timeout=DEFAULT_TIMEOUT,
-                        retry_policy=DEFAULT_RETRY_POLICY,
+                        id=f"{workflow.info().workflow_id}-pages-{from_page}-{to_page}",
                     )
-                    for chunk_number, chunk_id in enumerate(chunks)
-                ]
-            )
+                    state.next_page = to_page + 1
+                    self._update_progress(state)
 
-            await workflow.execute_activity(
-                shared_temporal.UpdateFileStatusActivityTemporal.run,
-                args=[
-                    load_output.file_id,
-                    internal_db_models.FileStatus.COMPLETED,
-                ],
-                start_to_close_timeout=DEFAULT_TIMEOUT,
-                retry_policy=DEFAULT_RETRY_POLICY,
+                    if (
+                        state.next_page <= state.page_count
+                        and workflow.info().is_continue_as_new_suggested()
+                    ):
+                        break
+
+                if state.next_page <= state.page_count:
+                    workflow.continue_as_new(args=[message, None, state])
+
+            await self._update_file_status(
+                state, internal_db_models.FileStatus.EMBEDDED
+            )
+            await self._update_file_status(
+                state, internal_db_models.FileStatus.COMPLETED
             )
 
-            await workflow.execute_activity(
-                shared_temporal.SendEventActivityTemporal.run,
+            await execute_activity(
+                shared_temporal.SendEventActivityTemporal,
                 args=[
                     "ingestion",
                     "file_ingested_successfully",
-                    {"file_id": load_output.file_id},
+                    {"file_id": state.file_id},
                 ],
                 start_to_close_timeout=DEFAULT_TIMEOUT,
                 retry_policy=DEFAULT_RETRY_POLICY,
+                task_queues=state.options.task_queues,
             )
 
-            return load_output.file_id
+            return state.file_id
         except Exception as e:
             error_msg = f"Error in ingestion workflow: {e}"
             workflow.logger.error(error_msg)
-            if load_output and load_output.file_id:
-                await workflow.execute_activity(
-                    shared_temporal.UpdateFileStatusActivityTemporal.run,
+            if file_id:
+                await execute_activity(
+                    shared_temporal.UpdateFileStatusActivityTemporal,
                     args=[
-                        load_output.file_id,
+                        file_id,
                         internal_db_models.FileStatus.FAILED,
                     ],
                     start_to_close_timeout=DEFAULT_TIMEOUT,
                     retry_policy=DEFAULT_RETRY_POLICY,
+                    task_queues=options.task_queues,
                 )
 
-                await workflow.execute_activity(
-                    shared_temporal.SendEventActivityTemporal.run,
+                await execute_activity(
+                    shared_temporal.SendEventActivityTemporal,
                     args=[
                         "ingestion",
                         "file_ingestion_failed",
                         {
-                            "file_id": load_output.file_id,
+                            "file_id": file_id,
                             "error": str(e),
                         },
                     ],
                     start_to_close_timeout=DEFAULT_TIMEOUT,
                     retry_policy=DEFAULT_RETRY_POLICY,
+                    task_queues=options.task_queues,
                 )
 
             raise ApplicationError(error_msg) from e
+
+    async def _ingest_inline(self, state: IngestionWorkflowState):
+        file_content_ids = await execute_activity(
+            temporal.GetFileContentIdsActivityTemporal,
+            args=[state.file_id, 1, state.page_count],
+            start_to_close_timeout=DEFAULT_TIMEOUT,
+            retry_policy=DEFAULT_RETRY_POLICY,
+            task_queues=state.options.task_queues,
+        )
+
+        state.chunk_count = await ingest_page_range(
+            state.file_id,
+            state.project_id,
+            file_content_ids,
+            0,
+            state.options.max_concurrent_activities,
+            state.options.task_queues,
+            True,
+        )
+        state.next_page = state.page_count + 1
+        self._update_progress(state)
+
+    async def _update_file_status(
+        self, state: IngestionWorkflowState, status: internal_db_models.FileStatus
+    ):
+        await set_file_status(state.file_id, status, state.options.task_queues)
+
+    def _update_progress(self, state: IngestionWorkflowState):
+        self._progress = IngestionProgress(
+            file_id=state.file_id,
+            page_count=state.page_count,
+            pages_processed=state.next_page - 1,
+            chunk_count=state.chunk_count,
+        )
@@ -0,0 +1,63 @@
+import asyncio
+import uuid
+
+from pypdf import PdfWriter
+from workflow_shared_actitivies import ActivityHeartbeat
+
+from ingestion_workflow.activities import load_s3_file
+from ingestion_workflow.activities.load_s3_file import (
+    LoadS3FileActivity,
+    LoadS3FileCheckpoint,
+)
+
+
+class FileContentRepository:
+    def __init__(self):
+        self.content_numbers: list[int] = []
+
+    async def add_all(self, file_contents, ignore_conflicts=False):
+        self.content_numbers.extend(
+            file_content.content_number for file_content in file_contents
+        )
+
+
+def test_resumed_load_skips_persisted_pages(tmp_path, monkeypatch):
+    file_path = tmp_path / "file.pdf"
+    writer = PdfWriter()
+    for _ in range(5):
+        writer.add_blank_page(width=72, height=72)
+    writer.write(file_path)
+
+    loaded: list[tuple[int, int]] = []
+    load_pdf_pages_ = load_s3_file._load_pdf_pages
+
+    def load_pdf_pages(file_path: str, start: int, stop: int):
+        loaded.append((start, stop))
+        return load_pdf_pages_(file_path, start, stop)
+
+    monkeypatch.setattr(load_s3_file, "_load_pdf_pages", load_pdf_pages)
+    monkeypatch.setattr(load_s3_file, "PAGE_BATCH_SIZE", 2)
+
+    repository = FileContentRepository()
+    activity = LoadS3FileActivity(
+        file_repository=None,
+        project_repository=None,
+        file_content_repository=repository,
+        aioboto3_session=None,
+        thumbnail_s3_bucket_name="",
+    )
+    checkpoint = LoadS3FileCheckpoint(file_id=uuid.uuid4(), pages_persisted=2)
+
+    asyncio.run(
+        activity._persist_pages(
+            checkpoint.file_id,
+            str(file_path),
+            load_s3_file._pdf_page_count(str(file_path)),
+            checkpoint,
+            ActivityHeartbeat(),
+        )
+    )
+
+    assert loaded == [(2, 4), (4, 6)]
+    assert repository.content_numbers == [3, 4, 5]
+    assert checkpoint.completed
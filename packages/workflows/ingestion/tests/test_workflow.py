@@ -0,0 +1,189 @@
+import asyncio
+import uuid
+from uuid import UUID
+
+import pytest
+from internal_schemas.s3 import S3Event
+from internal_temporal_utils import pydantic_data_converter
+from temporalio import activity
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import Worker
+
+from ingestion_workflow.activities import LoadS3FileOutput
+from ingestion_workflow.activities.chunk_document import ChunkDocumentOutput
+from ingestion_workflow.settings import IngestionWorkflowOptions
+from ingestion_workflow.workflow import (
+    IngestionPageRangeWorkflow,
+    IngestionWorkflow,
+    page_ranges,
+)
+
+PAGE_COUNT = 10_000
+# Temporal rejects histories above 51,200 events, warn well before that.
+MAX_HISTORY_EVENTS = 10_000
+
+S3_EVENT = S3Event.model_validate(
+    {
+        "Records": [
+            {
+                "s3": {
+                    "bucket": {"name": "landing", "arn": "arn:aws:s3:::landing"},
+                    "object": {
+                        "key": f"{uuid.uuid4()}/synthetic.pdf",
+                        "sequencer": "0",
+                        "versionId": "1",
+                        "eTag": "etag",
+                        "size": 1,
+                    },
+                }
+            }
+        ]
+    }
+)
+
+
+def test_page_ranges_cover_document():
+    ranges = page_ranges(1, PAGE_COUNT, 100)
+
+    assert len(ranges) == 100
+    assert ranges[0] == (1, 100)
+    assert ranges[-1] == (9_901, PAGE_COUNT)
+    assert all(
+        prev_to + 1 == next_from
+        for (_, prev_to), (next_from, _) in zip(ranges, ranges[1:], strict=False)
+    )
+    assert page_ranges(51, 120, 100) == [(51, 120)]
+
+
+class SyntheticDocumentActivities:
+    def __init__(self, page_count: int):
+        self.file_id = uuid.uuid4()
+        self.project_id = uuid.uuid4()
+        self.page_ids = [uuid.uuid4() for _ in range(page_count)]
+        self.chunk_numbers: list[int] = []
+        self.statuses: list[str] = []
+
+    @activity.defn(name="LoadS3FileActivity")
+    async def load_s3_file(
+        self, s3_event: S3Event, return_content_ids: bool
+    ) -> LoadS3FileOutput:
+        return LoadS3FileOutput(
+            file_id=self.file_id,
+            project_id=self.project_id,
+            file_content_ids=self.page_ids if return_content_ids else [],
+            page_count=len(self.page_ids),
+        )
+
+    @activity.defn(name="GetFileContentIdsActivity")
+    async def get_file_content_ids(
+        self, file_id: UUID, from_page: int, to_page: int
+    ) -> list[UUID]:
+        return self.page_ids[from_page - 1 : to_page]
+
+    @activity.defn(name="ChunkDocumentActivity")
+    async def chunk_document(
+        self,
+        file_id: UUID,
+        project_id: UUID,
+        file_content_id: UUID,
+        update_file_status: bool,
+    ) -> ChunkDocumentOutput:
+        return ChunkDocumentOutput(
+            chunk_ids=[uuid.uuid4()], file_content_id=file_content_id
+        )
+
+    @activity.defn(name="CreateChunkEmbeddingsActivity")
+    async def create_chunk_embeddings(
+        self,
+        file_id: UUID,
+        chunk_id: UUID,
+        chunk_number: int,
+        update_file_status: bool,
+    ) -> None:
+        self.chunk_numbers.append(chunk_number)
+
+    @activity.defn(name="UpdateFileStatusActivity")
+    async def update_file_status(self, file_id: UUID, status: str) -> None:
+        self.statuses.append(status)
+
+    @activity.defn(name="SendEventActivity")
+    async def send_event(self, source: str, detail_type: str, detail: dict) -> None:
+        pass
+
+
+async def _ingest_synthetic_document(page_count: int = PAGE_COUNT):
+    try:
+        env = await WorkflowEnvironment.start_time_skipping(
+            data_converter=pydantic_data_converter
+        )
+    except RuntimeError as e:
+        pytest.skip(f"Temporal test server unavailable: {e}")
+
+    async with env:
+        mocks = SyntheticDocumentActivities(page_count)
+        async with Worker(
+            env.client,
+            task_queue="temporal-worker",
+            workflows=[IngestionWorkflow, IngestionPageRangeWorkflow],
+            activities=[
+                mocks.load_s3_file,
+                mocks.get_file_content_ids,
+                mocks.chunk_document,
+                mocks.create_chunk_embeddings,
+                mocks.update_file_status,
+                mocks.send_event,
+            ],
+        ):
+            handle = await env.client.start_workflow(
+                IngestionWorkflow.run,
+                args=[
+                    S3_EVENT,
+                    IngestionWorkflowOptions(
+                        pages_per_child_workflow=100,
+                        max_child_workflows_per_run=20,
+                    ),
+                ],
+                id="ingestion-workflow-synthetic",
+                task_queue="temporal-worker",
+            )
+            result = await handle.result()
+
+            histories = [
+                await env.client.get_workflow_handle(
+                    f"ingestion-workflow-synthetic-pages-{from_page}-{to_page}"
+                ).fetch_history()
+                for from_page, to_page in page_ranges(1, page_count, 100)
+                if page_count > 100
+            ]
+            histories.append(await handle.fetch_history())
+
+    return mocks, result, histories
+
+
+def test_ingests_synthetic_document_within_history_limits():
+    mocks, result, histories = asyncio.run(_ingest_synthetic_document())
+
+    assert UUID(str(result)) == mocks.file_id
+    assert sorted(mocks.chunk_numbers) == list(range(1, PAGE_COUNT + 1))
+    # Set once per phase, the first range marks the chunked/embedding boundary.
+    assert mocks.statuses == [
+        "chunking",
+        "chunked",
+        "embedding",
+        "embedded",
+        "completed",
+    ]
+    assert all(len(history.events) < MAX_HISTORY_EVENTS for history in histories)
+
+
+def test_small_document_goes_through_every_status():
+    mocks, _, _ = asyncio.run(_ingest_synthetic_document(page_count=10))
+
+    assert sorted(mocks.chunk_numbers) == list(range(1, 11))
+    assert mocks.statuses == [
+        "chunking",
+        "chunked",
+        "embedding",
+        "embedded",
+        "completed",
+    ]
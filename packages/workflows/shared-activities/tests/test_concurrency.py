@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from workflow_shared_actitivies import map_bounded
+
+
+def test_map_bounded_limits_in_flight_calls():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def work(item: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return item * 2
+
+    result = asyncio.run(map_bounded(work, range(50), 5))
+
+    assert result == [item * 2 for item in range(50)]
+    assert max_in_flight == 5
+
+
+def test_map_bounded_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        asyncio.run(map_bounded(asyncio.sleep, [0], 0))
@@ -0,0 +1,36 @@
+import asyncio
+import dataclasses
+
+from temporalio.testing import ActivityEnvironment
+
+from workflow_shared_actitivies import ActivityHeartbeat
+
+
+def test_heartbeat_outside_activity_is_noop():
+    heartbeat = ActivityHeartbeat()
+    heartbeat.beat({"pages_persisted": 1})
+
+    assert heartbeat.details == ({"pages_persisted": 1},)
+
+
+def test_heartbeat_resumes_and_keeps_latest_details():
+    env = ActivityEnvironment()
+    env.info = dataclasses.replace(
+        env.info, heartbeat_details=[{"pages_persisted": 100}]
+    )
+    beats = []
+    env.on_heartbeat = lambda *details: beats.append(details)
+
+    async def activity():
+        heartbeat = ActivityHeartbeat()
+        resumed_from = heartbeat.details
+        heartbeat.beat({"pages_persisted": 200})
+        async with heartbeat.keep_alive(interval=0.01):
+            await asyncio.sleep(0.05)
+        return resumed_from
+
+    resumed_from = asyncio.run(env.run(activity))
+
+    assert resumed_from == ({"pages_persisted": 100},)
+    assert len(beats) > 1
+    assert all(details == ({"pages_persisted": 200},) for details in beats)
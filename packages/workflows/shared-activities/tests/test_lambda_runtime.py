@@ -0,0 +1,35 @@
+import asyncio
+
+from dependency_injector import containers, providers
+
+from workflow_shared_actitivies import lambda_runtime
+
+
+async def _loop_resource():
+    # Stands for a pool bound to the loop it was created on.
+    yield asyncio.get_running_loop()
+
+
+class Container(containers.DeclarativeContainer):
+    loop = providers.Resource(_loop_resource)
+
+
+def test_warm_invocations_reuse_the_container_and_its_loop():
+    created: list[Container] = []
+
+    def factory() -> Container:
+        created.append(Container())
+        return created[-1]
+
+    warm_container = lambda_runtime.WarmContainer(factory)
+
+    async def handler():
+        container = await warm_container.get()
+        return await container.loop(), asyncio.get_running_loop()
+
+    for _ in range(3):
+        resource_loop, invocation_loop = lambda_runtime.run(handler())
+        assert resource_loop is invocation_loop
+        assert not resource_loop.is_closed()
+
+    assert len(created) == 1
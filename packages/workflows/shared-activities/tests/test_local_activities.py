@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import Counter
+from datetime import timedelta
+from uuid import UUID
+
+import internal_db_models
+import pytest
+from internal_temporal_utils import pydantic_data_converter
+from temporalio import workflow
+from temporalio.api.enums.v1 import EventType
+from temporalio.testing import WorkflowEnvironment
+from temporalio.worker import UnsandboxedWorkflowRunner, Worker
+
+from workflow_shared_actitivies import temporal
+from workflow_shared_actitivies.execution import execute_activity
+
+# Files bookkept per mode by the latency benchmark.
+BENCHMARK_FILES = 50
+STATUSES = [
+    internal_db_models.FileStatus.CHUNKED,
+    internal_db_models.FileStatus.EMBEDDING,
+    internal_db_models.FileStatus.EMBEDDED,
+    internal_db_models.FileStatus.COMPLETED,
+]
+
+
+class InMemoryFileRepository:
+    def __init__(self):
+        self.statuses: dict[UUID, internal_db_models.FileStatus] = {}
+
+    async def update(self, id: UUID, values: dict):
+        self.statuses[id] = values["status"]
+
+
+@workflow.defn
+class FileBookkeepingWorkflow:
+    @workflow.run
+    async def run(self, file_id: UUID, local: bool) -> None:
+        for status in STATUSES:
+            await execute_activity(
+                temporal.UpdateFileStatusActivityTemporal,
+                args=[file_id, status],
+                local=local,
+                start_to_close_timeout=timedelta(seconds=10),
+            )
+
+
+async def _bookkeep_files(
+    local: bool, files: int = 1
+) -> tuple[list[Counter[int]], float]:
+    """Event types in the history of each file's workflow and the elapsed time.
+
+    The files are bookkept one after the other, so the elapsed time is the sum
+    of their end-to-end latencies.
+    """
+    try:
+        env = await WorkflowEnvironment.start_local(
+            data_converter=pydantic_data_converter
+        )
+    except RuntimeError as e:
+        pytest.skip(f"Temporal dev server unavailable: {e}")
+
+    async with env:
+        repository = InMemoryFileRepository()
+        activity = temporal.UpdateFileStatusActivityTemporal(repository)
+        async with Worker(
+            env.client,
+            task_queue="temporal-worker",
+            workflows=[FileBookkeepingWorkflow],
+            activities=[activity.run],
+            workflow_runner=UnsandboxedWorkflowRunner(),
+        ):
+            handles = []
+            started = time.perf_counter()
+            for _ in range(files):
+                handle = await env.client.start_workflow(
+                    FileBookkeepingWorkflow.run,
+                    args=[uuid.uuid4(), local],
+                    id=f"file-bookkeeping-{uuid.uuid4()}",
+                    task_queue="temporal-worker",
+                )
+                await handle.result()
+                handles.append(handle)
+            elapsed = time.perf_counter() - started
+
+            histories = [await handle.fetch_history() for handle in handles]
+
+    assert list(repository.statuses.values()) == [STATUSES[-1]] * files
+    return [
+        Counter(event.event_type for event in history.events) for history in histories
+    ], elapsed
+
+
+def test_local_status_updates_record_one_marker_per_update():
+    (remote,), _ = asyncio.run(_bookkeep_files(local=False))
+    (local,), _ = asyncio.run(_bookkeep_files(local=True))
+
+    # Scheduled, started and completed events for each remote update.
+    for event_type in [
+        EventType.EVENT_TYPE_ACTIVITY_TASK_SCHEDULED,
+        EventType.EVENT_TYPE_ACTIVITY_TASK_STARTED,
+        EventType.EVENT_TYPE_ACTIVITY_TASK_COMPLETED,
+    ]:
+        assert remote[event_type] == len(STATUSES)
+        assert local[event_type] == 0
+
+    assert local[EventType.EVENT_TYPE_MARKER_RECORDED] == len(STATUSES)
+    assert sum(local.values()) < sum(remote.values())
+
+
+@pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="Set RUN_BENCHMARKS=1 to compare bookkeeping latency",
+)
+def test_local_status_updates_reduce_latency_and_history():
+    remote, remote_elapsed = asyncio.run(
+        _bookkeep_files(local=False, files=BENCHMARK_FILES)
+    )
+    local, local_elapsed = asyncio.run(
+        _bookkeep_files(local=True, files=BENCHMARK_FILES)
+    )
+
+    remote_events = sum(sum(events.values()) for events in remote) / BENCHMARK_FILES
+    local_events = sum(sum(events.values()) for events in local) / BENCHMARK_FILES
+    remote_latency = remote_elapsed / BENCHMARK_FILES
+    local_latency = local_elapsed / BENCHMARK_FILES
+    print(
+        f"\nhistory events per file: remote={remote_events:.0f} "
+        f"local={local_events:.0f}\n"
+        f"latency per file: remote={remote_latency * 1000:.1f}ms "
+        f"local={local_latency * 1000:.1f}ms"
+    )
+
+    assert local_events < remote_events
+    # Local updates skip a task queue round-trip per status.
+    assert local_latency < remote_latency
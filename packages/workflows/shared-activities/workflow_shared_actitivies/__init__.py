@@ -1,11 +1,22 @@
 from .activity_proxy import proxy_activity
+from .concurrency import map_bounded
+from .executor import register_executor, run_in_executor
+from .heartbeat import ActivityHeartbeat
+from .lambda_runtime import WarmContainer
+from .pages import page_ranges
 from .send_event import SendEventActivity
 from .update_file_status import (
     UpdateFileStatusActivity,
 )
 
 __all__ = [
+    "ActivityHeartbeat",
+    "WarmContainer",
     "UpdateFileStatusActivity",
     "SendEventActivity",
     "proxy_activity",
+    "map_bounded",
+    "page_ranges",
+    "register_executor",
+    "run_in_executor",
 ]
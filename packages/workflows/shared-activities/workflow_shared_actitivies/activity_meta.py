@@ -6,7 +6,23 @@ ActivityType = TypeVar("ActivityType")
 
 
 class TemporalActivityMeta(ABCMeta):
-    def __new__(mcs, name, bases, namespace, **kwargs):
+    """Registers ``run`` as a Temporal activity named after the wrapped class.
+
+    The ``task_queue`` class keyword declares which kind of task queue
+    (see ``internal_temporal_utils.settings.TaskQueueKind``) the activity
+    is routed to. ``local=True`` marks short, idempotent activities that
+    workflows run as local activities on the workflow worker instead.
+    """
+
+    def __new__(
+        mcs,
+        name,
+        bases,
+        namespace,
+        task_queue: str = "default",
+        local: bool = False,
+        **kwargs,
+    ):
         from temporalio import activity
 
         original_run = bases[0].run
@@ -17,6 +33,19 @@ class TemporalActivityMeta(ABCMeta):
             return await original_run(self, *args, **kwargs)
 
         namespace["run"] = _wrapper
+        namespace["task_queue"] = task_queue
+        namespace["local"] = local
 
         cls = super().__new__(mcs, name, bases, namespace, **kwargs)
         return cls
+
+    def __init__(
+        cls,
+        name,
+        bases,
+        namespace,
+        task_queue: str = "default",
+        local: bool = False,
+        **kwargs,
+    ):
+        super().__init__(name, bases, namespace, **kwargs)
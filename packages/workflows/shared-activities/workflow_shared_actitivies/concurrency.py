@@ -0,0 +1,30 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def map_bounded(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    limit: int,
+) -> list[R]:
+    """
+    Run ``func`` over ``items`` with at most ``limit`` calls in flight.
+
+    Results are returned in input order. Safe to use inside Temporal workflows,
+    the semaphore is released in a deterministic (FIFO) order by the workflow
+    event loop.
+    """
+    if limit < 1:
+        raise ValueError(f"Invalid concurrency limit: {limit}")
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*[_run(item) for item in items])
@@ -0,0 +1,42 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from temporalio import workflow
+
+
+def execute_activity(
+    activity_type: type,
+    *,
+    args: Sequence[Any] = (),
+    task_queues: Mapping[str, str] | None = None,
+    local: bool | None = None,
+    **kwargs,
+):
+    """
+    Schedule ``activity_type.run`` on the task queue its class declares.
+
+    ``task_queues`` maps each task queue kind to its name. Settings can't be
+    read in the workflow sandbox, the names are resolved by whoever starts the
+    workflow and passed with its options. Kinds without a name run on the
+    workflow's own task queue.
+
+    Activities declared with ``local=True`` run as local activities unless
+    ``local=False`` is passed, skipping the task queue round-trip and
+    recording a single marker event instead of a scheduled/started/completed
+    triple.
+    """
+    if activity_type.local if local is None else local:
+        return workflow.execute_local_activity(
+            activity_type.run,
+            args=args,
+            **kwargs,
+        )
+
+    return workflow.execute_activity(
+        activity_type.run,
+        args=args,
+        task_queue=(task_queues or {}).get(
+            activity_type.task_queue, workflow.info().task_queue
+        ),
+        **kwargs,
+    )
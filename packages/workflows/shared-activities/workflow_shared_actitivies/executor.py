@@ -0,0 +1,41 @@
+import asyncio
+import functools
+from collections.abc import Callable
+from concurrent.futures import Executor
+from typing import TypeVar
+
+R = TypeVar("R")
+
+_executors: dict[str, Executor] = {}
+
+
+def register_executor(task_queue: str, executor: Executor) -> None:
+    """
+    Use ``executor`` for blocking work of activities running on ``task_queue``.
+    """
+    _executors[task_queue] = executor
+
+
+def _current_task_queue() -> str | None:
+    try:
+        from temporalio import activity
+    except ImportError:
+        return None
+
+    return activity.info().task_queue if activity.in_activity() else None
+
+
+async def run_in_executor(func: Callable[..., R], *args, **kwargs) -> R:
+    """
+    Run blocking (CPU-bound) ``func`` off the event loop.
+
+    Uses the executor registered for the current activity task queue, falling
+    back to the loop default thread pool. With a process pool ``func`` and its
+    arguments must be picklable, i.e. module level functions.
+    """
+    task_queue = _current_task_queue()
+    executor = _executors.get(task_queue) if task_queue else None
+
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
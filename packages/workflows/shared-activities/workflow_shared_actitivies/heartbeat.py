@@ -0,0 +1,58 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from typing import Any
+
+
+def _activity_module():
+    try:
+        from temporalio import activity
+    except ImportError:
+        return None
+
+    return activity if activity.in_activity() else None
+
+
+class ActivityHeartbeat:
+    """
+    Heartbeats the current Temporal activity with checkpoint details.
+
+    ``details`` starts with the details recorded by the previous attempt, so a
+    retried activity can resume from its last checkpoint. Outside of a
+    Temporal activity (e.g. Step Functions lambdas) heartbeating is a no-op and
+    there are no details to resume from.
+    """
+
+    def __init__(self):
+        activity = _activity_module()
+        self.details: tuple[Any, ...] = (
+            tuple(activity.info().heartbeat_details) if activity else ()
+        )
+
+    def beat(self, *details: Any) -> None:
+        if details:
+            self.details = details
+
+        activity = _activity_module()
+        if activity:
+            activity.heartbeat(*self.details)
+
+    @contextlib.asynccontextmanager
+    async def keep_alive(self, interval: float = 10) -> AsyncIterator[None]:
+        """
+        Keep heartbeating the latest details while a long step runs.
+        """
+        if not _activity_module():
+            yield
+            return
+
+        async def _beat():
+            while True:
+                self.beat()
+                await asyncio.sleep(interval)
+
+        task = asyncio.create_task(_beat())
+        try:
+            yield
+        finally:
+            task.cancel()
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any, Generic, TypeVar
+
+from dependency_injector import containers
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+TContainer = TypeVar("TContainer", bound=containers.DeclarativeContainer)
+
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """Run a Lambda handler coroutine on an event loop kept between invocations.
+
+    ``asyncio.run`` closes its loop when the invocation ends, which breaks the
+    database pools and clients of a cached container since they are bound to
+    the loop they were created on.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+
+    return _loop.run_until_complete(coroutine)
+
+
+class WarmContainer(Generic[TContainer]):
+    """A container whose resources are initialized once per Lambda sandbox."""
+
+    def __init__(self, factory: Callable[[], TContainer]):
+        self._factory = factory
+        self._container: TContainer | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def get(self) -> TContainer:
+        if self._container:
+            return self._container
+
+        if not self._lock:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._container:
+                container = self._factory()
+                await container.init_resources()
+                self._container = container
+                logger.info("Container initialized")
+
+        return self._container
@@ -0,0 +1,8 @@
+def page_ranges(
+    from_page: int, page_count: int, pages_per_range: int
+) -> list[tuple[int, int]]:
+    """Split pages ``from_page..page_count`` into inclusive ranges."""
+    return [
+        (start, min(start + pages_per_range - 1, page_count))
+        for start in range(from_page, page_count + 1, pages_per_range)
+    ]
@@ -3,9 +3,14 @@ from workflow_shared_actitivies.send_event import SendEventActivity
 from workflow_shared_actitivies.update_file_status import UpdateFileStatusActivity
 
 
-class SendEventActivityTemporal(SendEventActivity, metaclass=TemporalActivityMeta): ...
+class SendEventActivityTemporal(
+    SendEventActivity, metaclass=TemporalActivityMeta, task_queue="db", local=True
+): ...
 
 
 class UpdateFileStatusActivityTemporal(
-    UpdateFileStatusActivity, metaclass=TemporalActivityMeta
+    UpdateFileStatusActivity,
+    metaclass=TemporalActivityMeta,
+    task_queue="db",
+    local=True,
 ): ...
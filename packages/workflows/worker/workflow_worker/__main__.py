@@ -1,15 +1,100 @@
 import asyncio
 import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
-from evaluation_workflow.workflow import EvaluationWorkflow, UpdateEvaluationWorkflow
-from ingestion_workflow.workflow import IngestionWorkflow
+from evaluation_workflow.workflow import (
+    EvaluationPageRangeWorkflow,
+    EvaluationWorkflow,
+    UpdateEvaluationWorkflow,
+)
+from ingestion_workflow.workflow import IngestionPageRangeWorkflow, IngestionWorkflow
+from internal_temporal_utils.settings import TaskQueueSettings
 from temporalio.client import Client
 from temporalio.worker import Worker
+from workflow_shared_actitivies import register_executor
 
 from workflow_worker.containers import Container
+from workflow_worker.settings import TaskQueueWorkerSettings, WorkerSettings
 
 logger = logging.getLogger(__name__)
 
+WORKFLOWS = [
+    IngestionWorkflow,
+    IngestionPageRangeWorkflow,
+    EvaluationWorkflow,
+    EvaluationPageRangeWorkflow,
+    UpdateEvaluationWorkflow,
+]
+
+CACHED_REPOSITORIES = [
+    "evaluation_template_repository",
+    "file_repository",
+    "project_repository",
+]
+
+
+def _create_executor(queue_settings: TaskQueueWorkerSettings) -> Executor | None:
+    match queue_settings.executor:
+        case "thread":
+            return ThreadPoolExecutor(max_workers=queue_settings.max_workers)
+        case "process":
+            return ProcessPoolExecutor(max_workers=queue_settings.max_workers)
+        case _:
+            return None
+
+
+def create_workers(
+    client: Client,
+    activities: list,
+    worker_settings: WorkerSettings,
+    task_queue_settings: TaskQueueSettings,
+) -> tuple[list[Worker], list[Executor]]:
+    # Several kinds may resolve to the same task queue when no dedicated queue
+    # is configured, the first kind listed decides the tuning of that queue.
+    queues: dict[str, TaskQueueWorkerSettings] = {}
+    for kind in worker_settings.task_queues:
+        queues.setdefault(
+            task_queue_settings.resolve(kind),
+            worker_settings.queues.get(kind, TaskQueueWorkerSettings()),
+        )
+
+    workers: list[Worker] = []
+    executors: list[Executor] = []
+    default_task_queue = task_queue_settings.resolve("default")
+    for task_queue, queue_settings in queues.items():
+        # Local activities run on the worker executing the workflow, so they are
+        # also registered on the default (workflow) task queue.
+        queue_activities = [
+            activity.run
+            for activity in activities
+            if task_queue_settings.resolve(activity.task_queue) == task_queue
+            or (activity.local and task_queue == default_task_queue)
+        ]
+        queue_workflows = WORKFLOWS if task_queue == default_task_queue else []
+        if not queue_activities and not queue_workflows:
+            continue
+
+        executor = _create_executor(queue_settings)
+        if executor:
+            register_executor(task_queue, executor)
+            executors.append(executor)
+
+        logger.info(
+            f"Polling task queue {task_queue} with {len(queue_workflows)} workflows "
+            f"and {len(queue_activities)} activities"
+        )
+        workers.append(
+            Worker(
+                client,
+                task_queue=task_queue,
+                workflows=queue_workflows,
+                activities=queue_activities,
+                max_concurrent_activities=queue_settings.max_concurrent_activities,
+            )
+        )
+
+    return workers, executors
+
 
 async def main():
     container = Container()
@@ -19,14 +104,26 @@ async def main():
 
     activities = await container.activities()
 
-    worker = Worker(
+    workers, executors = create_workers(
         client,
-        task_queue="temporal-worker",
-        workflows=[IngestionWorkflow, EvaluationWorkflow, UpdateEvaluationWorkflow],
-        activities=[activity.run for activity in activities],
+        activities,
+        container.settings().worker,
+        container.task_queue_settings(),
     )
 
-    await worker.run()
+    try:
+        await asyncio.gather(*[worker.run() for worker in workers])
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+        for name in CACHED_REPOSITORIES:
+            stats = getattr(container, name)().cache_stats
+            if stats:
+                logger.info(
+                    f"{name} cache: {stats.hits} hits, {stats.misses} misses "
+                    f"({stats.hit_rate:.0%}), {stats.evictions} evictions"
+                )
 
     await container.shutdown_resources()
 
@@ -2,6 +2,7 @@ import evaluation_workflow.activities.temporal as evaluation_activities
 import ingestion_workflow.activities.temporal as ingestion_activities
 import workflow_shared_actitivies.temporal as workflow_shared_actitivies
 from dependency_injector import providers
+from evaluation_workflow.settings import EvaluationWorkflowSettings
 from internal_aws_shared.containers import AWSContainer
 from internal_db_repositories.containers import RepositoriesContainer
 from internal_services.containers import ServicesContainer
@@ -15,6 +16,7 @@ class Container(
     RepositoriesContainer, ServicesContainer, TemporalContainer, VMXContainer
 ):
     settings = providers.Singleton(Settings)
+    evaluation_workflow_settings = providers.Singleton(EvaluationWorkflowSettings)
 
     activities = providers.List(
         providers.Singleton(
@@ -37,19 +39,47 @@ class Container(
             file_repository=RepositoriesContainer.file_repository,
             openai_api_key=ServicesContainer.openai_key,
         ),
+        providers.Singleton(
+            ingestion_activities.GetFileContentIdsActivityTemporal,
+            file_content_repository=RepositoriesContainer.file_content_repository,
+        ),
         providers.Singleton(
             evaluation_activities.StartEvaluationsActivityTemporal,
             evaluation_service=ServicesContainer.evaluation_service,
             file_repository=RepositoriesContainer.file_repository,
             file_content_repository=RepositoriesContainer.file_content_repository,
+            file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+            evaluation_cache_repository=RepositoriesContainer.evaluation_cache_repository,
             vmx_client_resource=VMXContainer.vmx_client,
             ingestion_callback_url=settings.provided.ingestion_callback.url,
         ),
+        providers.Singleton(
+            evaluation_activities.GetEvaluationWorkflowOptionsActivityTemporal,
+            evaluation_workflow_settings=evaluation_workflow_settings,
+            task_queues=TemporalContainer.task_queue_settings.provided.task_queues.call(),
+        ),
+        providers.Singleton(
+            evaluation_activities.GetFilePageCountActivityTemporal,
+            file_content_repository=RepositoriesContainer.file_content_repository,
+        ),
+        providers.Singleton(
+            evaluation_activities.GetEvaluationTreeActivityTemporal,
+            file_repository=RepositoriesContainer.file_repository,
+            evaluation_repository=RepositoriesContainer.evaluation_repository,
+        ),
         providers.Singleton(
             evaluation_activities.StoreEvaluationActivityTemporal,
             file_repository=RepositoriesContainer.file_repository,
             evaluation_repository=RepositoriesContainer.evaluation_repository,
             file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+            evaluation_cache_repository=RepositoriesContainer.evaluation_cache_repository,
+        ),
+        providers.Singleton(
+            evaluation_activities.StoreEvaluationsActivityTemporal,
+            file_repository=RepositoriesContainer.file_repository,
+            evaluation_repository=RepositoriesContainer.evaluation_repository,
+            file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
+            evaluation_cache_repository=RepositoriesContainer.evaluation_cache_repository,
         ),
         providers.Singleton(
             workflow_shared_actitivies.UpdateFileStatusActivityTemporal,
@@ -61,7 +91,7 @@ class Container(
             event_bus_name=settings.provided.event_bus_name,
         ),
         providers.Singleton(
-            evaluation_activities.GetFilesToEvaluateActivityTemporal,
+            evaluation_activities.GetFilesToEvaluatePageActivityTemporal,
             file_evaluation_repository=RepositoriesContainer.file_evaluation_repository,
             file_repository=RepositoriesContainer.file_repository,
         ),
@@ -1,7 +1,10 @@
 from os import environ
+from typing import Literal
 
+from internal_temporal_utils.settings import TaskQueueKind
 from internal_utils.pydantic_settings_jinja import jinja_template_validator
 from internal_vmx_utils.settings import VMXSettings
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 env_file = f".env.{environ.get('ENV', 'local')}"
@@ -48,6 +51,27 @@ class IngestionCallbackSettings(BaseSettings):
     url: str
 
 
+class TaskQueueWorkerSettings(BaseModel):
+    max_concurrent_activities: int = 100
+    # Executor used by activities for blocking work (see run_in_executor).
+    executor: Literal["asyncio", "thread", "process"] = "asyncio"
+    max_workers: int | None = None
+
+
+class WorkerSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=env_file,
+        env_file_encoding="utf-8",
+        extra="ignore",
+        env_prefix="WORKER_",
+    )
+
+    # Task queue kinds polled by this process, e.g. WORKER_TASK_QUEUES='["parse"]'
+    task_queues: list[TaskQueueKind] = ["default", "parse", "embed", "db", "llm"]
+    # Per kind tuning, e.g. WORKER_QUEUES='{"parse": {"executor": "process"}}'
+    queues: dict[TaskQueueKind, TaskQueueWorkerSettings] = {}
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=env_file, env_file_encoding="utf-8", extra="ignore"
@@ -58,6 +82,7 @@ class Settings(BaseSettings):
     thumbnail: ThumbnailSettings = ThumbnailSettings()
     landing: Landing = Landing()
     ingestion_callback: IngestionCallbackSettings = IngestionCallbackSettings()
+    worker: WorkerSettings = WorkerSettings()
     event_bus_name: str
 
     @jinja_template_validator("event_bus_name")